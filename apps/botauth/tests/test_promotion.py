@@ -8,7 +8,6 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 from django.urls import reverse
-from unittest.mock import patch
 
 from apps.botauth.promotion_service import DraftPromotionService
 from apps.botauth.models import MatrixUserBinding
@@ -21,11 +20,6 @@ from apps.patients.models import Patient
 User = get_user_model()
 
 
-# Mock the search vector functionality to avoid SQLite incompatibility
-def mock_search_vector_update(*args, **kwargs):
-    pass
-
-
 class DraftPromotionServiceTest(TestCase):
     """Tests for the DraftPromotionService."""
     
@@ -74,23 +68,21 @@ class DraftPromotionServiceTest(TestCase):
             allowed_scopes=['patient:read', 'dailynote:draft']
         )
         
-        # Create draft daily note with mocked search vector
-        with patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update):
-            self.draft = DailyNote.objects.create(
-                patient=self.patient,
-                event_datetime=timezone.now(),
-                description='Test draft via bot',
-                content='Test content',
-                created_by=self.doctor,
-                updated_by=self.doctor,
-                is_draft=True,
-                draft_created_by_bot=self.bot.client.client_id,
-                draft_delegated_by=self.doctor,
-                draft_expires_at=timezone.now() + timedelta(hours=24)
-            )
+        # Create draft daily note
+        self.draft = DailyNote.objects.create(
+            patient=self.patient,
+            event_datetime=timezone.now(),
+            description='Test draft via bot',
+            content='Test content',
+            created_by=self.doctor,
+            updated_by=self.doctor,
+            is_draft=True,
+            draft_created_by_bot=self.bot.client.client_id,
+            draft_delegated_by=self.doctor,
+            draft_expires_at=timezone.now() + timedelta(hours=24)
+        )
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_promote_draft_success(self, mock_update):
+    def test_promote_draft_success(self):
         """Test successful draft promotion."""
         original_created_by = self.draft.created_by
         original_description = self.draft.description
@@ -114,8 +106,7 @@ class DraftPromotionServiceTest(TestCase):
         # Check that description was cleaned if it had bot references
         # (if it contained 'via bot' or 'rascunho')
         
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_promote_draft_with_modifications(self, mock_update):
+    def test_promote_draft_with_modifications(self):
         """Test draft promotion with content modifications."""
         modifications = {
             'content': 'Updated content during promotion',
@@ -132,8 +123,7 @@ class DraftPromotionServiceTest(TestCase):
         self.assertEqual(promoted.description, modifications['description'])
         self.assertFalse(promoted.is_draft)
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_promote_non_draft_fails(self, mock_update):
+    def test_promote_non_draft_fails(self):
         """Test that promoting a non-draft event fails."""
         # Create a definitive event
         definitive_event = DailyNote.objects.create(
@@ -154,8 +144,7 @@ class DraftPromotionServiceTest(TestCase):
         
         self.assertIn('not a draft', str(context.exception))
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_promote_expired_draft_fails(self, mock_update):
+    def test_promote_expired_draft_fails(self):
         """Test that promoting an expired draft fails."""
         # Create an expired draft
         expired_draft = DailyNote.objects.create(
@@ -189,8 +178,7 @@ class DraftPromotionServiceTest(TestCase):
         
         self.assertIn('Only doctors', str(context.exception))
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_promote_draft_by_inactive_user_fails(self, mock_update):
+    def test_promote_draft_by_inactive_user_fails(self):
         """Test that inactive users cannot promote drafts."""
         inactive_doctor = User.objects.create_user(
             username='inactive_doctor',
@@ -209,8 +197,7 @@ class DraftPromotionServiceTest(TestCase):
         
         self.assertIn('not active', str(context.exception))
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_reject_draft_success(self, mock_update):
+    def test_reject_draft_success(self):
         """Test successful draft rejection."""
         draft_id = self.draft.id
         
@@ -225,8 +212,7 @@ class DraftPromotionServiceTest(TestCase):
             DailyNote.objects.filter(id=draft_id).exists()
         )
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_reject_non_draft_fails(self, mock_update):
+    def test_reject_non_draft_fails(self):
         """Test that rejecting a non-draft event fails."""
         definitive_event = DailyNote.objects.create(
             patient=self.patient,
@@ -279,20 +265,19 @@ class DraftPromotionViewsTest(TestCase):
             allowed_scopes=['patient:read', 'dailynote:draft']
         )
         
-        # Create draft daily note with mocked search vector
-        with patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update):
-            self.draft = DailyNote.objects.create(
-                patient=self.patient,
-                event_datetime=timezone.now(),
-                description='Test draft via bot',
-                content='Test content',
-                created_by=self.doctor,
-                updated_by=self.doctor,
-                is_draft=True,
-                draft_created_by_bot=self.bot.client.client_id,
-                draft_delegated_by=self.doctor,
-                draft_expires_at=timezone.now() + timedelta(hours=24)
-            )
+        # Create draft daily note
+        self.draft = DailyNote.objects.create(
+            patient=self.patient,
+            event_datetime=timezone.now(),
+            description='Test draft via bot',
+            content='Test content',
+            created_by=self.doctor,
+            updated_by=self.doctor,
+            is_draft=True,
+            draft_created_by_bot=self.bot.client.client_id,
+            draft_delegated_by=self.doctor,
+            draft_expires_at=timezone.now() + timedelta(hours=24)
+        )
         
         # Login
         self.client.force_login(self.doctor)
@@ -316,8 +301,7 @@ class DraftPromotionViewsTest(TestCase):
         self.assertContains(response, 'Test draft via bot')
         self.assertContains(response, 'Revisar Rascunho')
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_draft_promote_view_post(self, mock_update):
+    def test_draft_promote_view_post(self):
         """Test the draft promote view via POST."""
         url = reverse('botauth:draft_promote', kwargs={'pk': self.draft.pk})
         response = self.client.post(url)
@@ -330,8 +314,7 @@ class DraftPromotionViewsTest(TestCase):
         self.assertFalse(self.draft.is_draft)
         self.assertEqual(self.draft.created_by, self.doctor)
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_draft_reject_view_post(self, mock_update):
+    def test_draft_reject_view_post(self):
         """Test the draft reject view via POST."""
         draft_id = self.draft.id
         url = reverse('botauth:draft_reject', kwargs={'pk': self.draft.pk})
@@ -345,8 +328,7 @@ class DraftPromotionViewsTest(TestCase):
             DailyNote.objects.filter(id=draft_id).exists()
         )
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_unauthorized_user_cannot_access_others_drafts(self, mock_update):
+    def test_unauthorized_user_cannot_access_others_drafts(self):
         """Test that users cannot access drafts delegated to others."""
         # Create another user
         other_user = User.objects.create_user(
@@ -414,8 +396,7 @@ class DraftPromotionIntegrationTest(TestCase):
         
         self.client.force_login(self.doctor)
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_complete_draft_lifecycle(self, mock_update):
+    def test_complete_draft_lifecycle(self):
         """Test the complete lifecycle from draft creation to promotion."""
         # Step 1: Create a draft (simulating bot creation)
         draft = DailyNote.objects.create(
@@ -459,8 +440,7 @@ class DraftPromotionIntegrationTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertNotContains(response, 'Evolução via bot')
     
-    @patch('apps.dailynotes.signals.update_search_vector', side_effect=mock_search_vector_update)
-    def test_draft_rejection_flow(self, mock_update):
+    def test_draft_rejection_flow(self):
         """Test the draft rejection flow."""
         # Create draft
         draft = DailyNote.objects.create(
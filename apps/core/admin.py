@@ -5,6 +5,7 @@ from django.contrib.postgres.search import SearchVector
 from .models.renewal_request import AccountRenewalRequest
 from .models.medical_procedure import MedicalProcedure
 from .models.icd10_code import Icd10Code
+from .services.reference_index import invalidate_reference_index
 
 @admin.register(AccountRenewalRequest)
 class AccountRenewalRequestAdmin(admin.ModelAdmin):
@@ -134,13 +135,15 @@ class MedicalProcedureAdmin(admin.ModelAdmin):
     
     def activate_procedures(self, request, queryset):
         """Bulk action to activate selected procedures."""
-        updated = queryset.update(is_active=True)
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
+        invalidate_reference_index(queryset.model)
         self.message_user(request, f"{updated} procedure(s) activated successfully.")
     activate_procedures.short_description = "Activate selected procedures"
     
     def deactivate_procedures(self, request, queryset):
         """Bulk action to deactivate selected procedures."""
-        updated = queryset.update(is_active=False)
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
+        invalidate_reference_index(queryset.model)
         self.message_user(request, f"{updated} procedure(s) deactivated successfully.")
     deactivate_procedures.short_description = "Deactivate selected procedures"
     
@@ -254,12 +257,14 @@ class Icd10CodeAdmin(admin.ModelAdmin):
     short_description_display.short_description = 'Description'
 
     def activate_codes(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
+        invalidate_reference_index(queryset.model)
         self.message_user(request, f"{updated} code(s) activated successfully.")
     activate_codes.short_description = "Activate selected codes"
 
     def deactivate_codes(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
+        invalidate_reference_index(queryset.model)
         self.message_user(request, f"{updated} code(s) deactivated successfully.")
     deactivate_codes.short_description = "Deactivate selected codes"
 
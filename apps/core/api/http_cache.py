@@ -0,0 +1,121 @@
+"""
+HTTP caching for reference-data endpoints (ICD-10, procedures, drug templates).
+
+ETag and Last-Modified come from the table generation kept by
+apps.core.services.reference_index, which each worker re-reads from the
+database at most every few seconds, so conditional requests answered with
+304 do not query the reference tables. Per-user (user-edited) tables are
+the exception: their generation is one aggregate query per request. List
+bodies are serialized and gzipped once per generation and query string.
+"""
+
+import gzip
+import hashlib
+import json
+import re
+from functools import wraps
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from apps.core.services.reference_index import get_generation
+
+# Browsers may reuse identical typeahead/detail responses this long without asking
+REFERENCE_MAX_AGE = 300
+
+# How long a precomputed list body stays in the cache (a new generation changes the key anyway)
+LIST_BODY_TIMEOUT = 60 * 60
+
+_ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+def _generation_etag(models, request, per_user):
+    # Per-user tables are edited by their users, who must see their own
+    # change on the next revalidation, so skip the per-worker memo
+    parts = [get_generation(model, fresh=per_user).token for model in models]
+    if per_user:
+        parts.append(str(request.user.pk))
+    return hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+
+def _generation_last_modified(models):
+    stamps = [get_generation(model).last_modified for model in models]
+    stamps = [stamp for stamp in stamps if stamp]
+    return max(stamps) if stamps else None
+
+
+def reference_cache(*models, max_age=REFERENCE_MAX_AGE, per_user=False):
+    """
+    Make a JSON view conditional on the generation of reference tables.
+
+    Args:
+        models: Tables whose content the view returns
+        max_age: Seconds a browser may reuse a 200 response; None means it
+            must revalidate every time (Cache-Control: no-cache)
+        per_user: Include the user in the ETag, for responses that depend
+            on who asks (private drug templates). The generation is then
+            read fresh on every request, and Last-Modified is not sent, as
+            it cannot tell users apart.
+    """
+    def etag_func(request, *args, **kwargs):
+        return _generation_etag(models, request, per_user)
+
+    def last_modified_func(request, *args, **kwargs):
+        return _generation_last_modified(models)
+
+    def decorator(view_func):
+        conditional_view = condition(
+            etag_func=etag_func,
+            last_modified_func=None if per_user else last_modified_func,
+        )(view_func)
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            etag = response.get('ETag', '')
+            if response.has_header('Content-Encoding') and etag.startswith('"'):
+                # Same content, different bytes: only a weak validator holds
+                response['ETag'] = f'W/{etag}'
+            if response.status_code == 200:
+                if max_age is None:
+                    patch_cache_control(response, private=True, no_cache=True)
+                else:
+                    patch_cache_control(response, private=True, max_age=max_age)
+            return response
+        return _wrapped_view
+    return decorator
+
+
+def reference_list_response(request, model, build_payload):
+    """
+    Return a list endpoint body, serialized and gzipped once per generation.
+
+    Args:
+        request: Request whose query string identifies the page/filters
+        model: Reference table listed
+        build_payload: Callable returning the JSON payload on a cache miss
+
+    Returns:
+        HttpResponse: gzip-encoded when the client accepts it
+    """
+    generation = get_generation(model)
+    query_hash = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    key = f'reference_list:{model._meta.db_table}:{generation.token}:{query_hash}'
+
+    bodies = cache.get(key)
+    if bodies is None:
+        body = json.dumps(build_payload(), cls=DjangoJSONEncoder).encode()
+        bodies = (body, gzip.compress(body))
+        cache.set(key, bodies, LIST_BODY_TIMEOUT)
+
+    body, compressed = bodies
+    if _ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+        response = HttpResponse(compressed, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -10,12 +10,15 @@ from django.views.decorators.http import require_http_methods
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 from apps.core.models import Icd10Code
+from apps.core.services.reference_index import search_reference
+from apps.core.api.http_cache import reference_cache, reference_list_response
 
 logger = logging.getLogger(__name__)
 
 
 @require_http_methods(["GET"])
 @login_required
+@reference_cache(Icd10Code)
 def icd10_search(request):
     """
     Search ICD-10 codes for dynamic form field population.
@@ -53,68 +56,8 @@ def icd10_search(request):
 
         active_only = request.GET.get('active_only', 'true').lower() in ['true', '1', 'yes']
 
-        if active_only:
-            base_qs = Icd10Code.active()
-        else:
-            base_qs = Icd10Code.objects.all()
-
-        from django.db import connection
-        if connection.vendor == 'postgresql':
-            try:
-                has_search_vectors = base_qs.filter(search_vector__isnull=False).exists()
-                if has_search_vectors:
-                    if active_only:
-                        codes = Icd10Code.search(query)[:limit]
-                    else:
-                        from django.contrib.postgres.search import SearchQuery, SearchRank
-                        search_query = SearchQuery(query)
-                        codes = (
-                            base_qs
-                            .filter(search_vector=search_query)
-                            .annotate(rank=SearchRank('search_vector', search_query))
-                            .order_by('-rank', 'code')[:limit]
-                        )
-                    search_method = 'fulltext'
-                else:
-                    if active_only:
-                        codes = Icd10Code.simple_search(query)[:limit]
-                    else:
-                        codes = (
-                            base_qs
-                            .filter(
-                                Q(code__icontains=query) |
-                                Q(description__icontains=query)
-                            )
-                            .order_by('code')[:limit]
-                        )
-                    search_method = 'simple'
-            except Exception as e:
-                logger.warning(f"Full-text search failed, using simple search: {str(e)}")
-                if active_only:
-                    codes = Icd10Code.simple_search(query)[:limit]
-                else:
-                    codes = (
-                        base_qs
-                        .filter(
-                            Q(code__icontains=query) |
-                            Q(description__icontains=query)
-                        )
-                        .order_by('code')[:limit]
-                    )
-                search_method = 'simple'
-        else:
-            if active_only:
-                codes = Icd10Code.simple_search(query)[:limit]
-            else:
-                codes = (
-                    base_qs
-                    .filter(
-                        Q(code__icontains=query) |
-                        Q(description__icontains=query)
-                    )
-                    .order_by('code')[:limit]
-                )
-            search_method = 'simple'
+        codes = search_reference(Icd10Code, query, limit=limit, active_only=active_only)
+        search_method = 'index'
 
         results = []
         for code in codes:
@@ -152,6 +95,7 @@ def icd10_search(request):
 
 @require_http_methods(["GET"])
 @login_required
+@reference_cache(Icd10Code)
 def icd10_detail(request, code_id):
     """
     Get details for a specific ICD-10 code.
@@ -187,6 +131,7 @@ def icd10_detail(request, code_id):
 
 @require_http_methods(["GET"])
 @login_required
+@reference_cache(Icd10Code)
 def icd10_list(request):
     """
     List ICD-10 codes with pagination and filtering.
@@ -205,55 +150,58 @@ def icd10_list(request):
         active_filter = request.GET.get('active')
         search_term = request.GET.get('search', '').strip()
 
-        queryset = Icd10Code.objects.all()
-
-        if active_filter is not None:
-            is_active = active_filter.lower() in ['true', '1', 'yes']
-            queryset = queryset.filter(is_active=is_active)
-
-        if search_term:
-            queryset = queryset.filter(
-                Q(code__icontains=search_term) |
-                Q(description__icontains=search_term)
-            )
-
-        total_count = queryset.count()
-
-        start_index = (page - 1) * limit
-        end_index = start_index + limit
-        codes = queryset.order_by('code')[start_index:end_index]
+        def build_payload():
+            queryset = Icd10Code.objects.all()
 
-        results = []
-        for code in codes:
-            results.append({
-                'id': str(code.id),
-                'code': code.code,
-                'description': code.description,
-                'short_description': code.short_description,
-                'display_text': code.get_display_text(),
-                'is_active': code.is_active
-            })
+            if active_filter is not None:
+                is_active = active_filter.lower() in ['true', '1', 'yes']
+                queryset = queryset.filter(is_active=is_active)
 
-        total_pages = (total_count + limit - 1) // limit
-        has_next = page < total_pages
-        has_previous = page > 1
+            if search_term:
+                queryset = queryset.filter(
+                    Q(code__icontains=search_term) |
+                    Q(description__icontains=search_term)
+                )
 
-        return JsonResponse({
-            'results': results,
-            'pagination': {
-                'page': page,
-                'limit': limit,
-                'total_count': total_count,
-                'total_pages': total_pages,
-                'has_next': has_next,
-                'has_previous': has_previous,
-                'count': len(results)
-            },
-            'filters': {
-                'active': active_filter,
-                'search': search_term
+            total_count = queryset.count()
+
+            start_index = (page - 1) * limit
+            end_index = start_index + limit
+            codes = queryset.order_by('code')[start_index:end_index]
+
+            results = []
+            for code in codes:
+                results.append({
+                    'id': str(code.id),
+                    'code': code.code,
+                    'description': code.description,
+                    'short_description': code.short_description,
+                    'display_text': code.get_display_text(),
+                    'is_active': code.is_active
+                })
+
+            total_pages = (total_count + limit - 1) // limit
+            has_next = page < total_pages
+            has_previous = page > 1
+
+            return {
+                'results': results,
+                'pagination': {
+                    'page': page,
+                    'limit': limit,
+                    'total_count': total_count,
+                    'total_pages': total_pages,
+                    'has_next': has_next,
+                    'has_previous': has_previous,
+                    'count': len(results)
+                },
+                'filters': {
+                    'active': active_filter,
+                    'search': search_term
+                }
             }
-        })
+
+        return reference_list_response(request, Icd10Code, build_payload)
 
     except Exception as e:
         logger.error(f"Error listing ICD-10 codes: {str(e)}")
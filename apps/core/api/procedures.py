@@ -11,12 +11,15 @@ from django.views.decorators.csrf import csrf_exempt
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 from apps.core.models import MedicalProcedure
+from apps.core.services.reference_index import search_reference
+from apps.core.api.http_cache import reference_cache, reference_list_response
 
 logger = logging.getLogger(__name__)
 
 
 @require_http_methods(["GET"])
 @login_required
+@reference_cache(MedicalProcedure)
 def procedures_search(request):
     """
     Search medical procedures for dynamic form field population.
@@ -60,42 +63,9 @@ def procedures_search(request):
         # Get active_only parameter
         active_only = request.GET.get('active_only', 'true').lower() in ['true', '1', 'yes']
         
-        # Perform search
-        if active_only:
-            base_qs = MedicalProcedure.active()
-        else:
-            base_qs = MedicalProcedure.objects.all()
-        
-        # Try PostgreSQL full-text search first, fallback to simple search
-        try:
-            if active_only:
-                procedures = MedicalProcedure.search(query)[:limit]
-            else:
-                # For inactive search, use queryset filtering
-                from django.contrib.postgres.search import SearchQuery, SearchRank
-                search_query = SearchQuery(query)
-                procedures = (
-                    base_qs
-                    .filter(search_vector=search_query)
-                    .annotate(rank=SearchRank('search_vector', search_query))
-                    .order_by('-rank', 'code')[:limit]
-                )
-            search_method = 'fulltext'
-        except Exception as e:
-            logger.warning(f"Full-text search failed, using simple search: {str(e)}")
-            if active_only:
-                procedures = MedicalProcedure.simple_search(query)[:limit]
-            else:
-                from django.db.models import Q
-                procedures = (
-                    base_qs
-                    .filter(
-                        Q(code__icontains=query) |
-                        Q(description__icontains=query)
-                    )
-                    .order_by('code')[:limit]
-                )
-            search_method = 'simple'
+        # Ranked typeahead over this worker's in-memory index
+        procedures = search_reference(MedicalProcedure, query, limit=limit, active_only=active_only)
+        search_method = 'index'
         
         # Format results
         results = []
@@ -134,6 +104,7 @@ def procedures_search(request):
 
 @require_http_methods(["GET"])
 @login_required
+@reference_cache(MedicalProcedure)
 def procedure_detail(request, procedure_id):
     """
     Get details for a specific procedure.
@@ -172,6 +143,7 @@ def procedure_detail(request, procedure_id):
 
 @require_http_methods(["GET"])
 @login_required
+@reference_cache(MedicalProcedure)
 def procedures_list(request):
     """
     List procedures with pagination and filtering.
@@ -201,61 +173,64 @@ def procedures_list(request):
         active_filter = request.GET.get('active')
         search_term = request.GET.get('search', '').strip()
         
-        # Build queryset
-        queryset = MedicalProcedure.objects.all()
-        
-        if active_filter is not None:
-            is_active = active_filter.lower() in ['true', '1', 'yes']
-            queryset = queryset.filter(is_active=is_active)
-        
-        if search_term:
-            # Use simple search for listing
-            queryset = queryset.filter(
-                Q(code__icontains=search_term) |
-                Q(description__icontains=search_term)
-            )
+        def build_payload():
+            # Build queryset
+            queryset = MedicalProcedure.objects.all()
         
-        # Get total count
-        total_count = queryset.count()
-        
-        # Apply pagination
-        start_index = (page - 1) * limit
-        end_index = start_index + limit
-        procedures = queryset.order_by('code')[start_index:end_index]
-        
-        # Format results
-        results = []
-        for procedure in procedures:
-            results.append({
-                'id': str(procedure.id),
-                'code': procedure.code,
-                'description': procedure.description,
-                'short_description': procedure.short_description,
-                'display_text': procedure.get_display_text(),
-                'is_active': procedure.is_active
-            })
+            if active_filter is not None:
+                is_active = active_filter.lower() in ['true', '1', 'yes']
+                queryset = queryset.filter(is_active=is_active)
         
-        # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit
-        has_next = page < total_pages
-        has_previous = page > 1
+            if search_term:
+                # Use simple search for listing
+                queryset = queryset.filter(
+                    Q(code__icontains=search_term) |
+                    Q(description__icontains=search_term)
+                )
         
-        return JsonResponse({
-            'results': results,
-            'pagination': {
-                'page': page,
-                'limit': limit,
-                'total_count': total_count,
-                'total_pages': total_pages,
-                'has_next': has_next,
-                'has_previous': has_previous,
-                'count': len(results)
-            },
-            'filters': {
-                'active': active_filter,
-                'search': search_term
+            # Get total count
+            total_count = queryset.count()
+        
+            # Apply pagination
+            start_index = (page - 1) * limit
+            end_index = start_index + limit
+            procedures = queryset.order_by('code')[start_index:end_index]
+        
+            # Format results
+            results = []
+            for procedure in procedures:
+                results.append({
+                    'id': str(procedure.id),
+                    'code': procedure.code,
+                    'description': procedure.description,
+                    'short_description': procedure.short_description,
+                    'display_text': procedure.get_display_text(),
+                    'is_active': procedure.is_active
+                })
+        
+            # Calculate pagination info
+            total_pages = (total_count + limit - 1) // limit
+            has_next = page < total_pages
+            has_previous = page > 1
+        
+            return {
+                'results': results,
+                'pagination': {
+                    'page': page,
+                    'limit': limit,
+                    'total_count': total_count,
+                    'total_pages': total_pages,
+                    'has_next': has_next,
+                    'has_previous': has_previous,
+                    'count': len(results)
+                },
+                'filters': {
+                    'active': active_filter,
+                    'search': search_term
+                }
             }
-        })
+
+        return reference_list_response(request, MedicalProcedure, build_payload)
     
     except Exception as e:
         logger.error(f"Error listing procedures: {str(e)}")
@@ -8,4 +8,4 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         """App is ready - import signals if needed"""
-        pass
+        import apps.core.signals
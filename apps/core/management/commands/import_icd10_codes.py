@@ -6,14 +6,18 @@ Supports both initial import and incremental updates.
 import csv
 import json
 import logging
+import re
+import time
 from pathlib import Path
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction, IntegrityError
-from django.contrib.postgres.search import SearchVector
 from apps.core.models import Icd10Code
+from apps.core.services.reference_import import import_reference_rows
 
 logger = logging.getLogger(__name__)
 
+# Mirrors the code CHECK constraint of Icd10Code
+CODE_FORMAT = re.compile(r'^[0-9A-Za-z]{2,20}$')
+
 
 class Command(BaseCommand):
     help = 'Import ICD-10 codes from CSV or JSON file'
@@ -34,7 +38,7 @@ class Command(BaseCommand):
             '--batch-size',
             type=int,
             default=1000,
-            help='Number of codes to process in each batch (default: 1000)'
+            help='Ignored; kept for compatibility now that the import is set-based'
         )
         parser.add_argument(
             '--dry-run',
@@ -79,17 +83,14 @@ class Command(BaseCommand):
             else:
                 codes_data = self._load_json(file_path)
 
-            self._process_codes(
+            self._import_rows(
                 codes_data,
-                batch_size=options['batch_size'],
                 dry_run=options['dry_run'],
                 update=options['update'],
+                deactivate_missing=options['deactivate_missing'],
                 verbose=options['verbose']
             )
 
-            if options['deactivate_missing'] and not options['dry_run']:
-                self._deactivate_missing_codes(codes_data, options['verbose'])
-
         except Exception as e:
             logger.exception("Error importing ICD-10 codes")
             raise CommandError(f"Import failed: {str(e)}")
@@ -188,169 +189,38 @@ class Command(BaseCommand):
 
         return cleaned_codes
 
-    def _process_codes(self, codes_data, batch_size, dry_run, update, verbose):
-        total_count = len(codes_data)
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        self.stdout.write(f"Processing {total_count} ICD-10 codes...")
-
-        for i in range(0, total_count, batch_size):
-            batch = codes_data[i:i + batch_size]
-
-            if verbose:
-                self.stdout.write(f"Processing batch {i//batch_size + 1}: items {i+1}-{min(i+batch_size, total_count)}")
-
-            if not dry_run:
-                batch_created, batch_updated, batch_skipped, batch_errors = self._process_batch(
-                    batch, update, verbose
-                )
-            else:
-                batch_created, batch_updated, batch_skipped, batch_errors = self._validate_batch(
-                    batch, update, verbose
-                )
-
-            created_count += batch_created
-            updated_count += batch_updated
-            skipped_count += batch_skipped
-            error_count += batch_errors
-
-        if not dry_run and (created_count > 0 or updated_count > 0):
-            self.stdout.write("Updating search vectors...")
-            self._update_search_vectors()
-
-        self.stdout.write(self.style.SUCCESS(
-            f"\nImport completed:\n"
-            f"  Created: {created_count}\n"
-            f"  Updated: {updated_count}\n"
-            f"  Skipped: {skipped_count}\n"
-            f"  Errors: {error_count}\n"
-            f"  Total processed: {total_count}"
-        ))
-
-    def _process_batch(self, batch, update, verbose):
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        with transaction.atomic():
-            for code_data in batch:
-                try:
-                    code, created = Icd10Code.objects.get_or_create(
-                        code=code_data['code'],
-                        defaults={
-                            'description': code_data['description'],
-                            'is_active': code_data['is_active']
-                        }
-                    )
-
-                    if created:
-                        created_count += 1
-                        if verbose:
-                            self.stdout.write(f"  Created: {code_data['code']}")
-                    elif update:
-                        updated = False
-                        if code.description != code_data['description']:
-                            code.description = code_data['description']
-                            updated = True
-                        if code.is_active != code_data['is_active']:
-                            code.is_active = code_data['is_active']
-                            updated = True
-
-                        if updated:
-                            code.save()
-                            updated_count += 1
-                            if verbose:
-                                self.stdout.write(f"  Updated: {code_data['code']}")
-                        else:
-                            skipped_count += 1
-                    else:
-                        skipped_count += 1
-                        if verbose:
-                            self.stdout.write(f"  Skipped (exists): {code_data['code']}")
-
-                except IntegrityError as e:
-                    error_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(f"  Error with {code_data['code']}: {str(e)}")
-                    )
-                except Exception as e:
-                    error_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(f"  Unexpected error with {code_data['code']}: {str(e)}")
-                    )
-
-        return created_count, updated_count, skipped_count, error_count
-
-    def _validate_batch(self, batch, update, verbose):
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        for code_data in batch:
-            try:
-                exists = Icd10Code.objects.filter(code=code_data['code']).exists()
-
-                if not exists:
-                    created_count += 1
-                    if verbose:
-                        self.stdout.write(f"  Would create: {code_data['code']}")
-                elif update:
-                    updated_count += 1
-                    if verbose:
-                        self.stdout.write(f"  Would update: {code_data['code']}")
-                else:
-                    skipped_count += 1
-                    if verbose:
-                        self.stdout.write(f"  Would skip: {code_data['code']}")
-
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"  Validation error with {code_data['code']}: {str(e)}")
-                )
-
-        return created_count, updated_count, skipped_count, error_count
-
-    def _update_search_vectors(self):
-        from django.db import connection
-
-        if connection.vendor != 'postgresql':
-            self.stdout.write("Skipping search vector updates (PostgreSQL only).")
-            return
-
-        try:
-            Icd10Code.objects.update(
-                search_vector=SearchVector('code', 'description')
-            )
-            self.stdout.write(self.style.SUCCESS("Search vectors updated successfully"))
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f"Error updating search vectors: {str(e)}")
-            )
-
-    def _deactivate_missing_codes(self, codes_data, verbose):
-        imported_codes = {code['code'] for code in codes_data}
+    def _import_rows(self, rows, dry_run, update, deactivate_missing, verbose):
+        """Merge the file into the table with a few set-based statements."""
+        self.stdout.write(f"Processing {len(rows)} ICD-10 codes...")
+        started = time.monotonic()
 
-        missing_codes = Icd10Code.objects.filter(
-            is_active=True
-        ).exclude(
-            code__in=imported_codes
+        result = import_reference_rows(
+            Icd10Code, rows, CODE_FORMAT,
+            update=update, deactivate_missing=deactivate_missing, dry_run=dry_run
         )
 
-        deactivated_count = missing_codes.update(is_active=False)
+        if verbose:
+            for code in result.rejected:
+                self.stdout.write(self.style.ERROR(f"  Invalid code format: {code}"))
+        elif result.rejected:
+            self.stdout.write(self.style.ERROR(
+                f"{len(result.rejected)} row(s) with an invalid code format (use --verbose to list them)"
+            ))
 
-        if deactivated_count > 0:
+        if result.deactivated:
+            action = "Would deactivate" if dry_run else "Deactivated"
             self.stdout.write(
-                self.style.WARNING(f"Deactivated {deactivated_count} ICD-10 code(s) not found in import file")
+                self.style.WARNING(f"{action} {result.deactivated} ICD-10 code(s) not found in import file")
             )
-
-            if verbose:
-                for code in missing_codes:
-                    self.stdout.write(f"  Deactivated: {code.code}")
-        else:
+        elif deactivate_missing:
             self.stdout.write("No ICD-10 codes to deactivate")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\nImport {'simulated' if dry_run else 'completed'} in {time.monotonic() - started:.1f}s:\n"
+            f"  Created: {result.created}\n"
+            f"  Updated: {result.updated}\n"
+            f"  Skipped: {result.skipped}\n"
+            f"  Deactivated: {result.deactivated}\n"
+            f"  Errors: {len(result.rejected)}\n"
+            f"  Total processed: {len(rows)}"
+        ))
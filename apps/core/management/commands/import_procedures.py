@@ -6,14 +6,18 @@ Supports both initial import and incremental updates.
 import csv
 import json
 import logging
+import re
+import time
 from pathlib import Path
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction, IntegrityError
-from django.contrib.postgres.search import SearchVector
 from apps.core.models import MedicalProcedure
+from apps.core.services.reference_import import import_reference_rows
 
 logger = logging.getLogger(__name__)
 
+# Mirrors the code CHECK constraint of MedicalProcedure
+CODE_FORMAT = re.compile(r'^[0-9A-Za-z]{4,20}$')
+
 
 class Command(BaseCommand):
     help = 'Import medical procedures from CSV or JSON file'
@@ -34,7 +38,7 @@ class Command(BaseCommand):
             '--batch-size',
             type=int,
             default=1000,
-            help='Number of procedures to process in each batch (default: 1000)'
+            help='Ignored; kept for compatibility now that the import is set-based'
         )
         parser.add_argument(
             '--dry-run',
@@ -85,16 +89,13 @@ class Command(BaseCommand):
                 procedures_data = self._load_json(file_path)
             
             # Process the data
-            self._process_procedures(
+            self._import_rows(
                 procedures_data,
-                batch_size=options['batch_size'],
                 dry_run=options['dry_run'],
                 update=options['update'],
+                deactivate_missing=options['deactivate_missing'],
                 verbose=options['verbose']
             )
-            
-            if options['deactivate_missing'] and not options['dry_run']:
-                self._deactivate_missing_procedures(procedures_data, options['verbose'])
                 
         except Exception as e:
             logger.exception("Error importing procedures")
@@ -191,176 +192,38 @@ class Command(BaseCommand):
         
         return cleaned_procedures
 
-    def _process_procedures(self, procedures_data, batch_size, dry_run, update, verbose):
-        """Process procedures in batches."""
-        
-        total_count = len(procedures_data)
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
-        error_count = 0
-        
-        self.stdout.write(f"Processing {total_count} procedures...")
-        
-        # Process in batches
-        for i in range(0, total_count, batch_size):
-            batch = procedures_data[i:i + batch_size]
-            
-            if verbose:
-                self.stdout.write(f"Processing batch {i//batch_size + 1}: items {i+1}-{min(i+batch_size, total_count)}")
-            
-            if not dry_run:
-                batch_created, batch_updated, batch_skipped, batch_errors = self._process_batch(
-                    batch, update, verbose
-                )
-            else:
-                # In dry run, just validate the data
-                batch_created, batch_updated, batch_skipped, batch_errors = self._validate_batch(
-                    batch, update, verbose
-                )
-            
-            created_count += batch_created
-            updated_count += batch_updated
-            skipped_count += batch_skipped
-            error_count += batch_errors
-        
-        # Update search vectors if not dry run
-        if not dry_run and (created_count > 0 or updated_count > 0):
-            self.stdout.write("Updating search vectors...")
-            self._update_search_vectors()
-        
-        # Summary
-        self.stdout.write(self.style.SUCCESS(
-            f"\nImport completed:\n"
-            f"  Created: {created_count}\n"
-            f"  Updated: {updated_count}\n"
-            f"  Skipped: {skipped_count}\n"
-            f"  Errors: {error_count}\n"
-            f"  Total processed: {total_count}"
-        ))
+    def _import_rows(self, rows, dry_run, update, deactivate_missing, verbose):
+        """Merge the file into the table with a few set-based statements."""
+        self.stdout.write(f"Processing {len(rows)} procedures...")
+        started = time.monotonic()
 
-    def _process_batch(self, batch, update, verbose):
-        """Process a single batch of procedures."""
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
-        error_count = 0
-        
-        with transaction.atomic():
-            for proc_data in batch:
-                try:
-                    procedure, created = MedicalProcedure.objects.get_or_create(
-                        code=proc_data['code'],
-                        defaults={
-                            'description': proc_data['description'],
-                            'is_active': proc_data['is_active']
-                        }
-                    )
-                    
-                    if created:
-                        created_count += 1
-                        if verbose:
-                            self.stdout.write(f"  Created: {proc_data['code']}")
-                    elif update:
-                        # Update existing procedure
-                        updated = False
-                        if procedure.description != proc_data['description']:
-                            procedure.description = proc_data['description']
-                            updated = True
-                        if procedure.is_active != proc_data['is_active']:
-                            procedure.is_active = proc_data['is_active']
-                            updated = True
-                        
-                        if updated:
-                            procedure.save()
-                            updated_count += 1
-                            if verbose:
-                                self.stdout.write(f"  Updated: {proc_data['code']}")
-                        else:
-                            skipped_count += 1
-                    else:
-                        skipped_count += 1
-                        if verbose:
-                            self.stdout.write(f"  Skipped (exists): {proc_data['code']}")
-                
-                except IntegrityError as e:
-                    error_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(f"  Error with {proc_data['code']}: {str(e)}")
-                    )
-                except Exception as e:
-                    error_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(f"  Unexpected error with {proc_data['code']}: {str(e)}")
-                    )
-        
-        return created_count, updated_count, skipped_count, error_count
+        result = import_reference_rows(
+            MedicalProcedure, rows, CODE_FORMAT,
+            update=update, deactivate_missing=deactivate_missing, dry_run=dry_run
+        )
 
-    def _validate_batch(self, batch, update, verbose):
-        """Validate a batch without saving (for dry run)."""
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
-        error_count = 0
-        
-        for proc_data in batch:
-            try:
-                # Check if procedure exists
-                exists = MedicalProcedure.objects.filter(code=proc_data['code']).exists()
-                
-                if not exists:
-                    created_count += 1
-                    if verbose:
-                        self.stdout.write(f"  Would create: {proc_data['code']}")
-                elif update:
-                    updated_count += 1
-                    if verbose:
-                        self.stdout.write(f"  Would update: {proc_data['code']}")
-                else:
-                    skipped_count += 1
-                    if verbose:
-                        self.stdout.write(f"  Would skip: {proc_data['code']}")
-                
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"  Validation error with {proc_data['code']}: {str(e)}")
-                )
-        
-        return created_count, updated_count, skipped_count, error_count
+        if verbose:
+            for code in result.rejected:
+                self.stdout.write(self.style.ERROR(f"  Invalid code format: {code}"))
+        elif result.rejected:
+            self.stdout.write(self.style.ERROR(
+                f"{len(result.rejected)} row(s) with an invalid code format (use --verbose to list them)"
+            ))
 
-    def _update_search_vectors(self):
-        """Update search vectors for full-text search."""
-        try:
-            # Update search vectors for all procedures
-            MedicalProcedure.objects.update(
-                search_vector=SearchVector('code', 'description')
-            )
-            self.stdout.write(self.style.SUCCESS("Search vectors updated successfully"))
-        except Exception as e:
+        if result.deactivated:
+            action = "Would deactivate" if dry_run else "Deactivated"
             self.stdout.write(
-                self.style.ERROR(f"Error updating search vectors: {str(e)}")
+                self.style.WARNING(f"{action} {result.deactivated} procedure(s) not found in import file")
             )
+        elif deactivate_missing:
+            self.stdout.write("No procedures to deactivate")
 
-    def _deactivate_missing_procedures(self, procedures_data, verbose):
-        """Mark procedures as inactive if not present in import file."""
-        imported_codes = {proc['code'] for proc in procedures_data}
-        
-        missing_procedures = MedicalProcedure.objects.filter(
-            is_active=True
-        ).exclude(
-            code__in=imported_codes
-        )
-        
-        deactivated_count = missing_procedures.update(is_active=False)
-        
-        if deactivated_count > 0:
-            self.stdout.write(
-                self.style.WARNING(f"Deactivated {deactivated_count} procedures not found in import file")
-            )
-            
-            if verbose:
-                for procedure in missing_procedures:
-                    self.stdout.write(f"  Deactivated: {procedure.code}")
-        else:
-            self.stdout.write("No procedures to deactivate")
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(
+            f"\nImport {'simulated' if dry_run else 'completed'} in {time.monotonic() - started:.1f}s:\n"
+            f"  Created: {result.created}\n"
+            f"  Updated: {result.updated}\n"
+            f"  Skipped: {result.skipped}\n"
+            f"  Deactivated: {result.deactivated}\n"
+            f"  Errors: {len(result.rejected)}\n"
+            f"  Total processed: {len(rows)}"
+        ))
@@ -8,7 +8,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from django.utils import timezone as django_timezone
-from django.db import transaction
+from django.db import connection, transaction
 from django.core.mail import EmailMessage
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
@@ -20,16 +20,31 @@ except ImportError:
     firebase_admin = None
 
 from apps.patients.models import Patient, PatientRecordNumber, PatientAdmission, Ward
+from apps.events.models import Event
 from apps.dailynotes.models import DailyNote
+from apps.dailynotes.signals import search_index_updated
+from apps.core.models import FirebaseSyncCache, LegacyImportKey
+from apps.core.services.legacy_import import get_imported_keys, record_imported_keys
+from apps.research.search_index import index_events
 
 User = get_user_model()
 
+# DailyNote rows of a chunk in one statement
+INSERT_DAILYNOTES_SQL = """
+    INSERT INTO dailynotes_dailynote (event_ptr_id, content)
+    SELECT batch.note_id, batch.content
+    FROM unnest(%s::uuid[], %s::text[]) AS batch(note_id, content)
+"""
+
 
 class Command(BaseCommand):
     help = "Incrementally sync patients and dailynotes from Firebase Realtime Database"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.patients_reference = "patients"
+        self.current_dailynote_keys = None
+        self.current_dailynote_keys_last_key = ""
         self.ward_map_file = "fixtures/firebase-ward-map.json"
         self.ward_source_file = "fixtures/sisphgrs-wards-export.json"
         self.ward_mapping_loaded = False
@@ -142,6 +157,7 @@ class Command(BaseCommand):
         self.chunk_size = options.get("chunk_size", 1000)
         self.email = options.get("email")
         self.ward_map_file = options.get("ward_map_file") or self.ward_map_file
+        self.patients_reference = options["patients_reference"]
 
         if self.dry_run:
             self.stdout.write(
@@ -310,11 +326,22 @@ class Command(BaseCommand):
                     f"Found {len(chunk_new_patients)} new patients in this chunk (out of {len(chunk_data)})"
                 )
 
+                # One lookup for the whole chunk instead of two per patient
+                record_numbers = self.get_record_numbers(
+                    [
+                        *chunk_new_patients,
+                        *(
+                            str(patient_data.get("ptRecN", "")).strip()
+                            for patient_data in chunk_new_patients.values()
+                        ),
+                    ]
+                )
+
                 # Process patients in this chunk
                 for firebase_key, patient_data in chunk_new_patients.items():
                     try:
                         result = self.process_firebase_patient(
-                            firebase_key, patient_data
+                            firebase_key, patient_data, record_numbers
                         )
                         if result == "imported":
                             imported_count += 1
@@ -797,8 +824,33 @@ class Command(BaseCommand):
 
         return "skipped"
 
-    def process_firebase_patient(self, firebase_key, patient_data):
-        """Process a single Firebase patient"""
+    def get_record_numbers(self, record_numbers):
+        """
+        Fetch the records of the given record numbers with one query.
+
+        Returns a dict of record number to PatientRecordNumber (with its
+        patient); when a number was assigned more than once, the record that
+        .first() would return wins.
+        """
+        record_numbers = {number for number in record_numbers if number}
+        if not record_numbers:
+            return {}
+
+        records = {}
+        for record in PatientRecordNumber.objects.filter(
+            record_number__in=record_numbers
+        ).select_related("patient"):
+            records.setdefault(record.record_number, record)
+        return records
+
+    def process_firebase_patient(self, firebase_key, patient_data, record_numbers=None):
+        """
+        Process a single Firebase patient.
+
+        record_numbers is the get_record_numbers() map of the current chunk;
+        when omitted, the patient's numbers are looked up on their own.
+        Patients created here are added to it.
+        """
         self._ensure_ward_mapping_loaded()
         # Extract required fields
         name = patient_data.get("name", "").strip()
@@ -825,13 +877,10 @@ class Command(BaseCommand):
         resolved_bed, has_explicit_bed = self._resolve_bed_from_patient_data(patient_data)
 
         # Check if patient already exists by either firebase key or ptRecN
-        existing_firebase_record = PatientRecordNumber.objects.filter(
-            record_number=firebase_key
-        ).first()
-
-        existing_ptrecn_record = PatientRecordNumber.objects.filter(
-            record_number=pt_rec_n
-        ).first()
+        if record_numbers is None:
+            record_numbers = self.get_record_numbers([firebase_key, pt_rec_n])
+        existing_firebase_record = record_numbers.get(firebase_key)
+        existing_ptrecn_record = record_numbers.get(pt_rec_n)
 
         if existing_firebase_record and existing_ptrecn_record:
             if existing_firebase_record.patient_id != existing_ptrecn_record.patient_id:
@@ -937,7 +986,7 @@ class Command(BaseCommand):
                 Patient.objects.filter(pk=patient.pk).update(created_at=created_at)
 
             # Create Firebase key record number (old registration)
-            PatientRecordNumber.objects.create(
+            firebase_record = PatientRecordNumber.objects.create(
                 patient=patient,
                 record_number=firebase_key,
                 is_current=False,
@@ -947,7 +996,7 @@ class Command(BaseCommand):
             )
 
             # Create ptRecN record number (current hospital number)
-            PatientRecordNumber.objects.create(
+            ptrecn_record = PatientRecordNumber.objects.create(
                 patient=patient,
                 record_number=pt_rec_n,
                 is_current=True,
@@ -983,26 +1032,158 @@ class Command(BaseCommand):
                 f"  ✓ Imported patient: {name} (ptRecN: {pt_rec_n}, firebase: {firebase_key})"
             )
 
+        # Later patients of the chunk must see this one
+        record_numbers[firebase_key] = firebase_record
+        record_numbers[pt_rec_n] = ptrecn_record
         return "imported"
 
     def get_current_dailynote_keys(self):
-        """Get all current dailynote keys from patients to exclude drafts"""
+        """
+        Get the current dailynote keys of patients, to exclude drafts.
+
+        Firebase push keys grow over time, so patients whose
+        currentdailynotekey changed since the previous run are found by a
+        query ordered by that child and starting at the newest key seen,
+        read in chunks. The keys of earlier runs are kept in
+        FirebaseSyncCache; without an index on currentdailynotekey, all
+        patients are walked in key-ordered chunks instead. The result is
+        cached for the rest of the run.
+
+        Returns:
+            dict: Current dailynote key to the Firebase key of its patient
+        """
+        if self.current_dailynote_keys is not None:
+            return self.current_dailynote_keys
+
+        cached = FirebaseSyncCache.objects.filter(
+            cache_key=self._current_dailynote_keys_cache_key()
+        ).first()
+        state = cached.data if cached else {"last_key": "", "patients": {}}
+        keys_by_patient = state["patients"]
+        last_key = state["last_key"]
+
         try:
-            # Get all patients to check for currentdailynotekey
-            patients_ref = db.reference("patients")
-            all_patients = patients_ref.get()
-            
-            current_keys = set()
-            if all_patients:
-                for patient_key, patient_data in all_patients.items():
-                    current_dailynote_key = patient_data.get("currentdailynotekey")
-                    if current_dailynote_key:
-                        current_keys.add(current_dailynote_key)
-            
-            return current_keys
+            ref = db.reference(self.patients_reference)
+            try:
+                changed = self._fetch_changed_current_dailynote_keys(ref, last_key)
+            except Exception as e:
+                self.stdout.write(f"Could not query changed current dailynote keys ({e}); reading all patients")
+                changed = self._walk_current_dailynote_keys(ref)
+                keys_by_patient = {}
+
+            keys_by_patient.update(changed)
+            last_key = max([last_key, *changed.values()])
+            self.stdout.write(f"Read {len(changed)} patients with changed current dailynote keys")
         except Exception as e:
             self.stdout.write(f"Warning: Could not fetch current dailynote keys: {e}")
-            return set()
+
+        self.current_dailynote_keys_last_key = last_key
+        self.current_dailynote_keys = {
+            dailynote_key: patient_key for patient_key, dailynote_key in keys_by_patient.items()
+        }
+        self._save_current_dailynote_keys()
+        return self.current_dailynote_keys
+
+    def _fetch_changed_current_dailynote_keys(self, ref, last_key):
+        """Current dailynote keys from last_key on, as {patient key: dailynote key}"""
+        changed = {}
+        start = last_key
+        while True:
+            # start_at is inclusive: fetch one more to make up for the overlap
+            chunk_data = (
+                ref.order_by_child("currentdailynotekey")
+                .start_at(start)
+                .limit_to_first(self.chunk_size + 1)
+                .get()
+            ) or {}
+            chunk_keys = {}
+            for patient_key, patient_data in chunk_data.items():
+                current_dailynote_key = (patient_data or {}).get("currentdailynotekey")
+                if isinstance(current_dailynote_key, str) and current_dailynote_key > start:
+                    chunk_keys[patient_key] = current_dailynote_key
+
+            changed.update(chunk_keys)
+            if len(chunk_keys) < self.chunk_size:
+                return changed
+            start = max(chunk_keys.values())
+
+    def _walk_current_dailynote_keys(self, ref):
+        """Current dailynote keys of all patients, read in key-ordered chunks"""
+        current_keys = {}
+        last_key = None
+        while True:
+            query = ref.order_by_key()
+            if last_key:
+                # start_at is inclusive: fetch one more to make up for the overlap
+                query = query.start_at(last_key).limit_to_first(self.chunk_size + 1)
+            else:
+                query = query.limit_to_first(self.chunk_size)
+            chunk_data = {
+                patient_key: patient_data
+                for patient_key, patient_data in (query.get() or {}).items()
+                if patient_key != last_key
+            }
+
+            for patient_key, patient_data in chunk_data.items():
+                current_dailynote_key = (patient_data or {}).get("currentdailynotekey")
+                if current_dailynote_key:
+                    current_keys[patient_key] = current_dailynote_key
+
+            if len(chunk_data) < self.chunk_size:
+                return current_keys
+            last_key = max(chunk_data.keys())
+
+    def is_current_dailynote(self, dailynote_key):
+        """
+        Whether a dailynote is still the current one (a draft) of its patient.
+
+        Keys kept from earlier runs may be stale once a draft is finished, so
+        the patient's currentdailynotekey is read again before a note is
+        skipped as a draft; stale keys are dropped.
+        """
+        patient_key = self.current_dailynote_keys.get(dailynote_key)
+        if patient_key is None:
+            return False
+
+        try:
+            current_dailynote_key = (
+                db.reference(self.patients_reference)
+                .child(patient_key)
+                .child("currentdailynotekey")
+                .get()
+            )
+        except Exception as e:
+            self.stdout.write(f"Warning: Could not confirm draft dailynote {dailynote_key}: {e}")
+            return True
+
+        if current_dailynote_key == dailynote_key:
+            return True
+
+        del self.current_dailynote_keys[dailynote_key]
+        if current_dailynote_key:
+            self.current_dailynote_keys[current_dailynote_key] = patient_key
+        self._save_current_dailynote_keys()
+        return False
+
+    def _current_dailynote_keys_cache_key(self):
+        return f"current_dailynote_keys:{self.patients_reference}"
+
+    def _save_current_dailynote_keys(self):
+        """Persist the current dailynote keys for the next run"""
+        if self.dry_run:
+            return
+        FirebaseSyncCache.objects.update_or_create(
+            cache_key=self._current_dailynote_keys_cache_key(),
+            defaults={
+                "data": {
+                    "last_key": self.current_dailynote_keys_last_key,
+                    "patients": {
+                        patient_key: dailynote_key
+                        for dailynote_key, patient_key in self.current_dailynote_keys.items()
+                    },
+                }
+            },
+        )
 
     def sync_dailynotes(self, dailynotes_reference):
         """Sync new dailynotes from Firebase using chunked queries"""
@@ -1069,20 +1250,33 @@ class Command(BaseCommand):
                     f"Found {len(chunk_new_dailynotes)} new dailynotes in this chunk (out of {len(chunk_data)})"
                 )
 
-                # Process dailynotes in this chunk
+                # One lookup each for the chunk's imported keys and patients
+                imported_keys = get_imported_keys(
+                    LegacyImportKey.Source.FIREBASE_DAILYNOTE, chunk_new_dailynotes
+                )
+                record_numbers = self.get_record_numbers(
+                    note_data.get("patient") for note_data in chunk_new_dailynotes.values()
+                )
+
+                # Build the dailynotes of this chunk, then insert them together
+                chunk_dailynotes = {}
                 for note_key, note_data in chunk_new_dailynotes.items():
                     try:
                         # Skip if this is a current dailynote (draft)
-                        if note_key in current_dailynote_keys:
+                        if note_key in current_dailynote_keys and self.is_current_dailynote(note_key):
                             if self.dry_run:
                                 self.stdout.write(f"  Would skip draft dailynote: {note_key}")
                             draft_skipped_count += 1
                             total_processed += 1
                             continue
-                        
-                        result = self.process_firebase_dailynote(note_key, note_data)
+
+                        result, dailynote = self.build_firebase_dailynote(
+                            note_key, note_data, record_numbers, imported_keys
+                        )
                         if result == "imported":
                             imported_count += 1
+                            if dailynote is not None:
+                                chunk_dailynotes[note_key] = dailynote
                         elif result == "skipped":
                             skipped_count += 1
                         elif result == "patient_not_found":
@@ -1101,6 +1295,18 @@ class Command(BaseCommand):
                             self.style.ERROR(f"Error syncing dailynote {note_key}: {e}")
                         )
 
+                if chunk_dailynotes:
+                    try:
+                        self.create_dailynotes(chunk_dailynotes)
+                    except Exception as e:
+                        imported_count -= len(chunk_dailynotes)
+                        error_count += len(chunk_dailynotes)
+                        self.stdout.write(
+                            self.style.ERROR(
+                                f"Error syncing {len(chunk_dailynotes)} dailynotes of chunk {chunk_num}: {e}"
+                            )
+                        )
+
                 # Check if we should continue
                 if self.limit and imported_count >= self.limit:
                     break
@@ -1127,8 +1333,38 @@ class Command(BaseCommand):
         except Exception as e:
             raise Exception(f"Failed to sync dailynotes: {e}")
 
-    def process_firebase_dailynote(self, firebase_key, dailynote_data):
-        """Process a single Firebase dailynote (reusing logic from import command)"""
+    def process_firebase_dailynote(self, firebase_key, dailynote_data, imported_keys=None):
+        """
+        Process a single Firebase dailynote (reusing logic from import command).
+
+        imported_keys is the set of already imported keys of the current
+        chunk; when omitted, the key is looked up on its own. sync_dailynotes
+        goes through build_firebase_dailynote and create_dailynotes directly,
+        one insert per chunk.
+        """
+        if imported_keys is None:
+            imported_keys = get_imported_keys(
+                LegacyImportKey.Source.FIREBASE_DAILYNOTE, [firebase_key]
+            )
+        record_numbers = self.get_record_numbers([dailynote_data.get("patient")])
+
+        result, dailynote = self.build_firebase_dailynote(
+            firebase_key, dailynote_data, record_numbers, imported_keys
+        )
+        if dailynote is not None:
+            self.create_dailynotes({firebase_key: dailynote})
+        return result
+
+    def build_firebase_dailynote(self, firebase_key, dailynote_data, record_numbers, imported_keys):
+        """
+        Validate a Firebase dailynote and build the DailyNote to import.
+
+        record_numbers and imported_keys are the lookups of the current chunk
+        (see get_record_numbers and get_imported_keys).
+
+        Returns a (result, dailynote) tuple; dailynote is an unsaved DailyNote
+        when the note is to be imported, None otherwise (and in dry runs).
+        """
         # Validate required fields
         if not dailynote_data.get("patient"):
             raise ValueError("Missing patient field")
@@ -1140,29 +1376,22 @@ class Command(BaseCommand):
         patient_key = dailynote_data["patient"]
 
         # Find patient using PatientRecordNumber (check both firebase key and ptRecN)
-        patient_record = PatientRecordNumber.objects.filter(
-            record_number=patient_key
-        ).first()
+        patient_record = record_numbers.get(patient_key)
 
         if not patient_record:
-            return "patient_not_found"
+            return "patient_not_found", None
 
         patient = patient_record.patient
 
-        # Check if this dailynote already exists using Firebase key (more reliable than content matching)
-        existing_note = DailyNote.objects.filter(
-            patient=patient,
-            content__icontains=f"Firebase ID: {firebase_key}",
-        ).first()
-
-        if existing_note:
-            return "skipped"
+        # Check if this dailynote was already imported, by its Firebase key
+        if firebase_key in imported_keys:
+            return "skipped", None
 
         if self.dry_run:
             self.stdout.write(
                 f"  Would import dailynote for patient: {patient.name} (record: {patient_key})"
             )
-            return "imported"
+            return "imported", None
 
         # Convert Firebase datetime to Django datetime
         try:
@@ -1181,20 +1410,66 @@ class Command(BaseCommand):
             firebase_key,
         )
 
-        # Create DailyNote
-        DailyNote.objects.create(
+        dailynote = DailyNote(
             patient=patient,
+            event_type=Event.DAILY_NOTE_EVENT,
             event_datetime=event_datetime,
             description="Evolução sincronizada do sistema antigo",
             content=formatted_content,
             created_by=self.import_user,
             updated_by=self.import_user,
         )
+        return "imported", dailynote
 
-        self.stdout.write(
-            f"  ✓ Synced dailynote for patient: {patient.name} (record: {patient_key})"
+    def create_dailynotes(self, dailynotes_by_key):
+        """
+        Insert dailynotes and register their Firebase keys in one transaction.
+
+        bulk_create does not support multi-table inheritance, so the Event
+        rows are bulk created and the DailyNote rows are inserted by one
+        statement; the research index is refreshed for all of them at once. Statement count does not grow with the number
+        of notes.
+
+        Args:
+            dailynotes_by_key: Mapping of Firebase key to unsaved DailyNote
+        """
+        dailynotes = list(dailynotes_by_key.values())
+        for dailynote in dailynotes:
+            dailynote.event_ptr_id = dailynote.id
+
+        with transaction.atomic():
+            Event.objects.bulk_create(
+                [
+                    Event(
+                        **{
+                            field.attname: getattr(dailynote, field.attname)
+                            for field in Event._meta.concrete_fields
+                        }
+                    )
+                    for dailynote in dailynotes
+                ]
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    INSERT_DAILYNOTES_SQL,
+                    [
+                        [dailynote.pk for dailynote in dailynotes],
+                        [dailynote.content for dailynote in dailynotes],
+                    ],
+                )
+            record_imported_keys(
+                LegacyImportKey.Source.FIREBASE_DAILYNOTE,
+                {firebase_key: dailynote.pk for firebase_key, dailynote in dailynotes_by_key.items()},
+            )
+            index_events(dailynotes)
+
+        search_index_updated.send(
+            sender=DailyNote, note_ids=[dailynote.pk for dailynote in dailynotes]
         )
-        return "imported"
+        for firebase_key, dailynote in dailynotes_by_key.items():
+            self.stdout.write(
+                f"  ✓ Synced dailynote for patient: {dailynote.patient.name} (firebase: {firebase_key})"
+            )
 
     def format_dailynote_content(self, content, username, firebase_key):
         """Format the dailynote content according to specifications"""
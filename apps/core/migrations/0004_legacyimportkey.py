@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 22:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_icd10code'),
+        ('events', '0005_patientprofilechangeevent_alter_event_event_type_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LegacyImportKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('firebase_dailynote', 'Evolução do Firebase'), ('firebase_discharge_report', 'Relatório de alta do Firebase')], max_length=50, verbose_name='Origem')),
+                ('external_key', models.CharField(max_length=255, verbose_name='Chave externa')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Importado em')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='legacy_import_keys', to='events.event', verbose_name='Evento')),
+            ],
+            options={
+                'verbose_name': 'Chave de importação legada',
+                'verbose_name_plural': 'Chaves de importação legadas',
+                'db_table': 'core_legacy_import_key',
+                'constraints': [models.UniqueConstraint(fields=('source', 'external_key'), name='core_legacy_import_key_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Backfill LegacyImportKey from the "Firebase ID: <key>" lines written by the Firebase importers
+
+from django.db import migrations
+
+
+BACKFILL_SQL = (
+    "INSERT INTO core_legacy_import_key (source, external_key, event_id, created_at) "
+    "SELECT %s, substring({column} from 'Firebase ID: (\\S+)'), event_ptr_id, now() "
+    "FROM {source_table} WHERE {column} LIKE '%%Firebase ID: %%' "
+    "ON CONFLICT (source, external_key) DO NOTHING"
+)
+
+SOURCES = (
+    ("firebase_dailynote", "dailynotes_dailynote", "content"),
+    (
+        "firebase_discharge_report",
+        "dischargereports_dischargereport JOIN events_event ON events_event.id = event_ptr_id",
+        "events_event.description",
+    ),
+)
+
+
+def backfill_legacy_import_keys(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for source, source_table, column in SOURCES:
+        schema_editor.execute(
+            BACKFILL_SQL.format(source_table=source_table, column=column), [source]
+        )
+
+
+def noop_reverse(apps, schema_editor):
+    return
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_legacyimportkey"),
+        ("dailynotes", "0002_dailynote_search_vector_and_more"),
+        ("dischargereports", "0002_remove_dischargereport_dischargere_is_draf_26e620_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_legacy_import_keys, noop_reverse),
+    ]
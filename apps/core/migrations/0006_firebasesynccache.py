@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_backfill_legacy_import_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FirebaseSyncCache',
+            fields=[
+                ('cache_key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('data', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'core_firebase_sync_cache',
+            },
+        ),
+    ]
@@ -1,8 +1,9 @@
 # Core models package
 from .soft_delete import SoftDeleteModel, SoftDeleteManager, SoftDeleteQuerySet
-from .cache import DashboardCache, WardMappingCache
+from .cache import DashboardCache, FirebaseSyncCache, WardMappingCache
 from .renewal_request import AccountRenewalRequest
 from .medical_procedure import MedicalProcedure
 from .icd10_code import Icd10Code
+from .legacy_import_key import LegacyImportKey
 
-__all__ = ['SoftDeleteModel', 'SoftDeleteManager', 'SoftDeleteQuerySet', 'DashboardCache', 'WardMappingCache', 'AccountRenewalRequest', 'MedicalProcedure', 'Icd10Code']
+__all__ = ['SoftDeleteModel', 'SoftDeleteManager', 'SoftDeleteQuerySet', 'DashboardCache', 'WardMappingCache', 'FirebaseSyncCache', 'AccountRenewalRequest', 'MedicalProcedure', 'Icd10Code', 'LegacyImportKey']
@@ -24,4 +24,17 @@ class WardMappingCache(models.Model):
         db_table = 'core_ward_mapping_cache'
 
     def __str__(self):
-        return f"WardMappingCache({self.cache_key})"
\ No newline at end of file
+        return f"WardMappingCache({self.cache_key})"
+
+
+class FirebaseSyncCache(models.Model):
+    """Firebase sync state kept between runs"""
+    cache_key = models.CharField(max_length=100, primary_key=True)
+    data = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'core_firebase_sync_cache'
+
+    def __str__(self):
+        return f"FirebaseSyncCache({self.cache_key})"
@@ -0,0 +1,52 @@
+"""
+Mapping of records imported from legacy systems to the events created for them.
+"""
+
+from django.db import models
+
+
+class LegacyImportKey(models.Model):
+    """
+    Key of an imported legacy record (e.g. a Firebase push ID).
+
+    Importers look keys up here, one batch per chunk, to skip records they
+    already imported instead of searching event text for the key.
+    """
+
+    class Source(models.TextChoices):
+        FIREBASE_DAILYNOTE = "firebase_dailynote", "Evolução do Firebase"
+        FIREBASE_DISCHARGE_REPORT = "firebase_discharge_report", "Relatório de alta do Firebase"
+
+    source = models.CharField(
+        max_length=50,
+        choices=Source.choices,
+        verbose_name="Origem",
+    )
+    external_key = models.CharField(
+        max_length=255,
+        verbose_name="Chave externa",
+    )
+    event = models.ForeignKey(
+        "events.Event",
+        on_delete=models.CASCADE,
+        related_name="legacy_import_keys",
+        verbose_name="Evento",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Importado em",
+    )
+
+    class Meta:
+        verbose_name = "Chave de importação legada"
+        verbose_name_plural = "Chaves de importação legadas"
+        db_table = "core_legacy_import_key"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "external_key"],
+                name="core_legacy_import_key_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.source}:{self.external_key}"
@@ -12,6 +12,7 @@ from .utils import (
     can_change_patient_personal_data,
     can_delete_event,
     can_see_patient_in_search,
+    patient_access_filter,
     is_doctor,
     has_django_permission,
     is_in_group,
@@ -54,6 +55,7 @@ from .cache import (
     invalidate_object_permissions,
     get_cache_stats,
     clear_permission_cache,
+    get_patient_access_scope,
     is_caching_enabled,
 )
 
@@ -78,6 +80,7 @@ __all__ = [
     'can_change_patient_personal_data',
     'can_delete_event',
     'can_see_patient_in_search',
+    'patient_access_filter',
     'is_doctor',
     'has_django_permission',
     'is_in_group',
@@ -116,6 +119,7 @@ __all__ = [
     'invalidate_object_permissions',
     'get_cache_stats',
     'clear_permission_cache',
+    'get_patient_access_scope',
     'is_caching_enabled',
 
     # Query optimization utilities
@@ -148,36 +148,44 @@ def clear_permission_cache() -> None:
     cache.set(global_version_key, current_version + 1, None)
 
 
-def get_user_accessible_patients(user):
+def get_patient_access_scope(user) -> str:
     """
-    Get list of patient IDs that a user can access (simplified).
-    
+    Get an opaque token naming the set of patients a user can access.
+
+    Users with the same token see the same patients, so data derived from
+    patient access (e.g. list filter options) can be cached once per scope
+    instead of once per user.
+
     Args:
         user: The user object
-        
+
     Returns:
-        list: List of all patient IDs for authenticated users
+        str: Scope token, suitable for cache keys
     """
     if not getattr(user, 'is_authenticated', False):
-        return []
-    
-    # Generate cache key for user's accessible patients
-    cache_key = generate_cache_key(user.id, 'accessible_patients')
-    
-    # Try to get from cache
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        return cached_result
-    
-    # Get all patient IDs (simplified - all patients accessible)
+        return 'none'
+    # Simplified - all authenticated users share one scope
+    return 'all'
+
+
+def get_user_accessible_patients(user):
+    """
+    Get the IDs of patients that a user can access (simplified).
+
+    Kept for backward compatibility: filter with
+    apps.core.permissions.utils.patient_access_filter instead, which
+    does not load any IDs.
+
+    Args:
+        user: The user object
+
+    Returns:
+        QuerySet: Lazy values_list of accessible patient IDs
+    """
     from apps.patients.models import Patient
-    
-    accessible_patient_ids = list(Patient.objects.values_list('id', flat=True))
-    
-    # Cache the result
-    cache.set(cache_key, accessible_patient_ids, PERMISSION_CACHE_TIMEOUT)
-    
-    return accessible_patient_ids
+    from .utils import patient_access_filter
+
+    return Patient.objects.filter(patient_access_filter(user)).values_list('id', flat=True)
 
 
 def is_caching_enabled() -> bool:
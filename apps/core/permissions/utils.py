@@ -5,6 +5,7 @@ This module provides simplified role-based permission checking logic
 after removing hospital context complexity.
 """
 
+from django.db.models import Q
 from django.utils import timezone
 from datetime import timedelta
 from typing import Any, Optional
@@ -43,6 +44,33 @@ def can_access_patient(user: Any, patient: Any) -> bool:
     return getattr(user, 'is_authenticated', False)
 
 
+def patient_access_filter(user: Any, lookup: str = '') -> Q:
+    """
+    Build the query predicate matching the patients a user can access.
+
+    This is the queryset counterpart of can_access_patient: the database
+    applies it, so no patient IDs are loaded or sent back in an IN clause.
+
+    Simplified Rules:
+    - All authenticated users can access all (not deleted) patients
+
+    Args:
+        user: The user requesting access
+        lookup: Path from the filtered model to Patient, e.g. 'patient' for
+            events; empty when filtering Patient itself
+
+    Returns:
+        Q: Predicate for filter()
+    """
+    prefix = f'{lookup}__' if lookup else ''
+    if not getattr(user, 'is_authenticated', False):
+        return Q(**{f'{prefix}pk__in': []})
+    if lookup:
+        # Patient.objects already hides deleted patients; a join does not
+        return Q(**{f'{prefix}is_deleted': False})
+    return Q()
+
+
 def can_edit_event(user: Any, event: Any) -> bool:
     """
     Check if a user can edit a specific event.
@@ -385,14 +413,10 @@ def get_user_accessible_patients(user: Any):
         user: The user requesting access
         
     Returns:
-        QuerySet: All patients for authenticated users
+        QuerySet: Lazy queryset of the patients matching patient_access_filter
     """
-    if not user.is_authenticated:
-        from apps.patients.models import Patient
-        return Patient.objects.none()
-    
     from apps.patients.models import Patient
-    return Patient.objects.all()
+    return Patient.objects.filter(patient_access_filter(user))
 
 
 def can_create_event_type(user: Any, patient: Any, event_type: str) -> bool:
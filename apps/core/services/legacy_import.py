@@ -0,0 +1,48 @@
+"""
+Idempotency of legacy imports (Firebase daily notes, discharge reports).
+
+Importers check a whole chunk of incoming records against LegacyImportKey
+with one query and register the events they create, instead of searching
+event text for the legacy key of each record.
+"""
+
+from apps.core.models import LegacyImportKey
+
+
+def get_imported_keys(source, external_keys):
+    """
+    Return which of the given legacy keys were already imported.
+
+    Args:
+        source: LegacyImportKey.Source value
+        external_keys: Iterable of legacy keys, typically one chunk
+
+    Returns:
+        set: The keys found, looked up with a single IN query
+    """
+    external_keys = list(external_keys)
+    if not external_keys:
+        return set()
+    return set(
+        LegacyImportKey.objects.filter(
+            source=source, external_key__in=external_keys
+        ).values_list("external_key", flat=True)
+    )
+
+
+def record_imported_keys(source, event_ids_by_key):
+    """
+    Register imported events under their legacy keys.
+
+    Args:
+        source: LegacyImportKey.Source value
+        event_ids_by_key: Mapping of legacy key to the pk of the created event;
+            keys already registered are left untouched
+    """
+    LegacyImportKey.objects.bulk_create(
+        [
+            LegacyImportKey(source=source, external_key=key, event_id=event_id)
+            for key, event_id in event_ids_by_key.items()
+        ],
+        ignore_conflicts=True,
+    )
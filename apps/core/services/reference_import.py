@@ -0,0 +1,169 @@
+"""
+Set-based import of reference code catalogs (ICD-10, procedures).
+
+Rows are COPYed into a temporary staging table and merged into the
+catalog with one INSERT ... ON CONFLICT (code), one UPDATE to deactivate
+codes missing from the file and one UPDATE of the search vectors, so a
+full catalog load is a handful of statements instead of a round-trip per
+code. Dry runs stage the file the same way and only count.
+"""
+
+import csv
+import io
+from dataclasses import dataclass, field
+
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.core.services.reference_index import invalidate_reference_index
+
+STAGING_TABLE = 'reference_import_staging'
+
+
+@dataclass
+class ReferenceImportResult:
+    """Row counts of a catalog import."""
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    deactivated: int = 0
+    rejected: list = field(default_factory=list)  # codes failing code_format
+
+    @property
+    def changed(self):
+        return bool(self.created or self.updated or self.deactivated)
+
+
+def _stage_rows(cursor, rows):
+    """COPY rows into the staging table, keeping the last row of a repeated code."""
+    cursor.execute(
+        f'CREATE TEMPORARY TABLE {STAGING_TABLE} ('
+        'position integer, code varchar(20), description text, is_active boolean'
+        ') ON COMMIT DROP'
+    )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for position, row in enumerate(rows):
+        writer.writerow([position, row['code'], row['description'], bool(row['is_active'])])
+    buffer.seek(0)
+    cursor.copy_expert(
+        f'COPY {STAGING_TABLE} (position, code, description, is_active) FROM STDIN WITH (FORMAT csv)',
+        buffer,
+    )
+
+    cursor.execute(
+        f'DELETE FROM {STAGING_TABLE} staged USING {STAGING_TABLE} later '
+        'WHERE later.code = staged.code AND later.position > staged.position'
+    )
+    cursor.execute(f'ANALYZE {STAGING_TABLE}')
+    cursor.execute(f'SELECT count(*) FROM {STAGING_TABLE}')
+    return cursor.fetchone()[0]
+
+
+def _count_changes(cursor, table, update, deactivate_missing):
+    """Count what a merge would do, without doing it."""
+    cursor.execute(
+        f'SELECT '
+        f'count(*) FILTER (WHERE target.code IS NULL), '
+        f'count(*) FILTER (WHERE target.code IS NOT NULL AND '
+        f'(target.description, target.is_active) IS DISTINCT FROM (staged.description, staged.is_active)) '
+        f'FROM {STAGING_TABLE} staged LEFT JOIN {table} target ON target.code = staged.code'
+    )
+    created, changed = cursor.fetchone()
+    return created, changed if update else 0, _count_missing(cursor, table) if deactivate_missing else 0
+
+
+def _count_missing(cursor, table):
+    cursor.execute(
+        f'SELECT count(*) FROM {table} target WHERE target.is_active AND NOT EXISTS '
+        f'(SELECT 1 FROM {STAGING_TABLE} staged WHERE staged.code = target.code)'
+    )
+    return cursor.fetchone()[0]
+
+
+def _merge(cursor, table, update):
+    """Insert new codes and, if asked, rewrite changed ones; return (created, updated)."""
+    if update:
+        conflict = (
+            'DO UPDATE SET description = EXCLUDED.description, is_active = EXCLUDED.is_active, '
+            'updated_at = EXCLUDED.updated_at '
+            'WHERE (target.description, target.is_active) '
+            'IS DISTINCT FROM (EXCLUDED.description, EXCLUDED.is_active)'
+        )
+    else:
+        conflict = 'DO NOTHING'
+
+    # xmax is 0 only on rows this statement inserted
+    cursor.execute(
+        f'WITH merged AS ('
+        f'INSERT INTO {table} AS target (id, code, description, is_active, created_at, updated_at) '
+        f'SELECT gen_random_uuid(), code, description, is_active, now(), now() FROM {STAGING_TABLE} '
+        f'ON CONFLICT (code) {conflict} '
+        f'RETURNING (target.xmax = 0) AS inserted'
+        f') SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged'
+    )
+    return cursor.fetchone()
+
+
+def _deactivate_missing(cursor, table):
+    cursor.execute(
+        f'UPDATE {table} target SET is_active = false, updated_at = now() '
+        f'WHERE target.is_active AND NOT EXISTS '
+        f'(SELECT 1 FROM {STAGING_TABLE} staged WHERE staged.code = target.code)'
+    )
+    return cursor.rowcount
+
+
+def import_reference_rows(model, rows, code_format, update=False, deactivate_missing=False, dry_run=False):
+    """
+    Merge catalog rows into a reference table.
+
+    Args:
+        model: Icd10Code or MedicalProcedure
+        rows: Dicts with code, description and is_active
+        code_format: Compiled regex mirroring the table's code CHECK constraint;
+            rows that do not match are reported instead of aborting the merge
+        update: Rewrite existing codes whose description/is_active changed
+        deactivate_missing: Deactivate active codes absent from rows
+        dry_run: Only count what would change
+
+    Returns:
+        ReferenceImportResult
+    """
+    result = ReferenceImportResult()
+    valid_rows = []
+    for row in rows:
+        if code_format.match(row['code']):
+            valid_rows.append(row)
+        else:
+            result.rejected.append(row['code'])
+
+    table = connection.ops.quote_name(model._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        staged = _stage_rows(cursor, valid_rows)
+
+        if dry_run:
+            result.created, result.updated, result.deactivated = _count_changes(
+                cursor, table, update, deactivate_missing
+            )
+            result.skipped = staged - result.created - result.updated
+            transaction.set_rollback(True)
+            return result
+
+        cursor.execute('SELECT now()')
+        started_at = cursor.fetchone()[0]
+
+        result.created, result.updated = _merge(cursor, table, update)
+        result.skipped = staged - result.created - result.updated
+        if deactivate_missing:
+            result.deactivated = _deactivate_missing(cursor, table)
+
+        if result.changed:
+            model.objects.filter(
+                Q(updated_at__gte=started_at) | Q(search_vector__isnull=True)
+            ).update(search_vector=SearchVector('code', 'description'))
+
+    invalidate_reference_index(model)
+    return result
@@ -0,0 +1,246 @@
+"""
+In-process typeahead index for reference code tables (ICD-10, procedures).
+
+The code tables are static reference data that only change on import, so
+each worker keeps the whole table in memory: a sorted list of codes for
+code prefixes, and prefix/trigram maps over the unaccented description
+tokens. The index is versioned by the table generation (row count and
+latest updated_at), re-read from the database at most every
+GENERATION_CHECK_SECONDS; saves and deletes in the same process drop the
+index immediately.
+"""
+
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from typing import NamedTuple
+
+from django.db.models import Count, Max
+
+# How long a worker trusts its cached generation before asking the database
+GENERATION_CHECK_SECONDS = 10
+
+TRIGRAM_MIN_LENGTH = 3
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_CODE_RE = re.compile(r'[^0-9A-Z]')
+
+_lock = threading.Lock()
+_generations = {}  # db_table -> (ReferenceGeneration, checked_at)
+_indexes = {}  # db_table -> ReferenceIndex
+
+
+class ReferenceGeneration(NamedTuple):
+    """Version of a reference table as seen by the database."""
+    count: int
+    last_modified: object  # datetime or None for an empty table
+
+    @property
+    def token(self):
+        stamp = self.last_modified.timestamp() if self.last_modified else 0
+        return f'{self.count}-{stamp:.6f}'
+
+
+class ReferenceEntry(NamedTuple):
+    """Lightweight copy of an ICD-10 code or procedure row."""
+    id: object
+    code: str
+    description: str
+    is_active: bool
+
+    @property
+    def short_description(self):
+        if len(self.description) <= 100:
+            return self.description
+        return self.description[:97] + "..."
+
+    def get_display_text(self):
+        return f"{self.code} - {self.short_description}"
+
+
+def normalize_text(text):
+    """Lowercase text and strip accents."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def normalize_code(text):
+    """Uppercase a code and drop punctuation (A00.1 -> A001)."""
+    return _CODE_RE.sub('', normalize_text(text).upper())
+
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class ReferenceIndex:
+    """Prefix/trigram index over the rows of one reference table, given in code order."""
+
+    def __init__(self, generation, entries):
+        self.generation = generation
+        self.entries = entries
+        self.by_id = {str(entry.id): entry for entry in entries}
+        self._inactive = {position for position, entry in enumerate(entries) if not entry.is_active}
+
+        keyed_codes = sorted((normalize_code(entry.code), position) for position, entry in enumerate(entries))
+        self._codes = [code for code, _ in keyed_codes]
+        self._code_positions = [position for _, position in keyed_codes]
+
+        postings = {}
+        for position, entry in enumerate(entries):
+            tokens = set(_TOKEN_RE.findall(normalize_text(entry.description)))
+            tokens.add(normalize_code(entry.code).lower())
+            for token in tokens:
+                postings.setdefault(token, []).append(position)
+
+        self._vocabulary = sorted(postings)
+        self._postings = [postings[token] for token in self._vocabulary]
+        self._trigrams = {}
+        for token_position, token in enumerate(self._vocabulary):
+            for trigram in _trigrams(token):
+                self._trigrams.setdefault(trigram, []).append(token_position)
+
+    def get(self, entry_id):
+        return self.by_id.get(str(entry_id))
+
+    def get_by_code(self, code):
+        key = normalize_code(code)
+        position = bisect.bisect_left(self._codes, key)
+        if position < len(self._codes) and self._codes[position] == key:
+            return self.entries[self._code_positions[position]]
+        return None
+
+    def _prefix_range(self, keys, prefix):
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', start)
+        return range(start, end)
+
+    def _term_matches(self, term):
+        """Return the entry positions with a word starting with / containing a term."""
+        prefix_tokens = self._prefix_range(self._vocabulary, term)
+        prefix = set().union(*(self._postings[token] for token in prefix_tokens))
+
+        infix = set()
+        if len(term) >= TRIGRAM_MIN_LENGTH:
+            trigram_sets = sorted(
+                (self._trigrams.get(trigram, ()) for trigram in _trigrams(term)), key=len
+            )
+            candidates = set(trigram_sets[0]).intersection(*trigram_sets[1:])
+            infix = set().union(*(
+                self._postings[token]
+                for token in candidates
+                if token not in prefix_tokens and term in self._vocabulary[token]
+            ))
+        return prefix, infix - prefix
+
+    def search(self, query, limit=20, active_only=True):
+        """
+        Rank entries matching a typeahead query.
+
+        Exact code matches come first, then code prefixes, then entries
+        whose description has a word starting with every query term, then
+        entries where some term only appears inside a word. Ties keep code
+        order.
+
+        Returns:
+            list[ReferenceEntry]: At most `limit` entries, best first
+        """
+        exact = set()
+        code_prefix = set()
+        code = normalize_code(query)
+        if code:
+            for position in self._prefix_range(self._codes, code):
+                target = exact if self._codes[position] == code else code_prefix
+                target.add(self._code_positions[position])
+
+        word_prefix = None
+        word_infix = set()
+        for term in set(_TOKEN_RE.findall(normalize_text(query))):
+            prefix, infix = self._term_matches(term)
+            if word_prefix is None:
+                word_prefix, word_infix = prefix, infix
+            else:
+                matched = (word_prefix | word_infix) & (prefix | infix)
+                word_infix = matched & (word_infix | infix)
+                word_prefix = matched - word_infix
+            if not word_prefix and not word_infix:
+                break
+
+        results = []
+        seen = set()
+        for tier in (exact, code_prefix, word_prefix or set(), word_infix):
+            tier = tier - seen
+            if active_only:
+                tier -= self._inactive
+            seen |= tier
+            results.extend(sorted(tier)[:limit - len(results)])
+            if len(results) >= limit:
+                break
+        return [self.entries[position] for position in results]
+
+
+def get_generation(model, fresh=False):
+    """
+    Return the generation of a reference table, re-checked at most every few seconds.
+
+    fresh=True always asks the database, for tables users edit themselves,
+    where a generation up to GENERATION_CHECK_SECONDS old is visibly stale.
+    """
+    table = model._meta.db_table
+    now = time.monotonic()
+    cached = _generations.get(table)
+    if not fresh and cached and now - cached[1] < GENERATION_CHECK_SECONDS:
+        return cached[0]
+
+    stats = model.objects.aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+    generation = ReferenceGeneration(stats['count'], stats['last_modified'])
+    _generations[table] = (generation, now)
+    return generation
+
+
+def get_reference_index(model):
+    """Return this worker's index of a reference table, rebuilding it if the table changed."""
+    table = model._meta.db_table
+    generation = get_generation(model)
+    index = _indexes.get(table)
+    if index is not None and index.generation == generation:
+        return index
+
+    with _lock:
+        index = _indexes.get(table)
+        if index is None or index.generation != generation:
+            rows = model.objects.order_by('code').values_list('id', 'code', 'description', 'is_active')
+            index = ReferenceIndex(generation, [ReferenceEntry(*row) for row in rows])
+            _indexes[table] = index
+    return index
+
+
+def invalidate_reference_index(model):
+    """Drop this worker's cached generation and index of a reference table."""
+    table = model._meta.db_table
+    _generations.pop(table, None)
+    _indexes.pop(table, None)
+
+
+def search_reference(model, query, limit=20, active_only=True):
+    """Typeahead search over a reference table (see ReferenceIndex.search)."""
+    return get_reference_index(model).search(query, limit=limit, active_only=active_only)
+
+
+def get_reference_entries(model, entry_ids, active_only=False):
+    """
+    Look up reference entries by primary key.
+
+    Returns:
+        dict: Requested id -> ReferenceEntry, for the ids that exist
+    """
+    index = get_reference_index(model)
+    entries = {}
+    for entry_id in entry_ids:
+        entry = index.get(entry_id)
+        if entry is not None and (entry.is_active or not active_only):
+            entries[entry_id] = entry
+    return entries
+
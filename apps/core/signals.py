@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Icd10Code, MedicalProcedure
+from .services.reference_index import invalidate_reference_index
+
+
+@receiver(post_save, sender=Icd10Code)
+@receiver(post_delete, sender=Icd10Code)
+@receiver(post_save, sender=MedicalProcedure)
+@receiver(post_delete, sender=MedicalProcedure)
+def drop_reference_index(sender, **kwargs):
+    """Rebuild this worker's typeahead index after a code is changed here."""
+    invalidate_reference_index(sender)
@@ -0,0 +1,109 @@
+"""
+In-memory stand-in for firebase_admin.db, for testing the Firebase sync
+commands without a Realtime Database.
+
+Patch it over the module's db (e.g. patch.object(sync_module, "db", fake)).
+Only the parts of the reference/query API the commands use are provided,
+and every download is recorded in FakeFirebaseDatabase.requests.
+"""
+
+
+class FakeFirebaseError(Exception):
+    """Raised where the Realtime Database would reject a request"""
+
+
+class FakeFirebaseDatabase:
+    """
+    Tree of plain dicts served through db.reference().
+
+    Like the Realtime Database, queries ordered by a child fail unless that
+    child is listed in indexes.
+    """
+
+    def __init__(self, data, indexes=()):
+        self.data = data
+        self.indexes = set(indexes)
+        self.requests = []
+
+    def reference(self, path="/"):
+        return FakeReference(self, path)
+
+    def downloaded(self, path):
+        """Number of child nodes returned so far by requests on path"""
+        return sum(size for request_path, _, size in self.requests if request_path == path)
+
+
+class FakeReference:
+    def __init__(self, database, path):
+        self.database = database
+        self.path = path.strip("/")
+
+    def _node(self):
+        node = self.database.data
+        for part in filter(None, self.path.split("/")):
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+
+    def _record(self, kind, result):
+        size = len(result) if isinstance(result, dict) else 1
+        self.database.requests.append((self.path, kind, size))
+        return result
+
+    def child(self, path):
+        return FakeReference(self.database, f"{self.path}/{path}")
+
+    def get(self, shallow=False):
+        node = self._node()
+        if shallow and isinstance(node, dict):
+            return self._record("shallow", {key: True for key in node})
+        return self._record("get", node)
+
+    def order_by_key(self):
+        return FakeQuery(self)
+
+    def order_by_child(self, path):
+        if path not in self.database.indexes:
+            raise FakeFirebaseError(f'Index not defined, add ".indexOn": "{path}"')
+        return FakeQuery(self, path)
+
+
+class FakeQuery:
+    """Query ordered by key or by a child value; start_at is inclusive, as in Firebase."""
+
+    def __init__(self, reference, child=None):
+        self.reference = reference
+        self.child = child
+        self.limit = None
+        self.start = None
+
+    def limit_to_first(self, limit):
+        self.limit = limit
+        return self
+
+    def start_at(self, start):
+        self.start = start
+        return self
+
+    def _value(self, key, node):
+        if self.child is None:
+            return key
+        return node.get(self.child) if isinstance(node, dict) else None
+
+    def get(self):
+        node = self.reference._node() or {}
+        # Children without the value sort first and never match start_at
+        values = {key: self._value(key, child) for key, child in node.items()}
+        keys = sorted(
+            (
+                key
+                for key, value in values.items()
+                if self.start is None
+                or (isinstance(value, type(self.start)) and value >= self.start)
+            ),
+            key=lambda key: (values[key] is not None, str(values[key] or ""), key),
+        )
+        if self.limit is not None:
+            keys = keys[: self.limit]
+        return self.reference._record("query", {key: node[key] for key in keys})
@@ -0,0 +1,123 @@
+from datetime import date, datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.core.management.commands import sync_firebase_data
+from apps.core.management.commands.sync_firebase_data import Command
+from apps.core.models import FirebaseSyncCache, LegacyImportKey
+from apps.patients.models import Patient, PatientRecordNumber
+
+from .firebase_fakes import FakeFirebaseDatabase
+
+User = get_user_model()
+
+
+class CurrentDailynoteKeysTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass123",
+            password_change_required=False,
+            terms_accepted=True,
+        )
+        self.firebase = FakeFirebaseDatabase(
+            {
+                "patients": {
+                    "-Npatient1": {"name": "Maria Silva", "currentdailynotekey": "-Ndraft10"},
+                    "-Npatient2": {"name": "Joao Souza", "currentdailynotekey": "-Ndraft20"},
+                    "-Npatient3": {"name": "Ana Lima"},
+                },
+                "dailynotes": {},
+            },
+            indexes=["currentdailynotekey"],
+        )
+
+    def _build_command(self, dry_run=False):
+        command = Command()
+        command.dry_run = dry_run
+        command.import_user = self.user
+        command.stdout = StringIO()
+        command.chunk_size = 2
+        command.limit = None
+        command.sync_since_timestamp = 0
+        return command
+
+    def _current_keys(self, command=None):
+        with patch.object(sync_firebase_data, "db", self.firebase):
+            return (command or self._build_command()).get_current_dailynote_keys()
+
+    def test_only_patients_with_drafts_are_read_in_chunks(self):
+        self.assertEqual(self._current_keys(), {"-Ndraft10": "-Npatient1", "-Ndraft20": "-Npatient2"})
+
+        self.assertNotIn(("patients", "get", 3), self.firebase.requests)
+        self.assertEqual(
+            self.firebase.requests,
+            [("patients", "query", 2), ("patients", "query", 1)],
+        )
+
+    def test_next_run_reads_only_changed_patients(self):
+        self._current_keys()
+        patients = self.firebase.data["patients"]
+        patients["-Npatient1"]["currentdailynotekey"] = "-Ndraft30"
+        patients["-Npatient3"]["currentdailynotekey"] = "-Ndraft31"
+        for number in range(4, 20):
+            patients[f"-Npatient{number:02d}"] = {"name": "Sem rascunho"}
+        self.firebase.requests.clear()
+
+        self.assertEqual(
+            self._current_keys(),
+            {"-Ndraft30": "-Npatient1", "-Ndraft20": "-Npatient2", "-Ndraft31": "-Npatient3"},
+        )
+        # The two changed patients, plus the newest key of the last run once
+        # per query; patients without a new draft are not downloaded
+        self.assertEqual(self.firebase.downloaded("patients"), 4)
+
+    def test_result_is_cached_for_the_run(self):
+        command = self._build_command()
+        self._current_keys(command)
+        requests = len(self.firebase.requests)
+
+        self.assertIs(self._current_keys(command), command.current_dailynote_keys)
+        self.assertEqual(len(self.firebase.requests), requests)
+
+    def test_dry_run_does_not_persist_keys(self):
+        self._current_keys(self._build_command(dry_run=True))
+
+        self.assertFalse(FirebaseSyncCache.objects.exists())
+
+    def test_without_index_patients_are_walked_in_chunks(self):
+        self.firebase.indexes.clear()
+
+        self.assertEqual(self._current_keys(), {"-Ndraft10": "-Npatient1", "-Ndraft20": "-Npatient2"})
+        self.assertTrue(all(kind == "query" and size <= 3 for _, kind, size in self.firebase.requests))
+
+    def test_finished_draft_is_imported_once_its_key_is_no_longer_current(self):
+        self._current_keys()
+        patient = Patient.objects.create(
+            name="Maria Silva", birthday=date(1960, 5, 1), created_by=self.user, updated_by=self.user
+        )
+        PatientRecordNumber.objects.create(
+            patient=patient, record_number="-Npatient1", is_current=True, created_by=self.user, updated_by=self.user
+        )
+        note = {
+            "patient": "-Npatient1",
+            "datetime": int(datetime(2024, 3, 1, 8).timestamp() * 1000),
+            "username": "Dr. Test",
+            "content": {"subjective": "Sem queixas."},
+        }
+        self.firebase.data["dailynotes"] = {"-Ndraft10": note, "-Ndraft20": dict(note)}
+        # Finished on Firebase since the last run: the patient has no current note
+        del self.firebase.data["patients"]["-Npatient1"]["currentdailynotekey"]
+
+        with patch.object(sync_firebase_data, "db", self.firebase):
+            imported = self._build_command().sync_dailynotes("dailynotes")
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(list(LegacyImportKey.objects.values_list("external_key", flat=True)), ["-Ndraft10"])
+        self.assertEqual(
+            FirebaseSyncCache.objects.get().data["patients"], {"-Npatient2": "-Ndraft20"}
+        )
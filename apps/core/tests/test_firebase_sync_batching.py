@@ -0,0 +1,139 @@
+from datetime import date, datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.management.commands import sync_firebase_data
+from apps.core.management.commands.sync_firebase_data import Command
+from apps.core.models import LegacyImportKey
+from apps.dailynotes.models import DailyNote
+from apps.events.models import Event
+from apps.patients.models import Patient, PatientRecordNumber
+from apps.research.models import EventSearchEntry
+
+from .firebase_fakes import FakeFirebaseDatabase
+
+User = get_user_model()
+
+
+def _timestamp(*args):
+    return int(datetime(*args).timestamp() * 1000)
+
+
+class FirebaseSyncBatchingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass123",
+            password_change_required=False,
+            terms_accepted=True,
+        )
+        self.patient = Patient.objects.create(
+            name="Maria Silva",
+            birthday=date(1960, 5, 1),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        PatientRecordNumber.objects.create(
+            patient=self.patient,
+            record_number="-Npatient1",
+            is_current=True,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        self.firebase = FakeFirebaseDatabase(
+            {"patients": {"-Npatient1": {"name": "Maria Silva", "currentdailynotekey": "-Ndraft"}}, "dailynotes": {}}
+        )
+
+    def _build_command(self):
+        command = Command()
+        command.dry_run = False
+        command.import_user = self.user
+        command.stdout = StringIO()
+        command.chunk_size = 1000
+        command.limit = None
+        command.sync_since_timestamp = 0
+        return command
+
+    def _add_notes(self, count, start=0, patient="-Npatient1"):
+        for index in range(start, start + count):
+            self.firebase.data["dailynotes"][f"-Nnote{index:03d}"] = {
+                "patient": patient,
+                "datetime": _timestamp(2024, 3, 1, 8, index % 60),
+                "username": "Dr. Test",
+                "content": {"subjective": f"Evolucao numero {index}.", "assessplan": "Manter conduta."},
+            }
+
+    def _sync_dailynotes(self):
+        with patch.object(sync_firebase_data, "db", self.firebase):
+            with CaptureQueriesContext(connection) as queries:
+                imported = self._build_command().sync_dailynotes("dailynotes")
+        return imported, len(queries)
+
+    def test_chunk_is_imported_with_a_fixed_number_of_queries(self):
+        self._sync_dailynotes()  # stores the draft keys, updated by later runs
+        self._add_notes(3)
+        first_imported, first_queries = self._sync_dailynotes()
+
+        self._add_notes(9, start=3)
+        second_imported, second_queries = self._sync_dailynotes()
+
+        self.assertEqual((first_imported, second_imported), (3, 9))
+        self.assertEqual(first_queries, second_queries)
+        self.assertEqual(DailyNote.objects.count(), 12)
+        self.assertEqual(LegacyImportKey.objects.count(), 12)
+
+    def test_imported_notes_are_searchable(self):
+        self._add_notes(2)
+        self._sync_dailynotes()
+
+        note = DailyNote.objects.get(legacy_import_keys__external_key="-Nnote001")
+        self.assertEqual(note.event_type, Event.DAILY_NOTE_EVENT)
+        self.assertEqual(note.patient, self.patient)
+        self.assertEqual(note.created_by, self.user)
+        self.assertIn("Evolucao numero 1.", note.content)
+        query = SearchQuery("conduta", config="portuguese")
+        self.assertEqual(EventSearchEntry.objects.filter(search_vector=query).count(), 2)
+        self.assertEqual(EventSearchEntry.objects.filter(event_id=note.pk).count(), 1)
+
+    def test_drafts_unknown_patients_and_invalid_notes_are_not_imported(self):
+        self._add_notes(1)
+        self._add_notes(1, start=1, patient="-Nunknown")
+        self.firebase.data["dailynotes"]["-Ndraft"] = dict(self.firebase.data["dailynotes"]["-Nnote000"])
+        self.firebase.data["dailynotes"]["-Ninvalid"] = {"patient": "-Npatient1", "datetime": _timestamp(2024, 3, 1)}
+
+        imported, _ = self._sync_dailynotes()
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(
+            list(LegacyImportKey.objects.values_list("external_key", flat=True)), ["-Nnote000"]
+        )
+
+    def test_patients_of_a_chunk_share_one_record_lookup(self):
+        patient_data = {
+            "name": "Joao Souza",
+            "ptRecN": "pt-900",
+            "birthDt": _timestamp(1950, 1, 1),
+            "status": "outpatient",
+            "registrationDt": _timestamp(2024, 1, 1),
+        }
+        self.firebase.data["patients"] = {"-Nnew1": patient_data, "-Nnew2": dict(patient_data)}
+
+        with patch.object(sync_firebase_data, "db", self.firebase):
+            with CaptureQueriesContext(connection) as queries:
+                imported = self._build_command().sync_patients("patients")
+
+        lookups = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT") and '"patients_patientrecordnumber"."record_number" IN' in query["sql"]
+        ]
+        self.assertEqual(imported, 1)
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(Patient.objects.filter(current_record_number="pt-900").count(), 1)
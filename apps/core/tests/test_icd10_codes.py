@@ -189,6 +189,64 @@ class ImportIcd10CodesCommandTest(TestCase):
         with self.assertRaises(CommandError):
             call_command('import_icd10_codes', '--file=nonexistent.csv')
 
+    @patch('builtins.open', create=True)
+    def test_set_based_merge_reports_counts(self, mock_file):
+        Icd10Code.objects.create(code='E00', description='Unchanged', is_active=True)
+        Icd10Code.objects.create(code='E01', description='Old description', is_active=True)
+        Icd10Code.objects.create(code='E02', description='Dropped from catalog', is_active=True)
+
+        csv_data = [
+            {'codigo': 'E00', 'descricao': 'Unchanged', 'is_active': 'true'},
+            {'codigo': 'E01', 'descricao': 'First version', 'is_active': 'true'},
+            {'codigo': 'E01', 'descricao': 'New description', 'is_active': 'true'},
+            {'codigo': 'E03', 'descricao': 'Brand new', 'is_active': 'true'},
+            {'codigo': 'E-3', 'descricao': 'Bad code', 'is_active': 'true'},
+        ]
+        mock_file.return_value.__enter__.return_value = StringIO(self.create_test_csv(csv_data))
+
+        with patch('pathlib.Path.exists', return_value=True):
+            out = StringIO()
+            call_command(
+                'import_icd10_codes', '--file=test.csv', '--update', '--deactivate-missing', stdout=out
+            )
+
+        output = out.getvalue()
+        self.assertIn('Created: 1', output)
+        self.assertIn('Updated: 1', output)
+        self.assertIn('Skipped: 1', output)
+        self.assertIn('Deactivated: 1', output)
+        self.assertIn('Errors: 1', output)
+
+        self.assertEqual(Icd10Code.objects.get(code='E01').description, 'New description')
+        self.assertFalse(Icd10Code.objects.get(code='E02').is_active)
+        self.assertFalse(Icd10Code.objects.filter(search_vector__isnull=True).exists())
+        self.assertEqual(list(Icd10Code.objects.filter(search_vector='brand').values_list('code', flat=True)), ['E03'])
+
+    @patch('builtins.open', create=True)
+    def test_dry_run_counts_without_writing(self, mock_file):
+        Icd10Code.objects.create(code='F00', description='Old', is_active=True)
+        Icd10Code.objects.create(code='F01', description='Missing', is_active=True)
+
+        csv_data = [
+            {'codigo': 'F00', 'descricao': 'New', 'is_active': 'true'},
+            {'codigo': 'F02', 'descricao': 'Created', 'is_active': 'true'},
+        ]
+        mock_file.return_value.__enter__.return_value = StringIO(self.create_test_csv(csv_data))
+
+        with patch('pathlib.Path.exists', return_value=True):
+            out = StringIO()
+            call_command(
+                'import_icd10_codes', '--file=test.csv', '--dry-run', '--update', '--deactivate-missing',
+                stdout=out
+            )
+
+        output = out.getvalue()
+        self.assertIn('Created: 1', output)
+        self.assertIn('Updated: 1', output)
+        self.assertIn('Would deactivate 1', output)
+        self.assertEqual(Icd10Code.objects.count(), 2)
+        self.assertEqual(Icd10Code.objects.get(code='F00').description, 'Old')
+
 
 class Icd10CodesAPITest(TestCase):
     """Test ICD-10 API endpoints."""
@@ -0,0 +1,101 @@
+import importlib
+from datetime import date, datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.management.commands.sync_firebase_data import Command
+from apps.core.models import LegacyImportKey
+from apps.core.services.legacy_import import get_imported_keys, record_imported_keys
+from apps.dailynotes.models import DailyNote
+from apps.patients.models import Patient, PatientRecordNumber
+
+User = get_user_model()
+
+DAILYNOTE = LegacyImportKey.Source.FIREBASE_DAILYNOTE
+
+
+class LegacyImportKeyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass123",
+            password_change_required=False,
+            terms_accepted=True,
+        )
+        self.patient = Patient.objects.create(
+            name="Maria Silva",
+            birthday=date(1960, 5, 1),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        PatientRecordNumber.objects.create(
+            patient=self.patient,
+            record_number="firebase-patient-key",
+            is_current=True,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        self.note_data = {
+            "patient": "firebase-patient-key",
+            "datetime": int(datetime(2024, 3, 1, 8).timestamp() * 1000),
+            "username": "Dr. Test",
+            "content": {"subjective": "Sem queixas.", "assessplan": "Manter conduta."},
+        }
+
+    def _build_command(self):
+        command = Command()
+        command.dry_run = False
+        command.import_user = self.user
+        command.stdout = StringIO()
+        return command
+
+    def _note(self, content):
+        return DailyNote.objects.create(
+            patient=self.patient,
+            event_datetime=timezone.now(),
+            description="Evolucao",
+            content=content,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def test_imported_dailynote_is_registered_and_not_imported_again(self):
+        command = self._build_command()
+
+        self.assertEqual(command.process_firebase_dailynote("-Nnote1", self.note_data), "imported")
+        note = DailyNote.objects.get()
+        self.assertEqual(get_imported_keys(DAILYNOTE, ["-Nnote1", "-Nnote2"]), {"-Nnote1"})
+        self.assertEqual(LegacyImportKey.objects.get(external_key="-Nnote1").event_id, note.pk)
+
+        self.assertEqual(command.process_firebase_dailynote("-Nnote1", self.note_data), "skipped")
+        self.assertEqual(DailyNote.objects.count(), 1)
+
+    def test_chunk_lookup_is_a_single_query(self):
+        note = self._note("Evolucao importada")
+        record_imported_keys(DAILYNOTE, {f"-Nkey{index}": note.pk for index in range(50)})
+        record_imported_keys(DAILYNOTE, {"-Nkey0": note.pk})  # already registered: ignored
+
+        with self.assertNumQueries(1):
+            found = get_imported_keys(DAILYNOTE, [f"-Nkey{index}" for index in range(0, 100, 2)])
+        self.assertEqual(len(found), 25)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_imported_keys(DAILYNOTE, []), set())
+
+    def test_backfill_reads_keys_from_imported_content(self):
+        imported = self._note("Evolucao sincronizada\n\nMedico: Dr. Test\n\nFirebase ID: -Nlegacy")
+        self._note("Evolucao escrita no sistema")
+
+        migration = importlib.import_module("apps.core.migrations.0005_backfill_legacy_import_keys")
+        with connection.schema_editor() as schema_editor:
+            migration.backfill_legacy_import_keys(None, schema_editor)
+            migration.backfill_legacy_import_keys(None, schema_editor)
+
+        self.assertEqual(
+            list(LegacyImportKey.objects.values_list("source", "external_key", "event_id")),
+            [(DAILYNOTE, "-Nlegacy", imported.pk)],
+        )
@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.permissions import get_patient_access_scope, patient_access_filter
+from apps.dailynotes.models import DailyNote
+from apps.patients.models import Patient
+
+User = get_user_model()
+
+
+class PatientAccessFilterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="access-doctor",
+            email="access-doctor@example.com",
+            password="testpass123",
+        )
+        self.patient = Patient.objects.create(
+            name="Paciente Ativo", birthday="1970-01-01", status=1, created_by=self.user, updated_by=self.user
+        )
+        self.deleted = Patient.objects.create(
+            name="Paciente Removido", birthday="1971-01-01", status=1, created_by=self.user, updated_by=self.user
+        )
+        Patient.all_objects.filter(pk=self.deleted.pk).update(is_deleted=True)
+
+        self.note = self._note(self.patient)
+        self.deleted_note = self._note(self.deleted)
+
+    def _note(self, patient):
+        return DailyNote.objects.create(
+            patient=patient,
+            description="Evolucao",
+            content="Sem intercorrencias.",
+            event_datetime=timezone.now(),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def test_authenticated_user_sees_patients_without_an_id_list(self):
+        self.assertEqual(list(Patient.objects.filter(patient_access_filter(self.user))), [self.patient])
+
+        notes = DailyNote.objects.filter(patient_access_filter(self.user, "patient"))
+        self.assertEqual(list(notes), [self.note])
+        self.assertNotIn(" IN (", str(notes.query))
+
+    def test_anonymous_user_matches_nothing_without_querying(self):
+        anonymous = AnonymousUser()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(list(Patient.objects.filter(patient_access_filter(anonymous))), [])
+            self.assertEqual(list(DailyNote.objects.filter(patient_access_filter(anonymous, "patient"))), [])
+
+    def test_scope_token_is_shared_by_users_with_the_same_access(self):
+        other = User.objects.create_user(username="access-nurse", email="access-nurse@example.com", password="x")
+
+        self.assertEqual(get_patient_access_scope(self.user), get_patient_access_scope(other))
+        self.assertNotEqual(get_patient_access_scope(self.user), get_patient_access_scope(AnonymousUser()))
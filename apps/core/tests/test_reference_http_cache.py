@@ -0,0 +1,134 @@
+import gzip
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.models import Icd10Code
+from apps.drugtemplates.models import DrugTemplate
+
+
+User = get_user_model()
+
+
+def _create_user(username):
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="testpass123",
+        password_change_required=False,
+        terms_accepted=True,
+        terms_accepted_at=timezone.now(),
+    )
+
+
+class ReferenceHttpCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = _create_user("reference-cache-user")
+        self.client.force_login(self.user)
+        self.code = Icd10Code.objects.create(code="J45", description="Asma")
+        self.search_url = reverse("apps.core:icd10_search_api")
+
+    def _reference_queries(self, response_func):
+        with CaptureQueriesContext(connection) as queries:
+            response = response_func()
+        return response, [query["sql"] for query in queries if "core_icd10code" in query["sql"]]
+
+    def test_search_sends_validators_and_private_max_age(self):
+        response = self.client.get(self.search_url, {"q": "asma"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("max-age=300", response["Cache-Control"])
+
+    def test_matching_etag_is_answered_without_reference_queries(self):
+        etag = self.client.get(self.search_url, {"q": "asma"})["ETag"]
+
+        response, reference_queries = self._reference_queries(
+            lambda: self.client.get(self.search_url, {"q": "asma"}, HTTP_IF_NONE_MATCH=etag)
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(reference_queries, [])
+
+    def test_etag_changes_when_the_table_changes(self):
+        etag = self.client.get(self.search_url, {"q": "asma"})["ETag"]
+
+        self.code.description = "Asma brônquica"
+        self.code.save()
+
+        response = self.client.get(self.search_url, {"q": "asma"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_body_is_gzipped_once_per_generation(self):
+        url = reverse("apps.core:icd10_list_api")
+        first = self.client.get(url, {"page": 1}, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(first["Content-Encoding"], "gzip")
+        self.assertTrue(first["ETag"].startswith("W/"))
+        payload = json.loads(gzip.decompress(first.content))
+        self.assertEqual([result["code"] for result in payload["results"]], ["J45"])
+
+        second, reference_queries = self._reference_queries(lambda: self.client.get(url, {"page": 1}))
+        self.assertEqual(reference_queries, [])
+        self.assertFalse(second.has_header("Content-Encoding"))
+        self.assertEqual(json.loads(second.content), payload)
+
+
+class DrugTemplateHttpCacheTests(TestCase):
+    def test_drug_template_etag_is_per_user_and_revalidated(self):
+        owner = _create_user("template-owner")
+        other = _create_user("template-other")
+        DrugTemplate.objects.create(
+            name="Dipirona",
+            concentration="500 mg",
+            pharmaceutical_form="comprimido",
+            usage_instructions="Tomar 1 comprimido a cada 8 horas.",
+            creator=owner,
+            is_public=False,
+        )
+        url = reverse("outpatientprescriptions:search_drug_templates")
+
+        self.client.force_login(owner)
+        owner_response = self.client.get(url, {"q": "dipirona"})
+        self.assertEqual(len(owner_response.json()["results"]), 1)
+        self.assertIn("no-cache", owner_response["Cache-Control"])
+        self.assertFalse(owner_response.has_header("Last-Modified"))
+
+        self.client.force_login(other)
+        other_response = self.client.get(url, {"q": "dipirona"}, HTTP_IF_NONE_MATCH=owner_response["ETag"])
+        self.assertEqual(other_response.status_code, 200)
+        self.assertEqual(other_response.json()["results"], [])
+
+    def test_drug_template_edit_in_another_worker_is_not_answered_with_304(self):
+        owner = _create_user("template-editor")
+        template = DrugTemplate.objects.create(
+            name="Dipirona",
+            concentration="500 mg",
+            pharmaceutical_form="comprimido",
+            usage_instructions="Tomar 1 comprimido a cada 8 horas.",
+            creator=owner,
+            is_public=False,
+        )
+        url = reverse("outpatientprescriptions:get_drug_template_data", args=[template.pk])
+        self.client.force_login(owner)
+        etag = self.client.get(url)["ETag"]
+
+        # update() skips the signals that drop this worker's memo, as a save
+        # handled by another worker would
+        DrugTemplate.objects.filter(pk=template.pk).update(
+            usage_instructions="Tomar 1 comprimido a cada 6 horas.", updated_at=timezone.now()
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["usage_instructions"], "Tomar 1 comprimido a cada 6 horas.")
@@ -0,0 +1,95 @@
+import uuid
+
+from django.test import SimpleTestCase, TestCase
+
+from apps.core.models import Icd10Code, MedicalProcedure
+from apps.core.services.reference_index import (
+    ReferenceEntry,
+    ReferenceIndex,
+    get_generation,
+    get_reference_entries,
+    get_reference_index,
+    search_reference,
+)
+
+
+def _entry(code, description, is_active=True):
+    return ReferenceEntry(uuid.uuid4(), code, description, is_active)
+
+
+class ReferenceIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.a00 = _entry('A00', 'Cólera')
+        self.a001 = _entry('A001', 'Cólera devida a Vibrio cholerae 01, biótipo El Tor')
+        self.i10 = _entry('I10', 'Hipertensão essencial (primária)')
+        self.i11 = _entry('I11', 'Doença cardíaca hipertensiva')
+        self.i42 = _entry('I42', 'Miocardiopatia')
+        self.old = _entry('Z999', 'Código antigo cardíaco', is_active=False)
+        self.index = ReferenceIndex(None, [self.a00, self.a001, self.i10, self.i11, self.i42, self.old])
+
+    def test_code_matches_rank_exact_before_prefix(self):
+        self.assertEqual(self.index.search('a00'), [self.a00, self.a001])
+        self.assertEqual(self.index.search('A00.1'), [self.a001])
+
+    def test_description_tokens_are_unaccented_prefixes(self):
+        self.assertEqual(self.index.search('colera'), [self.a00, self.a001])
+        self.assertEqual(self.index.search('HIPERTENS'), [self.i10, self.i11])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.index.search('colera tor'), [self.a001])
+        self.assertEqual(self.index.search('a00 vibrio'), [self.a001])
+        self.assertEqual(self.index.search('colera hipertensao'), [])
+
+    def test_infix_matches_rank_after_word_prefixes(self):
+        self.assertEqual(self.index.search('cardi'), [self.i11, self.i42])
+
+    def test_active_only_and_limit(self):
+        self.assertEqual(self.index.search('cardiaco', active_only=False), [self.old])
+        self.assertEqual(self.index.search('cardiaco'), [])
+        self.assertEqual(self.index.search('i1', limit=1), [self.i10])
+
+    def test_lookup_by_id_and_code(self):
+        self.assertEqual(self.index.get(str(self.i42.id)), self.i42)
+        self.assertEqual(self.index.get_by_code('a00.1'), self.a001)
+        self.assertIsNone(self.index.get_by_code('B00'))
+
+
+class ReferenceIndexCacheTests(TestCase):
+    def setUp(self):
+        self.procedure = MedicalProcedure.objects.create(
+            code='0301010072',
+            description='Consulta médica em atenção especializada',
+        )
+        self.icd = Icd10Code.objects.create(code='E11', description='Diabetes mellitus não-insulino-dependente')
+
+    def test_index_is_reused_until_the_table_changes(self):
+        index = get_reference_index(MedicalProcedure)
+        self.assertIs(get_reference_index(MedicalProcedure), index)
+        self.assertEqual(search_reference(MedicalProcedure, 'atencao'), [index.get(self.procedure.pk)])
+
+        self.procedure.description = 'Consulta de retorno'
+        self.procedure.save()
+
+        self.assertIsNot(get_reference_index(MedicalProcedure), index)
+        self.assertEqual(search_reference(MedicalProcedure, 'atencao'), [])
+        self.assertEqual([entry.code for entry in search_reference(MedicalProcedure, 'retorno')], ['0301010072'])
+
+    def test_generation_tracks_count_and_last_update(self):
+        generation = get_generation(Icd10Code)
+        self.assertEqual(generation.count, 1)
+        self.assertEqual(generation.last_modified, self.icd.updated_at)
+
+        Icd10Code.objects.create(code='E10', description='Diabetes mellitus insulino-dependente')
+
+        self.assertEqual(get_generation(Icd10Code).count, 2)
+        self.assertEqual([entry.code for entry in search_reference(Icd10Code, 'diabetes')], ['E10', 'E11'])
+
+    def test_get_reference_entries_keeps_requested_keys(self):
+        missing = uuid.uuid4()
+        entries = get_reference_entries(Icd10Code, [self.icd.pk, missing])
+        self.assertEqual(list(entries), [self.icd.pk])
+        self.assertEqual(entries[self.icd.pk].code, 'E11')
+
+        self.icd.is_active = False
+        self.icd.save()
+        self.assertEqual(get_reference_entries(Icd10Code, [str(self.icd.pk)], active_only=True), {})
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 00:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dailynotes', '0002_dailynote_search_vector_and_more'),
+        # The research index is backfilled from these vectors first
+        ('research', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='dailynote',
+            name='dailynote_search_gin_idx',
+        ),
+        migrations.RemoveField(
+            model_name='dailynote',
+            name='search_vector',
+        ),
+    ]
@@ -1,9 +1,37 @@
+import re
 from django.db import models
-from django.contrib.postgres.search import SearchVectorField
-from django.contrib.postgres.indexes import GinIndex
 from apps.events.models import Event
 
 
+def sanitize_content_for_search(content):
+    """
+    Sanitize content to remove characters that cause PostgreSQL text search issues.
+    
+    Args:
+        content: Raw text content
+        
+    Returns:
+        Sanitized content safe for PostgreSQL text search
+    """
+    if not content:
+        return ""
+    
+    # Remove or replace problematic characters that cause "unrecognized token" errors
+    sanitized = content
+    
+    # Replace colons with spaces (main issue)
+    sanitized = sanitized.replace(':', ' ')
+    
+    # Remove other potentially problematic characters
+    # Keep only letters, numbers, spaces, and common punctuation
+    sanitized = re.sub(r'[^\w\s\.\,\!\?\(\)\-]', ' ', sanitized)
+    
+    # Clean up multiple spaces
+    sanitized = re.sub(r'\s+', ' ', sanitized).strip()
+    
+    return sanitized
+
+
 class DailyNote(Event):
     """
     Daily Note model that extends the base Event model.
@@ -11,9 +39,6 @@ class DailyNote(Event):
     """
     content = models.TextField(verbose_name="Conteúdo")
 
-    # Full text search field
-    search_vector = SearchVectorField(null=True, blank=True)
-
     def save(self, *args, **kwargs):
         """Override save to set the correct event type."""
         self.event_type = Event.DAILY_NOTE_EVENT
@@ -37,6 +62,3 @@ class DailyNote(Event):
         verbose_name = "Evolução"
         verbose_name_plural = "Evoluções"
         ordering = ["-event_datetime"]
-        indexes = [
-            GinIndex(fields=['search_vector'], name='dailynote_search_gin_idx'),
-        ]
@@ -1,5 +1,3 @@
-from unittest.mock import patch
-
 from django.contrib.auth import get_user_model
 from django.test import RequestFactory, TestCase
 from django.utils import timezone
@@ -39,9 +37,7 @@ class DailyNoteSearchAccentInsensitiveTests(TestCase):
             updated_by=self.user,
         )
 
-    @patch("apps.core.permissions.utils.get_user_accessible_patients")
-    def test_get_queryset_matches_patient_name_without_diacritics(self, mock_accessible):
-        mock_accessible.return_value = Patient.objects.filter(pk=self.patient.pk)
+    def test_get_queryset_matches_patient_name_without_diacritics(self):
         request = self.factory.get("/", {"search": "joao"})
         request.user = self.user
 
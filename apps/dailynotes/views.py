@@ -30,6 +30,8 @@ from apps.core.permissions import (
     can_access_patient,
     can_edit_event,
     can_delete_event,
+    get_patient_access_scope,
+    patient_access_filter,
 )
 from apps.patients.models import Patient
 from apps.sample_content.models import SampleContent
@@ -57,13 +59,7 @@ class DailyNoteListView(LoginRequiredMixin, ListView):
         )
 
         # Filter by user's patient access permissions (simplified)
-        from apps.core.permissions.utils import get_user_accessible_patients
-        
-        accessible_patients = get_user_accessible_patients(self.request.user)
-        if accessible_patients:
-            queryset = queryset.filter(patient__in=accessible_patients)
-        else:
-            queryset = queryset.none()
+        queryset = queryset.filter(patient_access_filter(self.request.user, "patient"))
 
         # Search functionality
         search_query = self.request.GET.get("search", "")
@@ -114,19 +110,15 @@ class DailyNoteListView(LoginRequiredMixin, ListView):
         context["selected_creator"] = self.request.GET.get("creator", "")
 
         # Cache key for filter options (simplified)
-        cache_key = f"dailynotes_filters_{self.request.user.id}"
+        cache_key = f"dailynotes_filters_{get_patient_access_scope(self.request.user)}"
 
         # Try to get filter options from cache
         filter_options = cache.get(cache_key)
         if filter_options is None:
             # Get available patients for filter dropdown (accessible ones only)
-            from apps.core.permissions.utils import get_user_accessible_patients
-            
-            accessible_patients = get_user_accessible_patients(self.request.user)
-            if accessible_patients:
-                accessible_patients = accessible_patients.only("id", "name", "fiscal_number")
-            else:
-                accessible_patients = Patient.objects.none()
+            accessible_patients = Patient.objects.filter(
+                patient_access_filter(self.request.user)
+            ).only("id", "name", "fiscal_number")
 
             # Get available creators (users who have created daily notes)
             from django.contrib.auth import get_user_model
@@ -15,9 +15,14 @@ except ImportError:
 
 from apps.patients.models import Patient, PatientRecordNumber, PatientAdmission
 from apps.dischargereports.models import DischargeReport
+from apps.core.models import LegacyImportKey
+from apps.core.services.legacy_import import get_imported_keys, record_imported_keys
 
 User = get_user_model()
 
+# Reports checked against already imported Firebase keys per query
+KEY_LOOKUP_CHUNK_SIZE = 1000
+
 
 class Command(BaseCommand):
     help = "Import discharge reports from Firebase Realtime Database"
@@ -155,28 +160,41 @@ class Command(BaseCommand):
             total_reports = len(all_reports)
             self.stdout.write(f"Found {total_reports} discharge reports in Firebase")
 
-            for firebase_key, report_data in all_reports.items():
-                try:
-                    result = self.process_firebase_discharge_report(
-                        firebase_key, report_data
-                    )
-                    if result == "imported":
-                        imported_count += 1
-                    elif result == "skipped":
-                        skipped_count += 1
-
-                    # Respect limit
-                    if self.limit and imported_count >= self.limit:
-                        self.stdout.write(f"Reached import limit of {self.limit}")
-                        break
-
-                except Exception as e:
-                    error_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f"Error importing discharge report {firebase_key}: {e}"
+            report_items = list(all_reports.items())
+            limit_reached = False
+            for start in range(0, total_reports, KEY_LOOKUP_CHUNK_SIZE):
+                chunk = report_items[start:start + KEY_LOOKUP_CHUNK_SIZE]
+                imported_keys = get_imported_keys(
+                    LegacyImportKey.Source.FIREBASE_DISCHARGE_REPORT,
+                    [firebase_key for firebase_key, _ in chunk],
+                )
+
+                for firebase_key, report_data in chunk:
+                    try:
+                        result = self.process_firebase_discharge_report(
+                            firebase_key, report_data, imported_keys
                         )
-                    )
+                        if result == "imported":
+                            imported_count += 1
+                        elif result == "skipped":
+                            skipped_count += 1
+
+                        # Respect limit
+                        if self.limit and imported_count >= self.limit:
+                            self.stdout.write(f"Reached import limit of {self.limit}")
+                            limit_reached = True
+                            break
+
+                    except Exception as e:
+                        error_count += 1
+                        self.stdout.write(
+                            self.style.ERROR(
+                                f"Error importing discharge report {firebase_key}: {e}"
+                            )
+                        )
+
+                if limit_reached:
+                    break
 
             self.stdout.write(
                 f"Discharge Reports: {imported_count} imported, {skipped_count} skipped, {error_count} errors"
@@ -190,8 +208,13 @@ class Command(BaseCommand):
         except Exception as e:
             raise Exception(f"Failed to import discharge reports: {e}")
 
-    def process_firebase_discharge_report(self, firebase_key, report_data):
-        """Process a single Firebase discharge report"""
+    def process_firebase_discharge_report(self, firebase_key, report_data, imported_keys=None):
+        """
+        Process a single Firebase discharge report.
+
+        imported_keys is the set of already imported keys of the current
+        chunk; when omitted, the key is looked up on its own.
+        """
 
         # Extract required fields
         content = report_data.get("content", {})
@@ -216,13 +239,12 @@ class Command(BaseCommand):
 
         patient = patient_record.patient
 
-        # Check if discharge report already exists
-        existing_report = DischargeReport.objects.filter(
-            patient=patient,
-            description__icontains=f"Firebase ID: {firebase_key}",
-        ).first()
-
-        if existing_report:
+        # Check if discharge report was already imported, by its Firebase key
+        if imported_keys is None:
+            imported_keys = get_imported_keys(
+                LegacyImportKey.Source.FIREBASE_DISCHARGE_REPORT, [firebase_key]
+            )
+        if firebase_key in imported_keys:
             return "skipped"
 
         # Parse dates
@@ -292,6 +314,10 @@ class Command(BaseCommand):
             # Add Firebase ID to description for tracking
             discharge_report.description += f"\n\nFirebase ID: {firebase_key}\nMédico: {username}"
             discharge_report.save()
+            record_imported_keys(
+                LegacyImportKey.Source.FIREBASE_DISCHARGE_REPORT,
+                {firebase_key: discharge_report.pk},
+            )
 
             # Create PatientAdmission record
             stay_duration = (discharge_date - admission_date).days
@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from apps.dischargereports.management.commands.import_firebase_discharge_reports import Command
+from apps.core.models import LegacyImportKey
 from apps.dischargereports.models import DischargeReport
 from apps.patients.models import Patient, PatientRecordNumber, PatientAdmission
 
@@ -96,3 +97,26 @@ class FirebaseDischargeReconciliationTests(TestCase):
 
         self.assertEqual(command.admissions_closed_count, 1)
         self.assertEqual(command.patients_reconciled_count, 1)
+
+    def test_reimport_is_skipped_by_legacy_import_key(self):
+        command = Command()
+        command.dry_run = False
+        command.import_user = self.user
+        command.stdout = StringIO()
+        command.admissions_closed_count = 0
+        command.patients_reconciled_count = 0
+
+        command.process_firebase_discharge_report("report-key-1", self.report_data)
+        report = DischargeReport.objects.get()
+        key = LegacyImportKey.objects.get(
+            source=LegacyImportKey.Source.FIREBASE_DISCHARGE_REPORT,
+            external_key="report-key-1",
+        )
+        self.assertEqual(key.event_id, report.pk)
+
+        result = command.process_firebase_discharge_report(
+            "report-key-1", self.report_data, imported_keys={"report-key-1"}
+        )
+        self.assertEqual(result, "skipped")
+        self.assertEqual(command.process_firebase_discharge_report("report-key-1", self.report_data), "skipped")
+        self.assertEqual(DischargeReport.objects.count(), 1)
@@ -5,3 +5,6 @@ class DrugtemplatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.drugtemplates'
     verbose_name = 'Drug Templates'
+
+    def ready(self):
+        import apps.drugtemplates.signals
@@ -0,0 +1,26 @@
+"""
+Digests used to upsert imported medications.
+
+An imported DrugTemplate is identified by its name, concentration and
+pharmaceutical form compared case-insensitively (import_key), and its
+content_hash covers the exact imported values, so a rerun of the same
+formulary can skip unchanged rows without comparing fields.
+"""
+
+import hashlib
+
+_SEPARATOR = '\x1f'
+
+
+def _digest(values):
+    return hashlib.sha256(_SEPARATOR.join(values).encode('utf-8')).hexdigest()
+
+
+def import_key(name, concentration, pharmaceutical_form):
+    """Identity of an imported medication."""
+    return _digest(value.casefold() for value in (name, concentration, pharmaceutical_form))
+
+
+def content_hash(name, concentration, pharmaceutical_form, import_source):
+    """Digest of the imported values of a medication."""
+    return _digest((name, concentration, pharmaceutical_form, import_source or ''))
@@ -4,14 +4,27 @@ Supports the CSV format with columns: DCB, Concentração/Composição, Forma Fa
 """
 
 import csv
+import itertools
 import re
+import time
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from apps.core.services.reference_index import invalidate_reference_index
+from apps.drugtemplates.importing import content_hash, import_key
 from apps.drugtemplates.models import DrugTemplate
 
 User = get_user_model()
 
+EXPECTED_COLUMNS = [
+    'Denominação Comum Brasileira (DCB)',
+    'Concentração/Composição',
+    'Forma Farmacêutica'
+]
+
+# Columns rewritten when an imported medication changed since the last run
+UPSERT_FIELDS = ['name', 'concentration', 'pharmaceutical_form', 'import_source', 'content_hash', 'updated_at']
+
 
 class Command(BaseCommand):
     help = 'Import medications from CSV file into DrugTemplate model'
@@ -29,6 +42,12 @@ class Command(BaseCommand):
             default='CSV Import',
             help='Import source description (default: "CSV Import")',
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of rows validated and upserted together (default: 1000)',
+        )
 
     def handle(self, *args, **options):
         csv_file = options['csv_file']
@@ -65,11 +84,14 @@ class Command(BaseCommand):
             self.stdout.write(f'Created system user: {system_user.username}')
 
         # Import statistics
-        total_processed = 0
-        imported_count = 0
-        skipped_count = 0
-        error_count = 0
-        errors = []
+        self.total_processed = 0
+        self.imported_count = 0
+        self.updated_count = 0
+        self.skipped_count = 0
+        self.errors = []
+        self.seen_keys = set()
+        chunk_size = options['chunk_size']
+        started = time.monotonic()
 
         try:
             with open(csv_file, 'r', encoding='utf-8') as f:
@@ -82,101 +104,53 @@ class Command(BaseCommand):
                 reader = csv.DictReader(f, dialect=dialect)
                 
                 # Validate expected columns
-                expected_columns = [
-                    'Denominação Comum Brasileira (DCB)',
-                    'Concentração/Composição', 
-                    'Forma Farmacêutica'
-                ]
-                
-                if not all(col in reader.fieldnames for col in expected_columns):
+                if not all(col in reader.fieldnames for col in EXPECTED_COLUMNS):
                     raise CommandError(
-                        f'CSV file missing expected columns. Expected: {expected_columns}, '
+                        f'CSV file missing expected columns. Expected: {EXPECTED_COLUMNS}, '
                         f'Found: {list(reader.fieldnames)}'
                     )
 
-                # Process each row individually to avoid transaction rollback on errors
-                for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-                    total_processed += 1
-                    
-                    try:
-                        # Extract and clean data
-                        name = self._clean_field(row['Denominação Comum Brasileira (DCB)'])
-                        concentration = self._clean_field(row['Concentração/Composição'])
-                        pharmaceutical_form = self._clean_field(row['Forma Farmacêutica'])
-                        
-                        # Validate required fields
-                        if not name:
-                            errors.append(f'Row {row_num}: Nome do medicamento é obrigatório')
-                            error_count += 1
-                            continue
-                            
-                        if not concentration:
-                            errors.append(f'Row {row_num}: Concentração é obrigatória')
-                            error_count += 1
-                            continue
-                            
-                        if not pharmaceutical_form:
-                            errors.append(f'Row {row_num}: Forma farmacêutica é obrigatória')
-                            error_count += 1
-                            continue
-
-                        # Normalize concentration (fix decimal separators)
-                        concentration = self._normalize_concentration(concentration)
-                        
-                        # Normalize pharmaceutical form (lowercase)
-                        pharmaceutical_form = pharmaceutical_form.lower()
-
-                        # Check for true duplicates (same name + concentration + pharmaceutical form)
-                        existing = DrugTemplate.objects.filter(
-                            name__iexact=name,
-                            concentration__iexact=concentration,
-                            pharmaceutical_form__iexact=pharmaceutical_form
-                        ).first()
-                        
-                        if existing:
-                            skipped_count += 1
-                            continue
-
-                        if not dry_run:
-                            # Create new drug template in individual transaction
-                            try:
-                                with transaction.atomic():
-                                    drug_template = DrugTemplate.objects.create(
-                                        name=name,
-                                        concentration=concentration,
-                                        pharmaceutical_form=pharmaceutical_form,
-                                        usage_instructions='',  # Empty for imported drugs
-                                        creator=system_user,
-                                        is_public=True,  # Imported drugs are public by default
-                                        is_imported=True,
-                                        import_source=import_source
-                                    )
-                                    imported_count += 1
-                                    
-                                    if imported_count % 100 == 0:
-                                        self.stdout.write(f'Imported {imported_count} medications...')
-                            except Exception as create_error:
-                                error_count += 1
-                                errors.append(f'Row {row_num}: Error creating record - {str(create_error)}')
-                        else:
-                            imported_count += 1
-                            if imported_count % 100 == 0:
-                                self.stdout.write(f'Would import {imported_count} medications...')
-
-                    except Exception as e:
-                        error_count += 1
-                        errors.append(f'Row {row_num}: Error processing record - {str(e)}')
-
+                # Rows are validated and upserted one chunk at a time; the whole
+                # file is a single transaction so a failed run leaves no partial import
+                rows = enumerate(reader, start=2)  # Start at 2 (header is row 1)
+                with transaction.atomic():
+                    while True:
+                        chunk = list(itertools.islice(rows, chunk_size))
+                        if not chunk:
+                            break
+                        self._import_chunk(chunk, system_user, import_source, dry_run)
+
+                        elapsed = max(time.monotonic() - started, 1e-6)
+                        action = 'Would import' if dry_run else 'Imported'
+                        self.stdout.write(
+                            f'{action} {self.imported_count} medications... '
+                            f'Processed {self.total_processed} rows ({self.total_processed / elapsed:.0f} rows/s)'
+                        )
+
+        except CommandError:
+            raise
         except Exception as e:
             raise CommandError(f'Error reading CSV file: {e}')
 
+        if not dry_run:
+            invalidate_reference_index(DrugTemplate)
+
+        total_processed = self.total_processed
+        imported_count = self.imported_count
+        skipped_count = self.skipped_count
+        errors = self.errors
+        error_count = len(errors)
+        elapsed = max(time.monotonic() - started, 1e-6)
+
         # Print statistics
         self.stdout.write('\n' + '='*50)
         self.stdout.write(f'Import Statistics:')
         self.stdout.write(f'Total processed: {total_processed}')
         self.stdout.write(f'Successfully imported: {imported_count}')
+        self.stdout.write(f'Updated: {self.updated_count}')
         self.stdout.write(f'Skipped (duplicates): {skipped_count}')
         self.stdout.write(f'Errors: {error_count}')
+        self.stdout.write(f'Elapsed: {elapsed:.2f}s ({total_processed / elapsed:.0f} rows/s)')
         
         if errors:
             self.stdout.write('\nErrors encountered:')
@@ -192,6 +166,74 @@ class Command(BaseCommand):
             
         return f'Processed: {total_processed}, Imported: {imported_count}, Skipped: {skipped_count}, Errors: {error_count}'
 
+    def _import_chunk(self, chunk, system_user, import_source, dry_run):
+        """Validate and normalize a chunk of rows, then upsert the new and changed ones."""
+        templates = {}
+        for row_num, row in chunk:
+            self.total_processed += 1
+
+            # Extract and clean data
+            name = self._clean_field(row['Denominação Comum Brasileira (DCB)'])
+            concentration = self._clean_field(row['Concentração/Composição'])
+            pharmaceutical_form = self._clean_field(row['Forma Farmacêutica'])
+
+            # Validate required fields
+            if not name:
+                self.errors.append(f'Row {row_num}: Nome do medicamento é obrigatório')
+                continue
+            if not concentration:
+                self.errors.append(f'Row {row_num}: Concentração é obrigatória')
+                continue
+            if not pharmaceutical_form:
+                self.errors.append(f'Row {row_num}: Forma farmacêutica é obrigatória')
+                continue
+
+            # Normalize concentration (fix decimal separators) and form (lowercase)
+            concentration = self._normalize_concentration(concentration)
+            pharmaceutical_form = pharmaceutical_form.lower()
+
+            # True duplicates (same name + concentration + pharmaceutical form) within the file
+            key = import_key(name, concentration, pharmaceutical_form)
+            if key in self.seen_keys:
+                self.skipped_count += 1
+                continue
+            self.seen_keys.add(key)
+
+            templates[key] = DrugTemplate(
+                name=name,
+                concentration=concentration,
+                pharmaceutical_form=pharmaceutical_form,
+                usage_instructions='',  # Empty for imported drugs
+                creator=system_user,
+                is_public=True,  # Imported drugs are public by default
+                is_imported=True,
+                import_source=import_source,
+                import_key=key,
+                content_hash=content_hash(name, concentration, pharmaceutical_form, import_source),
+            )
+
+        existing_hashes = dict(
+            DrugTemplate.objects.filter(import_key__in=list(templates)).values_list('import_key', 'content_hash')
+        )
+        changed = []
+        for key, template in templates.items():
+            if key not in existing_hashes:
+                self.imported_count += 1
+            elif existing_hashes[key] != template.content_hash:
+                self.updated_count += 1
+            else:
+                self.skipped_count += 1
+                continue
+            changed.append(template)
+
+        if changed and not dry_run:
+            DrugTemplate.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=['import_key'],
+                update_fields=UPSERT_FIELDS,
+            )
+
     def _clean_field(self, value):
         """Clean and normalize field value."""
         if not value:
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.1 on 2026-10-18 22:42
+
+from django.db import migrations, models
+
+from apps.drugtemplates.importing import content_hash, import_key
+
+
+def populate_import_keys(apps, schema_editor):
+    """Key previously imported templates; later duplicates of a medication stay unkeyed."""
+    DrugTemplate = apps.get_model('drugtemplates', 'DrugTemplate')
+
+    seen = set()
+    batch = []
+    templates = DrugTemplate.objects.filter(is_imported=True).order_by('created_at', 'pk').only(
+        'pk', 'name', 'concentration', 'pharmaceutical_form', 'import_source'
+    )
+    for template in templates.iterator(chunk_size=2000):
+        key = import_key(template.name, template.concentration, template.pharmaceutical_form)
+        if key in seen:
+            continue
+        seen.add(key)
+        template.import_key = key
+        template.content_hash = content_hash(
+            template.name, template.concentration, template.pharmaceutical_form, template.import_source
+        )
+        batch.append(template)
+        if len(batch) >= 2000:
+            DrugTemplate.objects.bulk_update(batch, ['import_key', 'content_hash'])
+            batch = []
+    DrugTemplate.objects.bulk_update(batch, ['import_key', 'content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drugtemplates', '0008_update_immutable_unaccent_function'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drugtemplate',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Hash dos valores importados, para pular linhas inalteradas', max_length=64, verbose_name='Hash do Conteúdo'),
+        ),
+        migrations.AddField(
+            model_name='drugtemplate',
+            name='import_key',
+            field=models.CharField(blank=True, editable=False, help_text='Identidade do medicamento importado (nome, concentração e forma)', max_length=64, null=True, unique=True, verbose_name='Chave de Importação'),
+        ),
+        migrations.RunPython(populate_import_keys, migrations.RunPython.noop),
+    ]
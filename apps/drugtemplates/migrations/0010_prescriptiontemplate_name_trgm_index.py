@@ -0,0 +1,34 @@
+# Trigram index backing the prescription template typeahead
+
+from django.db import migrations
+
+
+INDEX_NAME = "prescriptiontpl_name_trgm_idx"
+INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS {name} "
+    "ON drugtemplates_prescriptiontemplate "
+    "USING gin (immutable_unaccent(lower(name)) gin_trgm_ops)"
+)
+DROP_INDEX_SQL = "DROP INDEX IF EXISTS {name}"
+
+
+def add_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(INDEX_SQL.format(name=INDEX_NAME))
+
+
+def remove_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(DROP_INDEX_SQL.format(name=INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("drugtemplates", "0009_drugtemplate_import_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
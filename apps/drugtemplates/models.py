@@ -88,6 +88,23 @@ class DrugTemplate(models.Model):
         blank=True,
         null=True
     )
+    import_key = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Chave de Importação",
+        help_text="Identidade do medicamento importado (nome, concentração e forma)"
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Hash do Conteúdo",
+        help_text="Hash dos valores importados, para pular linhas inalteradas"
+    )
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
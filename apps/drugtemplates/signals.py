@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.services.reference_index import invalidate_reference_index
+
+from .models import DrugTemplate
+
+
+@receiver(post_save, sender=DrugTemplate)
+@receiver(post_delete, sender=DrugTemplate)
+def drop_drug_template_generation(sender, **kwargs):
+    """Make this worker's next drug template ETag reflect the change right away."""
+    invalidate_reference_index(sender)
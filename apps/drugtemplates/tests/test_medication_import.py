@@ -235,4 +235,40 @@ DIPIRONA,1000 MG,SOLUÇÃO INJETÁVEL"""
             self.assertEqual(dipirona.pharmaceutical_form, 'solução injetável')  # Normalized case
             
         finally:
-            os.unlink(csv_file)
\ No newline at end of file
+            os.unlink(csv_file)
+
+    def test_import_medications_csv_upserts_by_content_hash(self):
+        """Reruns skip unchanged rows and update rows whose imported values changed."""
+        csv_file = self.create_temp_csv_file()
+        changed_file = self.create_temp_csv_file(
+            """Denominação Comum Brasileira (DCB),Concentração/Composição,Forma Farmacêutica
+IODETO DE POTÁSSIO,130.0 mg,comprimido
+Sulfato de gentamicina,40 mg/mL,solução injetável
+Sulfato de gentamicina,40 mg/mL,solução injetável
+Novo medicamento,10 mg,comprimido"""
+        )
+
+        try:
+            call_command('import_medications_csv', csv_file, '--chunk-size', '2', stdout=StringIO())
+            iodeto = DrugTemplate.objects.get(import_key__isnull=False, name='Iodeto de potássio')
+
+            out = StringIO()
+            call_command('import_medications_csv', csv_file, stdout=out)
+            self.assertIn('Successfully imported: 0', out.getvalue())
+            self.assertIn('Skipped (duplicates): 5', out.getvalue())
+
+            out = StringIO()
+            call_command('import_medications_csv', changed_file, stdout=out)
+            output = out.getvalue()
+            self.assertIn('Successfully imported: 1', output)
+            self.assertIn('Updated: 1', output)
+            self.assertIn('Skipped (duplicates): 2', output)
+            self.assertIn('rows/s', output)
+
+            iodeto.refresh_from_db()
+            self.assertEqual(iodeto.name, 'IODETO DE POTÁSSIO')
+            self.assertEqual(DrugTemplate.objects.filter(is_imported=True).count(), 6)
+
+        finally:
+            os.unlink(csv_file)
+            os.unlink(changed_file)
@@ -453,11 +453,6 @@ class PrescriptionTemplateCreateView(LoginRequiredMixin, CreateView):
         formset_data = PrescriptionTemplateItemFormSetHelper.prepare_formset_data(formset)
         context.update(formset_data)
 
-        # Add drug templates for autocomplete functionality
-        context['drug_templates'] = DrugTemplate.objects.filter(
-            Q(creator=self.request.user) | Q(is_public=True)
-        ).order_by('name')
-
         return context
 
     def form_valid(self, form):
@@ -531,11 +526,6 @@ class PrescriptionTemplateUpdateView(LoginRequiredMixin, UpdateView):
         formset_data = PrescriptionTemplateItemFormSetHelper.prepare_formset_data(formset)
         context.update(formset_data)
 
-        # Add drug templates for autocomplete functionality
-        context['drug_templates'] = DrugTemplate.objects.filter(
-            Q(creator=self.request.user) | Q(is_public=True)
-        ).order_by('name')
-
         return context
 
     def form_valid(self, form):
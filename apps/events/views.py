@@ -27,6 +27,7 @@ from apps.core.permissions.utils import (
     can_discharge_patient
 )
 from apps.pdf_forms.services.duplication import can_duplicate_pdf_submission
+from apps.mediafiles.prefetch import prefetch_timeline_media
 
 User = get_user_model()
 
@@ -172,6 +173,9 @@ class PatientEventsTimelineView(ListView):
         
         context.update(filter_data)
         
+        # Load series photos and media counts for this page in bulk
+        prefetch_timeline_media(context['events'], patients=[self.patient])
+
         # Add permission context for events (bulk check)
         events_with_permissions = self._bulk_permission_check(context['events'])
         context['events_with_permissions'] = events_with_permissions
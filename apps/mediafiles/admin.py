@@ -9,7 +9,42 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 
-from .models import MediaFile, Photo, PhotoSeries, PhotoSeriesFile, VideoClip
+from .models import MediaBlob, MediaFile, Photo, PhotoSeries, PhotoSeriesFile, VideoClip
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    """Admin interface for MediaBlob model (read-only, managed by uploads)."""
+
+    list_display = [
+        'sha256',
+        'size',
+        'ref_count',
+        'created_at',
+        'released_at',
+    ]
+
+    list_filter = [
+        'created_at',
+        'released_at',
+    ]
+
+    search_fields = [
+        'sha256',
+    ]
+
+    readonly_fields = [
+        'sha256',
+        'file',
+        'size',
+        'ref_count',
+        'created_at',
+        'released_at',
+    ]
+
+    def has_add_permission(self, request):
+        """Blobs are only created by uploads."""
+        return False
 
 
 @admin.register(MediaFile)
@@ -40,6 +75,7 @@ class MediaFileAdmin(admin.ModelAdmin):
     readonly_fields = [
         'id',
         'file_hash',
+        'blob',
         'file_size',
         'mime_type',
         'width',
@@ -63,6 +99,7 @@ class MediaFileAdmin(admin.ModelAdmin):
         ('File Metadata', {
             'fields': (
                 'file_hash',
+                'blob',
                 'file_size',
                 'mime_type',
                 'width',
@@ -398,6 +435,11 @@ class PhotoSeriesAdmin(admin.ModelAdmin):
             obj.created_by = request.user
         obj.updated_by = request.user
         super().save_model(request, obj, form, change)
+
+    def save_related(self, request, form, formsets, change):
+        """Refresh the series summary after inline photos are saved."""
+        super().save_related(request, form, formsets, change)
+        form.instance.refresh_summary()
     
     actions = ['reorder_photos_action', 'export_series_zip', 'duplicate_series']
     
@@ -290,23 +290,20 @@ class PhotoSeriesCreateFormNew(BaseEventForm):
         if commit:
             photoseries.save()
             
-            # Process each uploaded image
+            # Store every upload, then process them as one batch
             upload_ids = self.cleaned_data['upload_ids']
-            processor = ImageProcessor()
-            
-            for order, upload_id in enumerate(upload_ids, start=1):
+            originals_dir = photoseries.get_storage_directory('originals')
+            originals_dir.mkdir(parents=True, exist_ok=True)
+            stored = []
+
+            for upload_id in upload_ids:
                 temp_upload = TemporaryUpload.objects.get(upload_id=upload_id)
                 
                 # Generate UUID-based filename
                 file_uuid = uuid.uuid4()
                 original_ext = Path(temp_upload.upload_name).suffix.lower()
                 secure_filename = f"{file_uuid}{original_ext}"
-                
-                # Create date-based directory structure: photo_series/YYYY/MM/originals/
-                date_path = timezone.now().strftime('%Y/%m')
-                photo_dir = settings.MEDIA_ROOT / f"photo_series/{date_path}/originals"
-                photo_dir.mkdir(parents=True, exist_ok=True)
-                destination_path = photo_dir / secure_filename
+                destination_path = originals_dir / secure_filename
                 
                 # Store the upload permanently with relative filename only
                 # FilePond will store it in its own storage directory
@@ -321,27 +318,11 @@ class PhotoSeriesCreateFormNew(BaseEventForm):
                     shutil.copy2(stored_file_path, destination_path)
                 except Exception as e:
                     raise forms.ValidationError(f"Failed to copy image file: {str(e)}")
-                
-                # Process image from final destination
-                metadata = processor.get_image_metadata(str(destination_path))
-                
-                # Generate thumbnail
-                thumbnail_dir = photo_dir.parent / 'thumbnails'
-                thumbnail_dir.mkdir(exist_ok=True)
-                thumbnail_path = thumbnail_dir / f"{file_uuid}_thumb.jpg"
-                processor.generate_thumbnail(str(destination_path), str(thumbnail_path))
-                
-                # Create PhotoSeriesFile
-                PhotoSeriesFile.objects.create(
-                    photo_series=photoseries,
-                    file_id=str(file_uuid),
-                    original_filename=temp_upload.upload_name,
-                    file_size=metadata.get('size', 0),
-                    width=metadata.get('width'),
-                    height=metadata.get('height'),
-                    thumbnail_path=str(thumbnail_path.relative_to(settings.MEDIA_ROOT)),
-                    order=order
-                )
+
+                stored.append((str(file_uuid), temp_upload.upload_name, destination_path))
+
+            # Thumbnails and metadata in parallel, rows in one bulk insert
+            photoseries.add_stored_photos(stored)
         
         return photoseries
 
@@ -698,9 +679,8 @@ class PhotoSeriesCreateForm(BaseMediaForm, forms.ModelForm):
             # Save the PhotoSeries first to get an ID
             photoseries.save()
 
-            # Create MediaFiles and add to series
-            images = self.cleaned_data['images']
-            photoseries.add_photos_batch(images)
+            # Store, thumbnail and insert all images as one batch
+            photoseries.add_photos_batch(self.cleaned_data['images'])
 
         return photoseries
 
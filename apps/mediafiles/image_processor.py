@@ -1,8 +1,66 @@
+import logging
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageOps
 from django.conf import settings
 
+logger = logging.getLogger('mediafiles.processing')
+
+# Pool size used when MEDIA_BATCH_WORKERS is not set; every web worker
+# process owns a pool, so keep it small
+DEFAULT_BATCH_WORKERS = 2
+
+# Process pool shared by all batches of this (web worker) process
+_pool = None
+_pool_key = None  # (pid, max_workers) the pool was started for
+_pool_lock = threading.Lock()
+
+
+def _get_process_pool(max_workers):
+    """Return this process's image pool, starting it on first use."""
+    global _pool, _pool_key
+    key = (os.getpid(), max_workers)
+    with _pool_lock:
+        if _pool_key != key:
+            # A pool inherited through fork belongs to the parent process
+            if _pool is not None and _pool_key[0] == key[0]:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=max_workers)
+            _pool_key = key
+        return _pool
+
+
+def _discard_process_pool(pool):
+    """Forget a broken pool so the next batch starts a new one."""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_key = None, None
+    pool.shutdown(wait=False)
+
+
+def _process_image(job):
+    """
+    Extract metadata and generate the thumbnail for one image.
+
+    Runs in a worker process, so it only takes picklable arguments and does
+    not read Django settings.
+
+    Args:
+        job: (image_path, thumbnail_path, thumbnail_size) tuple
+
+    Returns:
+        (metadata, thumbnail_created) tuple
+    """
+    image_path, thumbnail_path, thumbnail_size = job
+    metadata = ImageProcessor.get_image_metadata(image_path)
+    if not metadata:
+        return metadata, False
+    return metadata, ImageProcessor.generate_thumbnail(image_path, thumbnail_path, thumbnail_size)
+
 
 class ImageProcessor:
     """
@@ -10,25 +68,30 @@ class ImageProcessor:
     """
     
     @staticmethod
-    def generate_thumbnail(image_path: str, thumbnail_path: str) -> bool:
+    def generate_thumbnail(image_path: str, thumbnail_path: str, thumbnail_size=None) -> bool:
         """
         Generate thumbnail for image file.
         
         Args:
             image_path: Path to original image
             thumbnail_path: Path for thumbnail
+            thumbnail_size: (width, height) bound, defaults to MEDIA_THUMBNAIL_SIZE
             
         Returns:
             bool: Success status
         """
         try:
             with Image.open(image_path) as img:
+                # Apply EXIF orientation so thumbnails display upright
+                img = ImageOps.exif_transpose(img)
+
                 # Convert to RGB if necessary
                 if img.mode in ('RGBA', 'LA', 'P'):
                     img = img.convert('RGB')
                 
                 # Create thumbnail
-                thumbnail_size = getattr(settings, 'MEDIA_THUMBNAIL_SIZE', (300, 300))
+                if thumbnail_size is None:
+                    thumbnail_size = getattr(settings, 'MEDIA_THUMBNAIL_SIZE', (300, 300))
                 img.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
                 
                 # Save thumbnail
@@ -66,4 +129,41 @@ class ImageProcessor:
                 img.verify()
             return True
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+    @staticmethod
+    def process_batch(jobs, max_workers=None) -> list:
+        """
+        Extract metadata and generate thumbnails for many images at once.
+
+        Images are decoded in a process pool, since Pillow holds the GIL for
+        much of decoding and resizing. The pool is started once per process
+        and reused by later batches. Single images, or a pool that cannot be
+        started, are processed in this process instead.
+
+        Args:
+            jobs: List of (image_path, thumbnail_path) tuples
+            max_workers: Pool size, defaults to MEDIA_BATCH_WORKERS or DEFAULT_BATCH_WORKERS
+
+        Returns:
+            List of (metadata, thumbnail_created) tuples in job order;
+            metadata is empty for images that could not be read
+        """
+        thumbnail_size = tuple(getattr(settings, 'MEDIA_THUMBNAIL_SIZE', (300, 300)))
+        jobs = [(str(image), str(thumbnail), thumbnail_size) for image, thumbnail in jobs]
+
+        if max_workers is None:
+            max_workers = getattr(settings, 'MEDIA_BATCH_WORKERS', None) or DEFAULT_BATCH_WORKERS
+        max_workers = min(max_workers, os.cpu_count() or 1)
+
+        if max_workers > 1 and len(jobs) > 1:
+            pool = None
+            try:
+                pool = _get_process_pool(max_workers)
+                return list(pool.map(_process_image, jobs))
+            except (BrokenProcessPool, OSError) as e:
+                if pool is not None:
+                    _discard_process_pool(pool)
+                logger.warning(f"Image process pool unavailable, processing serially: {e}")
+
+        return [_process_image(job) for job in jobs]
@@ -3,15 +3,61 @@ Management command to check and repair media files.
 
 This command helps identify and fix issues with MediaFile records,
 particularly those created with the broken save process.
+
+Records are checked in batches by a thread pool. Progress can be saved to a
+checkpoint file so an interrupted scan of a large media volume resumes where
+it stopped, and findings can be written as a JSON report.
 """
 
+import hashlib
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from django.db import transaction
 
-from apps.mediafiles.models import MediaFile, Photo
+from apps.mediafiles.models import MediaFile, Photo, PhotoSeriesFile, VideoClip
+
+
+# Top-level MEDIA_ROOT directories written by MediaFile upload paths
+MEDIA_DIRECTORIES = ('photos', 'videos', 'photo_series', 'media')
+
+# Sub-directories holding MediaFile originals and thumbnails
+MEDIA_SUBDIRECTORIES = ('originals', 'thumbnails')
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Issues reported under each report section
+REPORT_SECTIONS = {
+    'missing': ('missing_original',),
+    'broken': ('broken_record',),
+    'corrupt': ('hash_mismatch', 'unreadable'),
+    'orphaned_thumbnails': ('orphaned_thumbnail',),
+}
+
+
+class ByteRateLimiter:
+    """Throttle reads shared by several threads to a maximum bytes per second."""
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = bytes_per_second
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes):
+        if not self.bytes_per_second:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + nbytes / self.bytes_per_second
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
 
 
 class Command(BaseCommand):
@@ -28,6 +74,47 @@ class Command(BaseCommand):
             action='store_true',
             help='Delete broken MediaFile records that cannot be repaired',
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of MediaFile records fetched and checked per batch (default: 500)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of threads checking files concurrently (default: 8)',
+        )
+        parser.add_argument(
+            '--verify-hash',
+            action='store_true',
+            help='Re-hash each original and compare it with MediaFile.file_hash',
+        )
+        parser.add_argument(
+            '--hash-rate-limit',
+            type=float,
+            default=0,
+            help='Maximum MB/s read while re-hashing, across all workers (default: unlimited)',
+        )
+        parser.add_argument(
+            '--scan-orphans',
+            action='store_true',
+            help='Also list files on disk that no record references',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='File where progress is saved after every batch',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue from the progress saved in --checkpoint',
+        )
+        parser.add_argument(
+            '--report',
+            help='Write a JSON report of all findings to this file',
+        )
         parser.add_argument(
             '--verbose',
             action='store_true',
@@ -39,6 +126,20 @@ class Command(BaseCommand):
         self.verbose = options.get('verbose', False)
         self.fix_mode = options.get('fix', False)
         self.delete_broken = options.get('delete_broken', False)
+        self.chunk_size = options.get('chunk_size', 500)
+        self.workers = options.get('workers', 8)
+        self.verify_hash = options.get('verify_hash', False)
+        self.scan_orphans = options.get('scan_orphans', False)
+        self.checkpoint_path = options.get('checkpoint')
+        self.report_path = options.get('report')
+        self.rate_limiter = ByteRateLimiter(
+            (options.get('hash_rate_limit') or 0) * 1024 * 1024
+        )
+
+        if self.chunk_size < 1 or self.workers < 1:
+            raise CommandError('--chunk-size and --workers must be positive')
+        if options.get('resume') and not self.checkpoint_path:
+            raise CommandError('--resume requires --checkpoint')
 
         if self.fix_mode:
             self.stdout.write(
@@ -49,70 +150,193 @@ class Command(BaseCommand):
                 self.style.SUCCESS('Running in DRY-RUN mode - no changes will be made')
             )
 
+        self.state = self.load_checkpoint() if options.get('resume') else self.new_state()
         self.check_media_files()
 
+    def new_state(self):
+        """Empty scan progress."""
+        return {
+            'last_pk': None,
+            'checked': 0,
+            'findings': {section: [] for section in REPORT_SECTIONS},
+        }
+
+    def load_checkpoint(self):
+        """Load scan progress saved by an interrupted run."""
+        try:
+            with open(self.checkpoint_path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            self.stdout.write(f'No checkpoint at {self.checkpoint_path}, starting from the beginning')
+            return self.new_state()
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read checkpoint {self.checkpoint_path}: {e}')
+
+        self.stdout.write(
+            f'Resuming after {state["checked"]} records (last id {state["last_pk"]})'
+        )
+        return state
+
+    def save_checkpoint(self):
+        """Atomically persist scan progress."""
+        if not self.checkpoint_path:
+            return
+        temp_path = f'{self.checkpoint_path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.checkpoint_path)
+
     def check_media_files(self):
         """Check all MediaFile records for integrity."""
         self.stdout.write('Checking MediaFile records...')
-        
+
         total_files = MediaFile.objects.count()
-        broken_files = []
-        missing_files = []
-        orphaned_thumbnails = []
-        
         self.stdout.write(f'Found {total_files} MediaFile records to check')
 
-        for media_file in MediaFile.objects.all():
-            issues = self.check_single_file(media_file)
-            if issues:
-                if 'missing_original' in issues:
-                    missing_files.append((media_file, issues))
-                if 'broken_record' in issues:
-                    broken_files.append((media_file, issues))
-                if 'orphaned_thumbnail' in issues:
-                    orphaned_thumbnails.append((media_file, issues))
+        queryset = MediaFile.objects.order_by('pk')
+        if self.state['last_pk']:
+            queryset = queryset.filter(pk__gt=self.state['last_pk'])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for chunk in self.iter_chunks(queryset):
+                for media_file, issues in zip(chunk, executor.map(self.check_single_file, chunk)):
+                    if issues:
+                        self.record_issues(media_file, issues)
+
+                self.state['checked'] += len(chunk)
+                self.state['last_pk'] = str(chunk[-1].pk)
+                self.save_checkpoint()
+
+                if self.verbose:
+                    self.stdout.write(f'Checked {self.state["checked"]}/{total_files} records')
+
+        findings = self.state['findings']
+        orphaned_files = self.find_orphaned_files() if self.scan_orphans else []
 
         # Report findings
         self.stdout.write('\n' + '='*60)
         self.stdout.write('INTEGRITY CHECK RESULTS')
         self.stdout.write('='*60)
-        
+
         self.stdout.write(f'Total MediaFile records: {total_files}')
-        self.stdout.write(f'Missing original files: {len(missing_files)}')
-        self.stdout.write(f'Broken records: {len(broken_files)}')
-        self.stdout.write(f'Orphaned thumbnails: {len(orphaned_thumbnails)}')
+        self.stdout.write(f'Records checked: {self.state["checked"]}')
+        self.stdout.write(f'Missing original files: {len(findings["missing"])}')
+        self.stdout.write(f'Broken records: {len(findings["broken"])}')
+        if self.verify_hash:
+            self.stdout.write(f'Corrupt files: {len(findings["corrupt"])}')
+        self.stdout.write(f'Orphaned thumbnails: {len(findings["orphaned_thumbnails"])}')
+        if self.scan_orphans:
+            self.stdout.write(f'Orphaned files on disk: {len(orphaned_files)}')
 
-        if missing_files:
+        if findings['missing']:
             self.stdout.write('\n' + self.style.ERROR('MISSING ORIGINAL FILES:'))
-            for media_file, issues in missing_files:
-                self.stdout.write(f'  - {media_file.id}: {media_file.original_filename}')
+            for finding in findings['missing']:
+                self.stdout.write(f'  - {finding["id"]}: {finding["original_filename"]}')
                 if self.verbose:
-                    self.stdout.write(f'    File path: {media_file.file.name}')
-                    self.stdout.write(f'    Issues: {", ".join(issues)}')
+                    self.stdout.write(f'    File path: {finding["file"]}')
+                    self.stdout.write(f'    Issues: {", ".join(finding["issues"])}')
 
-        if broken_files:
+        if findings['broken']:
             self.stdout.write('\n' + self.style.ERROR('BROKEN RECORDS:'))
-            for media_file, issues in broken_files:
-                self.stdout.write(f'  - {media_file.id}: {media_file.original_filename}')
+            for finding in findings['broken']:
+                self.stdout.write(f'  - {finding["id"]}: {finding["original_filename"]}')
                 if self.verbose:
-                    self.stdout.write(f'    Issues: {", ".join(issues)}')
+                    self.stdout.write(f'    Issues: {", ".join(finding["issues"])}')
+
+        if findings['corrupt']:
+            self.stdout.write('\n' + self.style.ERROR('CORRUPT FILES:'))
+            for finding in findings['corrupt']:
+                self.stdout.write(f'  - {finding["id"]}: {finding["file"]}')
+
+        if orphaned_files and self.verbose:
+            self.stdout.write('\n' + self.style.WARNING('ORPHANED FILES ON DISK:'))
+            for path in orphaned_files:
+                self.stdout.write(f'  - {path}')
+
+        if self.report_path:
+            self.write_report(total_files, orphaned_files)
+
+        # The scan is complete, a later --resume starts over
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
 
         # Handle fixes if requested
-        if self.fix_mode and (missing_files or broken_files):
-            self.handle_fixes(missing_files, broken_files)
+        if self.fix_mode and (findings['missing'] or findings['broken']):
+            self.handle_fixes(
+                self.load_findings(findings['missing']),
+                self.load_findings(findings['broken']),
+            )
+
+    def iter_chunks(self, queryset):
+        """Yield lists of MediaFile records, chunk_size at a time."""
+        chunk = []
+        for media_file in queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(media_file)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def record_issues(self, media_file, issues):
+        """Add a file's issues to every report section they belong to."""
+        finding = {
+            'id': str(media_file.id),
+            'original_filename': media_file.original_filename,
+            'file': media_file.file.name if media_file.file else '',
+            'issues': issues,
+        }
+        for section, section_issues in REPORT_SECTIONS.items():
+            if any(issue in issues for issue in section_issues):
+                self.state['findings'][section].append(finding)
+
+    def load_findings(self, findings):
+        """Turn report entries back into (MediaFile, issues) pairs."""
+        media_files = {
+            str(pk): media_file
+            for pk, media_file in MediaFile.objects.in_bulk(
+                [finding['id'] for finding in findings]
+            ).items()
+        }
+        return [
+            (media_files[finding['id']], finding['issues'])
+            for finding in findings
+            if finding['id'] in media_files
+        ]
+
+    def write_report(self, total_files, orphaned_files):
+        """Write all findings as JSON."""
+        findings = self.state['findings']
+        report = {
+            'summary': {
+                'total_records': total_files,
+                'checked': self.state['checked'],
+                'hash_verified': self.verify_hash,
+                'orphans_scanned': self.scan_orphans,
+                **{section: len(entries) for section, entries in findings.items()},
+                'orphaned_files': len(orphaned_files),
+            },
+            **findings,
+            'orphaned_files': orphaned_files,
+        }
+        with open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f'\nReport written to {self.report_path}')
 
     def check_single_file(self, media_file):
         """Check a single MediaFile for issues."""
         issues = []
-        
+
         # Check if original file exists
         if media_file.file:
             try:
-                file_path = Path(settings.MEDIA_ROOT) / media_file.file.name
+                file_path = media_file.get_file_path()
                 if not file_path.exists():
                     issues.append('missing_original')
                 elif not file_path.is_file():
                     issues.append('not_a_file')
+                elif self.verify_hash:
+                    issues.extend(self.verify_file_hash(file_path, media_file.file_hash))
             except (ValueError, AttributeError):
                 issues.append('invalid_file_path')
         else:
@@ -140,6 +364,60 @@ class Command(BaseCommand):
 
         return issues
 
+    def verify_file_hash(self, file_path, expected_hash):
+        """Re-hash a file, honouring the shared read rate limit."""
+        hash_sha256 = hashlib.sha256()
+        try:
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    self.rate_limiter.consume(len(chunk))
+                    hash_sha256.update(chunk)
+        except OSError:
+            return ['unreadable']
+
+        return [] if hash_sha256.hexdigest() == expected_hash else ['hash_mismatch']
+
+    def find_orphaned_files(self):
+        """List files in MediaFile directories that no record references."""
+        self.stdout.write('Scanning media directories for orphaned files...')
+
+        referenced = set()
+        for file_name, thumbnail_name, resolved_path in MediaFile.objects.values_list(
+            'file', 'thumbnail', 'resolved_path'
+        ).iterator(chunk_size=self.chunk_size):
+            referenced.update(name for name in (file_name, thumbnail_name, resolved_path) if name)
+        for model in (Photo, PhotoSeriesFile):
+            referenced.update(
+                model.objects.exclude(thumbnail_path='')
+                .values_list('thumbnail_path', flat=True)
+                .iterator(chunk_size=self.chunk_size)
+            )
+
+        # FilePond uploads keep no path: their files are <file_id><ext> and
+        # <file_id>_thumb.jpg, found by file_id like serve_media_file does
+        file_ids = set()
+        for model in (Photo, PhotoSeriesFile, VideoClip):
+            file_ids.update(
+                model.objects.exclude(file_id__isnull=True).exclude(file_id='')
+                .values_list('file_id', flat=True)
+                .iterator(chunk_size=self.chunk_size)
+            )
+
+        media_root = Path(settings.MEDIA_ROOT)
+        orphaned = []
+        for directory in MEDIA_DIRECTORIES:
+            for root, dirs, files in os.walk(media_root / directory):
+                dirs.sort()
+                if Path(root).name not in MEDIA_SUBDIRECTORIES:
+                    continue
+                for name in sorted(files):
+                    relative = str((Path(root) / name).relative_to(media_root))
+                    stem = name.split('.', 1)[0].removesuffix('_thumb')
+                    if relative not in referenced and stem not in file_ids:
+                        orphaned.append(relative)
+
+        return orphaned
+
     def handle_fixes(self, missing_files, broken_files):
         """Handle fixing broken records."""
         self.stdout.write('\n' + self.style.WARNING('APPLYING FIXES...'))
@@ -0,0 +1,147 @@
+"""
+Management command to garbage-collect unreferenced media blobs.
+
+MediaFile rows share content through MediaBlob. Deleting a MediaFile only
+releases its reference, and cascades or bulk deletes skip even that, so this
+command recounts references from the MediaFile table and removes blobs that
+nothing points at once they have been unreferenced for a grace period.
+"""
+
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from apps.mediafiles.models import MediaBlob, MediaFile
+
+
+class Command(BaseCommand):
+    help = 'Remove media blobs no MediaFile references and fix reference counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Actually fix counts and delete blobs (default is dry-run)',
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=int,
+            default=24,
+            help='Keep unreferenced blobs for this many hours (default: 24)',
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Show detailed output',
+        )
+
+    def handle(self, *args, **options):
+        self.verbose = options.get('verbose', False)
+        self.fix_mode = options.get('fix', False)
+        self.cutoff = timezone.now() - timedelta(hours=options.get('grace_hours', 24))
+
+        if self.fix_mode:
+            self.stdout.write(
+                self.style.WARNING('Running in FIX mode - unreferenced blobs will be deleted!')
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS('Running in DRY-RUN mode - no changes will be made')
+            )
+
+        recounted = self.recount_references()
+        collected, freed_bytes = self.collect_blobs()
+        stray_files = self.find_stray_files()
+
+        # Report results
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write('MEDIA BLOB GARBAGE COLLECTION RESULTS')
+        self.stdout.write('='*60)
+        self.stdout.write(f'Total blobs: {MediaBlob.objects.count()}')
+        self.stdout.write(f'Reference counts corrected: {recounted}')
+        self.stdout.write(f'Unreferenced blobs collected: {collected}')
+        self.stdout.write(f'Space freed: {freed_bytes} bytes')
+        self.stdout.write(f'Files in blob storage without a record: {len(stray_files)}')
+
+        if stray_files and self.verbose:
+            self.stdout.write('\n' + self.style.WARNING('STRAY BLOB FILES:'))
+            for path in stray_files:
+                self.stdout.write(f'  - {path}')
+
+        if not self.fix_mode and (recounted or collected):
+            self.stdout.write('\n' + self.style.WARNING(
+                'To apply these changes, run with --fix flag'
+            ))
+
+    def recount_references(self):
+        """Set ref_count to the number of MediaFile rows using each blob."""
+        mismatched = MediaBlob.objects.annotate(
+            actual=Count('media_files')
+        ).exclude(ref_count=F('actual')).values_list('pk', 'actual')
+
+        corrected = 0
+        for sha256, actual in mismatched.iterator():
+            corrected += 1
+            if self.verbose:
+                self.stdout.write(f'Recount {sha256}: {actual} references')
+            if self.fix_mode:
+                MediaBlob.objects.filter(pk=sha256).update(ref_count=actual)
+                if actual == 0:
+                    # Start the grace period if the release was never recorded
+                    MediaBlob.objects.filter(pk=sha256, released_at__isnull=True).update(
+                        released_at=timezone.now()
+                    )
+
+        return corrected
+
+    def collect_blobs(self):
+        """Delete unreferenced blobs older than the grace period."""
+        candidates = MediaBlob.objects.annotate(
+            actual=Count('media_files')
+        ).filter(actual=0).filter(
+            Q(released_at__lt=self.cutoff) |
+            Q(released_at__isnull=True, created_at__lt=self.cutoff)
+        ).values_list('pk', flat=True)
+
+        collected = 0
+        freed_bytes = 0
+        for sha256 in list(candidates):
+            with transaction.atomic():
+                blob = MediaBlob.objects.select_for_update().filter(pk=sha256).first()
+                # A new upload may have claimed the blob since the scan
+                if blob is None or MediaFile.objects.filter(blob=blob).exists():
+                    continue
+
+                collected += 1
+                freed_bytes += blob.size
+                if self.verbose:
+                    self.stdout.write(f'Collect {sha256} ({blob.file.name})')
+
+                if self.fix_mode:
+                    if blob.file:
+                        blob.file.delete(save=False)
+                    blob.delete()
+
+        return collected, freed_bytes
+
+    def find_stray_files(self):
+        """List files under blob storage that no MediaBlob records."""
+        blob_root = Path(settings.MEDIA_ROOT) / 'blobs'
+        if not blob_root.is_dir():
+            return []
+
+        known = set(MediaBlob.objects.values_list('file', flat=True))
+        stray = []
+        for root, dirs, files in os.walk(blob_root):
+            dirs.sort()
+            for name in sorted(files):
+                relative = str((Path(root) / name).relative_to(settings.MEDIA_ROOT))
+                if relative not in known:
+                    stray.append(relative)
+        return stray
@@ -0,0 +1,158 @@
+"""
+Management command to record the on-disk location of legacy media files.
+
+Files uploaded before MediaFile.id-based naming were saved under a random
+UUID, so the path in MediaFile.file does not exist. File serving used to
+glob the directory on every request to find them; this command does that
+search once and stores the result in MediaFile.resolved_path.
+"""
+
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.mediafiles.models import MediaFile
+
+
+class Command(BaseCommand):
+    help = 'Record actual on-disk paths for legacy media files and report unresolved ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Actually record resolved paths (default is dry-run)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of MediaFile records fetched per query (default: 500)',
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Show detailed output',
+        )
+
+    def handle(self, *args, **options):
+        self.verbose = options.get('verbose', False)
+        self.fix_mode = options.get('fix', False)
+        self.chunk_size = options.get('chunk_size', 500)
+
+        if self.fix_mode:
+            self.stdout.write(
+                self.style.WARNING('Running in FIX mode - resolved paths will be recorded!')
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS('Running in DRY-RUN mode - no changes will be made')
+            )
+
+        self.media_root = Path(settings.MEDIA_ROOT)
+        # Directory listings and claimed names are computed once per directory
+        self._listings = {}
+        self._claimed = {}
+
+        self.resolve_paths()
+
+    def resolve_paths(self):
+        """Check every MediaFile and record locations for legacy files."""
+        counts = defaultdict(int)
+        unresolved = []
+
+        queryset = MediaFile.objects.only('id', 'file', 'resolved_path').order_by('pk')
+        for media_file in queryset.iterator(chunk_size=self.chunk_size):
+            status, resolved = self.resolve_media_file(media_file)
+            counts[status] += 1
+
+            if status in ('missing', 'ambiguous'):
+                unresolved.append((media_file, status))
+                continue
+
+            if status in ('resolved', 'cleared') and self.fix_mode:
+                MediaFile.objects.filter(pk=media_file.pk).update(resolved_path=resolved)
+
+            if self.verbose and status != 'ok':
+                self.stdout.write(f'{status}: {media_file.id} -> {resolved or media_file.file.name}')
+
+        # Report results
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write('MEDIA PATH RESOLUTION RESULTS')
+        self.stdout.write('='*60)
+        self.stdout.write(f'Files at expected path: {counts["ok"]}')
+        self.stdout.write(f'Already recorded: {counts["recorded"]}')
+        self.stdout.write(f'Newly resolved: {counts["resolved"]}')
+        self.stdout.write(f'Stale records cleared: {counts["cleared"]}')
+        self.stdout.write(f'Unresolved: {len(unresolved)}')
+
+        if unresolved:
+            self.stdout.write('\n' + self.style.ERROR('UNRESOLVED FILES:'))
+            for media_file, status in unresolved:
+                self.stdout.write(f'  {media_file.id} ({status}): {media_file.file.name}')
+
+        if not self.fix_mode and (counts['resolved'] or counts['cleared']):
+            self.stdout.write('\n' + self.style.WARNING(
+                'To record the resolved paths, run with --fix flag'
+            ))
+
+    def resolve_media_file(self, media_file):
+        """
+        Determine where a MediaFile actually lives.
+
+        Returns:
+            Tuple of (status, resolved_path) where status is one of
+            'ok', 'recorded', 'resolved', 'cleared', 'missing' or 'ambiguous'
+        """
+        if not media_file.file:
+            return 'missing', ''
+
+        expected_path = self.media_root / media_file.file.name
+        if expected_path.is_file():
+            # Current naming works; drop any stale legacy record
+            return ('cleared', '') if media_file.resolved_path else ('ok', '')
+
+        if media_file.resolved_path and (self.media_root / media_file.resolved_path).is_file():
+            return 'recorded', media_file.resolved_path
+
+        candidates = self.get_unclaimed_candidates(expected_path)
+        if len(candidates) == 1:
+            relative = str(candidates[0].relative_to(self.media_root))
+            self._claimed[expected_path.parent].add(candidates[0].name)
+            return 'resolved', relative
+
+        return ('ambiguous' if candidates else 'missing'), ''
+
+    def get_unclaimed_candidates(self, expected_path):
+        """Files with the expected extension not referenced by any other MediaFile."""
+        directory = expected_path.parent
+
+        if directory not in self._listings:
+            self._listings[directory] = (
+                sorted(path for path in directory.iterdir() if path.is_file())
+                if directory.is_dir() else []
+            )
+            self._claimed[directory] = self.get_claimed_names(directory)
+
+        return [
+            path for path in self._listings[directory]
+            if path.suffix == expected_path.suffix and path.name not in self._claimed[directory]
+        ]
+
+    def get_claimed_names(self, directory):
+        """Names in a directory already referenced by MediaFile rows."""
+        prefix = str(directory.relative_to(self.media_root)) + '/'
+        claimed = set()
+
+        for file_name in MediaFile.objects.filter(
+            file__startswith=prefix
+        ).values_list('file', flat=True):
+            claimed.add(Path(file_name).name)
+        for resolved_path in MediaFile.objects.filter(
+            resolved_path__startswith=prefix
+        ).values_list('resolved_path', flat=True):
+            claimed.add(Path(resolved_path).name)
+
+        return claimed
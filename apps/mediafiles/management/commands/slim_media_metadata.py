@@ -0,0 +1,104 @@
+"""
+Management command to shrink legacy EXIF stored in MediaFile.metadata.
+
+Older uploads stored every scalar EXIF tag as a string, keyed by numeric
+tag id. New uploads keep only a compact, typed summary (orientation,
+capture time, device and dimensions). This command converts existing rows
+to the compact form from the stored values, without reopening the files.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.mediafiles.models import MediaFile
+from apps.mediafiles.utils import is_legacy_exif, summarize_legacy_exif
+
+
+class Command(BaseCommand):
+    help = 'Convert legacy per-tag EXIF metadata to the compact EXIF schema'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Actually rewrite metadata (default is dry-run)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of MediaFile records fetched and updated per batch (default: 500)',
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Show detailed output',
+        )
+
+    def handle(self, *args, **options):
+        self.verbose = options.get('verbose', False)
+        self.fix_mode = options.get('fix', False)
+        self.chunk_size = options.get('chunk_size', 500)
+
+        if self.fix_mode:
+            self.stdout.write(
+                self.style.WARNING('Running in FIX mode - metadata will be rewritten!')
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS('Running in DRY-RUN mode - no changes will be made')
+            )
+
+        self.slim_metadata()
+
+    def slim_metadata(self):
+        """Rewrite legacy EXIF on every MediaFile that still has it."""
+        checked = 0
+        converted = 0
+        removed = 0
+        pending = []
+
+        queryset = MediaFile.objects.filter(
+            metadata__has_key='exif'
+        ).only('id', 'metadata').order_by('pk')
+
+        for media_file in queryset.iterator(chunk_size=self.chunk_size):
+            checked += 1
+            exif = media_file.metadata.get('exif')
+            if not isinstance(exif, dict) or not is_legacy_exif(exif):
+                continue
+
+            summary = summarize_legacy_exif(exif)
+            if summary:
+                media_file.metadata['exif'] = summary
+                converted += 1
+            else:
+                del media_file.metadata['exif']
+                removed += 1
+
+            if self.verbose:
+                self.stdout.write(f'{media_file.id}: {len(exif)} tags -> {summary or "removed"}')
+
+            pending.append(media_file)
+            if len(pending) >= self.chunk_size:
+                self.save_batch(pending)
+                pending = []
+
+        self.save_batch(pending)
+
+        # Report results
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write('MEDIA METADATA SLIMMING RESULTS')
+        self.stdout.write('='*60)
+        self.stdout.write(f'Files with EXIF checked: {checked}')
+        self.stdout.write(f'Converted to compact EXIF: {converted}')
+        self.stdout.write(f'EXIF removed (no whitelisted tags): {removed}')
+
+        if not self.fix_mode and (converted or removed):
+            self.stdout.write('\n' + self.style.WARNING(
+                'To rewrite the metadata, run with --fix flag'
+            ))
+
+    def save_batch(self, media_files):
+        """Write a batch of rewritten metadata in one query."""
+        if self.fix_mode and media_files:
+            MediaFile.objects.bulk_update(media_files, ['metadata'])
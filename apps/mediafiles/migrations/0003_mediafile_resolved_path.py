@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mediafiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediafile',
+            name='resolved_path',
+            field=models.CharField(blank=True, default='', help_text='Actual location relative to MEDIA_ROOT for legacy files whose on-disk name differs from the file field', max_length=255, verbose_name='Caminho Resolvido'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:46
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_photoseries_summary(apps, schema_editor):
+    """Fill the summary fields for existing photo series."""
+    PhotoSeries = apps.get_model('mediafiles', 'PhotoSeries')
+    PhotoSeriesFile = apps.get_model('mediafiles', 'PhotoSeriesFile')
+
+    totals = {
+        row['photo_series']: row
+        for row in PhotoSeriesFile.objects.values('photo_series').annotate(
+            count=Count('id'), total=Sum('file_size')
+        )
+    }
+    covers = {}
+    for series_id, file_id, thumbnail_path in PhotoSeriesFile.objects.order_by(
+        'photo_series', 'order'
+    ).values_list('photo_series', 'file_id', 'thumbnail_path'):
+        covers.setdefault(series_id, (file_id or '') if thumbnail_path else '')
+
+    for series_id, row in totals.items():
+        PhotoSeries.objects.filter(pk=series_id).update(
+            photo_count=row['count'],
+            total_bytes=row['total'] or 0,
+            cover_file_id=covers.get(series_id, ''),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mediafiles', '0003_mediafile_resolved_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photoseries',
+            name='cover_file_id',
+            field=models.CharField(blank=True, default='', help_text='FilePond file ID of the first photo, empty if it has no thumbnail', max_length=100, verbose_name='Foto de Capa'),
+        ),
+        migrations.AddField(
+            model_name='photoseries',
+            name='photo_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of photos in the series', verbose_name='Número de Fotos'),
+        ),
+        migrations.AddField(
+            model_name='photoseries',
+            name='total_bytes',
+            field=models.PositiveBigIntegerField(default=0, help_text='Combined size of all photos in bytes', verbose_name='Tamanho Total'),
+        ),
+        migrations.RunPython(populate_photoseries_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:52
+
+import apps.mediafiles.utils
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mediafiles', '0004_photoseries_summary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mediafile',
+            name='file_hash',
+            field=models.CharField(help_text='SHA-256 hash for file deduplication', max_length=64, verbose_name='Hash do Arquivo'),
+        ),
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('sha256', models.CharField(help_text='SHA-256 hash of the content', max_length=64, primary_key=True, serialize=False, verbose_name='Hash SHA-256')),
+                ('file', models.FileField(help_text='Content stored under its hash', max_length=255, upload_to=apps.mediafiles.utils.get_blob_upload_path, verbose_name='Arquivo')),
+                ('size', models.PositiveBigIntegerField(help_text='Content size in bytes', verbose_name='Tamanho')),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='Number of MediaFile rows using this blob', verbose_name='Referências')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('released_at', models.DateTimeField(blank=True, help_text='When the last reference was released', null=True, verbose_name='Liberado em')),
+            ],
+            options={
+                'verbose_name': 'Blob de Mídia',
+                'verbose_name_plural': 'Blobs de Mídia',
+                'indexes': [models.Index(fields=['ref_count', 'released_at'], name='mediablob_gc_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='blob',
+            field=models.ForeignKey(blank=True, help_text="Shared content; file points at the blob's path", null=True, on_delete=django.db.models.deletion.PROTECT, related_name='media_files', to='mediafiles.mediablob', verbose_name='Blob'),
+        ),
+    ]
@@ -5,6 +5,7 @@ This module implements the database models for the MediaFiles app in EquipeMed.
 It provides secure media file management for medical images and videos.
 
 Models:
+- MediaBlob: Content-addressed file storage shared by identical uploads
 - MediaFile: Core file storage and metadata
 - Photo: Single photo events (inherits from Event)
 
@@ -18,29 +19,148 @@ Security Features:
 """
 
 import os
+import tempfile
 import uuid
 from pathlib import Path
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Max, Sum
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 from django.urls import reverse
+from django.utils import timezone
 
 from apps.events.models import Event
 from .utils import (
+    get_blob_upload_path,
     get_secure_upload_path,
     get_thumbnail_upload_path,
     normalize_filename,
     calculate_file_hash,
+    extract_exif_summary,
     validate_file_extension,
 )
 from .security import FileValidator
+from .image_processor import ImageProcessor
+from .probe import FFMPEG_AVAILABLE, PROBE_ATTRIBUTE, cache_video_probe, get_video_probe
+
+
+class MediaBlobManager(models.Manager):
+    """Custom manager for MediaBlob model."""
+
+    def acquire(self, uploaded_file: UploadedFile, sha256: str):
+        """
+        Return the blob for this content, storing it on first use.
+
+        The blob's reference count is incremented; call MediaBlob.release()
+        when the referencing row goes away.
+
+        Args:
+            uploaded_file: File whose content hashes to sha256
+            sha256: SHA-256 hex digest of the content
+
+        Returns:
+            MediaBlob instance
+        """
+        with transaction.atomic():
+            blob, created = self.select_for_update().get_or_create(
+                sha256=sha256,
+                defaults={'size': uploaded_file.size},
+            )
+            if created or not blob.exists():
+                name = get_blob_upload_path(blob, uploaded_file.name)
+                if blob.file.storage.exists(name):
+                    # Content left behind by a lost row; the path is the hash
+                    blob.file.name = name
+                else:
+                    uploaded_file.seek(0)
+                    blob.file.save(uploaded_file.name, uploaded_file, save=False)
+                blob.save(update_fields=['file'])
+
+            self.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+            blob.refresh_from_db(fields=['ref_count'])
+
+        return blob
+
+
+class MediaBlob(models.Model):
+    """
+    Stored file content, addressed by SHA-256.
+
+    Identical uploads share one blob, so duplicates cost no disk space.
+    ref_count tracks how many MediaFile rows point at the blob; blobs that
+    drop to zero are removed by the gc_media_blobs command.
+    """
+
+    sha256 = models.CharField(
+        max_length=64,
+        primary_key=True,
+        verbose_name="Hash SHA-256",
+        help_text="SHA-256 hash of the content"
+    )
+
+    file = models.FileField(
+        upload_to=get_blob_upload_path,
+        max_length=255,
+        verbose_name="Arquivo",
+        help_text="Content stored under its hash"
+    )
+
+    size = models.PositiveBigIntegerField(
+        verbose_name="Tamanho",
+        help_text="Content size in bytes"
+    )
+
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Referências",
+        help_text="Number of MediaFile rows using this blob"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Criado em"
+    )
+
+    released_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Liberado em",
+        help_text="When the last reference was released"
+    )
+
+    objects = MediaBlobManager()
+
+    class Meta:
+        verbose_name = "Blob de Mídia"
+        verbose_name_plural = "Blobs de Mídia"
+        indexes = [
+            models.Index(fields=['ref_count', 'released_at'], name='mediablob_gc_idx'),
+        ]
+
+    def __str__(self):
+        return self.sha256
+
+    def exists(self) -> bool:
+        """Return True if the content is present on disk."""
+        return bool(self.file) and Path(settings.MEDIA_ROOT, self.file.name).is_file()
+
+    def release(self):
+        """Drop one reference; the content is kept until garbage collection."""
+        MediaBlob.objects.filter(pk=self.pk, ref_count__gt=0).update(
+            ref_count=F('ref_count') - 1,
+            released_at=timezone.now(),
+        )
 
 
 class MediaFileManager(models.Manager):
     """Custom manager for MediaFile model."""
 
+    def get_queryset(self):
+        """Return queryset without the metadata JSON, loaded only on access."""
+        return super().get_queryset().defer('metadata')
+
     def create_from_upload(self, uploaded_file: UploadedFile, **kwargs):
         """
         Create MediaFile instance from uploaded file with security validation.
@@ -79,12 +199,6 @@ class MediaFileManager(models.Manager):
         # Calculate file hash for deduplication
         file_hash = calculate_file_hash(uploaded_file)
 
-        # Check for existing file with same hash
-        if getattr(settings, 'MEDIA_ENABLE_FILE_DEDUPLICATION', True):
-            existing_file = self.filter(file_hash=file_hash).first()
-            if existing_file:
-                return existing_file
-
         # Create new MediaFile instance
         print(f"[BACKEND SIZE] Creating MediaFile from upload:")
         print(f"  - Original filename: {uploaded_file.name}")
@@ -106,10 +220,25 @@ class MediaFileManager(models.Manager):
         media_file.save()
         print(f"[BACKEND SIZE] MediaFile instance created with ID: {media_file.id}")
 
-        # Now save file to storage using the MediaFile.id for consistent naming
-        media_file.file.save(uploaded_file.name, uploaded_file, save=True)
+        if getattr(settings, 'MEDIA_ENABLE_FILE_DEDUPLICATION', True):
+            # Point at the content-addressed blob; identical content is stored once.
+            # The blob row stays locked until the reference is saved, so
+            # gc_media_blobs cannot collect it in between.
+            with transaction.atomic():
+                blob = MediaBlob.objects.acquire(uploaded_file, file_hash)
+                media_file.blob = blob
+                media_file.file.name = blob.file.name
+                media_file.save(update_fields=['blob', 'file'])
+        else:
+            # Now save file to storage using the MediaFile.id for consistent naming
+            media_file.file.save(uploaded_file.name, uploaded_file, save=True)
         print(f"[BACKEND SIZE] File saved to storage: {media_file.file.name}")
 
+        # Reuse the probe from upload validation for the stored copy
+        upload_probe = getattr(uploaded_file, PROBE_ATTRIBUTE, None)
+        if upload_probe is not None:
+            cache_video_probe(media_file.file.path, upload_probe)
+
         # Extract metadata and generate thumbnails (both will use same MediaFile.id)
         print(f"[BACKEND SIZE] Extracting metadata...")
         media_file._extract_metadata()
@@ -170,12 +299,20 @@ class MediaFile(models.Model):
 
     file_hash = models.CharField(
         max_length=64,
-        unique=True,
-        db_index=True,
         verbose_name="Hash do Arquivo",
         help_text="SHA-256 hash for file deduplication"
     )
 
+    blob = models.ForeignKey(
+        MediaBlob,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name='media_files',
+        verbose_name="Blob",
+        help_text="Shared content; file points at the blob's path"
+    )
+
     file_size = models.PositiveIntegerField(
         verbose_name="Tamanho do Arquivo",
         help_text="File size in bytes"
@@ -245,6 +382,15 @@ class MediaFile(models.Model):
         help_text="Additional file metadata"
     )
 
+    resolved_path = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        verbose_name="Caminho Resolvido",
+        help_text="Actual location relative to MEDIA_ROOT for legacy files whose "
+                  "on-disk name differs from the file field"
+    )
+
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Criado em"
@@ -271,6 +417,14 @@ class MediaFile(models.Model):
         """Return original filename for string representation."""
         return self.original_filename
 
+    def delete(self, *args, **kwargs):
+        """Delete the row and release its blob reference."""
+        blob = self.blob
+        result = super().delete(*args, **kwargs)
+        if blob is not None:
+            blob.release()
+        return result
+
     def clean(self):
         """Validate the media file."""
         super().clean()
@@ -338,14 +492,10 @@ class MediaFile(models.Model):
                 with Image.open(self.file.path) as img:
                     self.width, self.height = img.size
 
-                    # Extract EXIF data if available
-                    if hasattr(img, '_getexif') and img._getexif():
-                        exif_data = img._getexif()
-                        if exif_data:
-                            self.metadata['exif'] = {
-                                str(k): str(v) for k, v in exif_data.items()
-                                if isinstance(v, (str, int, float))
-                            }
+                    # Keep only the whitelisted EXIF fields
+                    exif = extract_exif_summary(img)
+                    if exif:
+                        self.metadata['exif'] = exif
 
         except Exception as e:
             # Log error but don't fail the save
@@ -361,11 +511,14 @@ class MediaFile(models.Model):
                 self.generate_video_thumbnail()
             else:
                 # Generate image thumbnail
-                from PIL import Image
+                from PIL import Image, ImageOps
                 import tempfile
 
                 # Open original image
                 with Image.open(self.file.path) as img:
+                    # Apply EXIF orientation so thumbnails display upright
+                    img = ImageOps.exif_transpose(img)
+
                     # Convert to RGB if necessary
                     if img.mode in ('RGBA', 'LA', 'P'):
                         img = img.convert('RGB')
@@ -391,6 +544,15 @@ class MediaFile(models.Model):
             # Log error but don't fail the save
             self.metadata['thumbnail_error'] = str(e)
 
+    def get_file_path(self) -> Path:
+        """
+        Return the absolute on-disk path of the file.
+
+        Legacy uploads saved under a random UUID have their real location
+        recorded in resolved_path, so serving never has to list directories.
+        """
+        return Path(settings.MEDIA_ROOT) / (self.resolved_path or self.file.name)
+
     def get_thumbnail_url(self):
         """Return thumbnail URL with fallback."""
         if self.thumbnail:
@@ -483,18 +645,15 @@ class MediaFile(models.Model):
             return
 
         try:
-            import ffmpeg
-            
-            # Probe video file for metadata
-            probe = ffmpeg.probe(self.file.path)
-            video_stream = next((stream for stream in probe['streams']
-                              if stream['codec_type'] == 'video'), None)
+            # Probe video file for metadata (memoized per file)
+            probe = get_video_probe(self.file.path)
+            video_stream = probe.video_stream
             
             if video_stream:
                 # Extract basic video metadata
-                self.duration = int(float(video_stream.get('duration', 0)))
-                self.width = int(video_stream.get('width', 0))
-                self.height = int(video_stream.get('height', 0))
+                self.duration = int(probe.duration)
+                self.width = probe.width
+                self.height = probe.height
                 self.video_codec = video_stream.get('codec_name', '')
                 self.fps = float(video_stream.get('r_frame_rate', '0/1').split('/')[0]) / \
                           max(float(video_stream.get('r_frame_rate', '0/1').split('/')[1]), 1)
@@ -502,8 +661,8 @@ class MediaFile(models.Model):
                 # Extract bitrate if available
                 if 'bit_rate' in video_stream:
                     self.video_bitrate = int(video_stream['bit_rate'])
-                elif 'format' in probe and 'bit_rate' in probe['format']:
-                    self.video_bitrate = int(probe['format']['bit_rate'])
+                elif 'bit_rate' in probe.format:
+                    self.video_bitrate = int(probe.format['bit_rate'])
                 
                 # Store additional metadata
                 self.metadata.update({
@@ -511,7 +670,7 @@ class MediaFile(models.Model):
                     'profile': video_stream.get('profile', ''),
                     'level': video_stream.get('level', ''),
                     'pixel_format': video_stream.get('pix_fmt', ''),
-                    'container_format': probe.get('format', {}).get('format_name', ''),
+                    'container_format': probe.format_name,
                 })
                 
         except Exception as e:
@@ -525,45 +684,30 @@ class MediaFile(models.Model):
 
         try:
             import ffmpeg
-            
-            # Create structured thumbnail path
-            path_obj = Path(self.file.path)
-            
-            # Expected structure: media_type/YYYY/MM/originals/filename
-            # We want: media_type/YYYY/MM/thumbnails/filename_thumb.jpg
-            if 'originals' in path_obj.parts:
-                # Replace 'originals' with 'thumbnails' in the path
-                parts = list(path_obj.parts)
-                originals_index = parts.index('originals')
-                parts[originals_index] = 'thumbnails'
-                thumbnail_dir = Path(*parts[:-1])  # Remove filename
-                thumbnail_path = thumbnail_dir / f"{self.id}_thumb.jpg"
-            else:
-                # Fallback to old structure for compatibility
-                thumbnail_dir = path_obj.parent.parent / 'thumbnails'
-                thumbnail_path = thumbnail_dir / f"{self.id}_thumb.jpg"
-
-            # Create directory if it doesn't exist
-            thumbnail_dir.mkdir(parents=True, exist_ok=True)
 
             # Extract frame at 1 second (or duration/10 if video is shorter)
             time_offset = min(1.0, self.duration / 10.0 if self.duration else 1.0)
-            
-            # Generate thumbnail using ffmpeg
-            (
-                ffmpeg
-                .input(self.file.path, ss=time_offset)
-                .output(str(thumbnail_path), vframes=1, format='image2', vcodec='mjpeg', 
-                       **{'q:v': 2, 's': '300x300'})  # High quality, max 300x300
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
 
-            # Save thumbnail to model
+            # Render the frame outside MEDIA_ROOT; only the saved thumbnail is
+            # kept, so nothing is left next to the (possibly shared) original
             thumbnail_name = f"{self.id}_thumb.jpg"
-            with open(thumbnail_path, 'rb') as thumb_file:
-                from django.core.files import File
-                self.thumbnail.save(thumbnail_name, File(thumb_file), save=False)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                thumbnail_path = Path(tmp_dir) / thumbnail_name
+
+                # Generate thumbnail using ffmpeg
+                (
+                    ffmpeg
+                    .input(self.file.path, ss=time_offset)
+                    .output(str(thumbnail_path), vframes=1, format='image2', vcodec='mjpeg',
+                           **{'q:v': 2, 's': '300x300'})  # High quality, max 300x300
+                    .overwrite_output()
+                    .run(capture_stdout=True, capture_stderr=True)
+                )
+
+                # Save thumbnail to model
+                with open(thumbnail_path, 'rb') as thumb_file:
+                    from django.core.files import File
+                    self.thumbnail.save(thumbnail_name, File(thumb_file), save=False)
 
         except Exception as e:
             # Log error but don't fail the save
@@ -774,43 +918,25 @@ class MediaFile(models.Model):
 
     def _validate_with_ffmpeg(self):
         """Use ffmpeg to validate video file structure."""
+        if not FFMPEG_AVAILABLE:
+            # ffmpeg not available, skip advanced validation
+            return
+
         try:
-            import ffmpeg
-            import tempfile
+            # Probe file with ffmpeg (shared with metadata extraction)
+            probe = get_video_probe(self.file)
 
-            # Create temporary file for validation
-            with tempfile.NamedTemporaryFile(delete=False, suffix=Path(self.original_filename).suffix) as temp_file:
-                self.file.seek(0)
-                for chunk in self.file.chunks():
-                    temp_file.write(chunk)
-                temp_file_path = temp_file.name
+            # Validate that we have at least one video stream
+            video_streams = probe.video_streams
+            if not video_streams:
+                raise ValidationError("No valid video stream found in file")
+
+            # Check for suspicious stream configurations
+            for stream in video_streams:
+                codec_name = stream.get('codec_name', '').lower()
+                if codec_name in ['wmv', 'asf', 'rm', 'rmvb']:  # Potentially problematic codecs
+                    raise ValidationError(f"Codec '{codec_name}' is not allowed for security reasons")
 
-            try:
-                # Probe file with ffmpeg
-                probe = ffmpeg.probe(temp_file_path)
-
-                # Validate that we have at least one video stream
-                video_streams = [stream for stream in probe['streams'] if stream['codec_type'] == 'video']
-                if not video_streams:
-                    raise ValidationError("No valid video stream found in file")
-
-                # Check for suspicious stream configurations
-                for stream in video_streams:
-                    codec_name = stream.get('codec_name', '').lower()
-                    if codec_name in ['wmv', 'asf', 'rm', 'rmvb']:  # Potentially problematic codecs
-                        raise ValidationError(f"Codec '{codec_name}' is not allowed for security reasons")
-
-            finally:
-                # Clean up temporary file
-                import os
-                try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass
-
-        except ImportError:
-            # ffmpeg not available, skip advanced validation
-            pass
         except Exception as e:
             raise ValidationError(f"Video validation with ffmpeg failed: {str(e)}")
 
@@ -1037,6 +1163,27 @@ class PhotoSeries(Event):
         blank=True,
         verbose_name="Legenda da Série"
     )
+
+    # Summary of the series photos, kept up to date by refresh_summary()
+    photo_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Número de Fotos",
+        help_text="Number of photos in the series"
+    )
+
+    total_bytes = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Tamanho Total",
+        help_text="Combined size of all photos in bytes"
+    )
+
+    cover_file_id = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        verbose_name="Foto de Capa",
+        help_text="FilePond file ID of the first photo, empty if it has no thumbnail"
+    )
     
     objects = PhotoSeriesManager()
     
@@ -1074,24 +1221,218 @@ class PhotoSeries(Event):
         return reverse('patients:patient_timeline', kwargs={'pk': self.patient.pk})
 
     def get_photos(self):
-        """Return related PhotoSeriesFile objects."""
-        return self.photoseriesfile_set.all().order_by('order')
+        """
+        Return related PhotoSeriesFile objects.
+
+        PhotoSeriesFile is ordered by ``order``, so prefetched rows (see
+        prefetch_series_photos) are reused instead of queried again.
+        """
+        return self.photoseriesfile_set.all()
     
     def get_ordered_photos(self):
         """Return photos ordered by the user-defined order field."""
-        return self.photoseriesfile_set.all().order_by('order')
+        return self.get_photos()
     
     def get_photo_count(self):
         """Return number of photos in series."""
-        return self.photoseriesfile_set.count()
+        return self.photo_count
     
     def get_primary_thumbnail(self):
         """Return first photo thumbnail."""
-        first_photo = self.get_photos().first()
-        if first_photo:
-            return first_photo.get_thumbnail_url()
+        if self.cover_file_id:
+            return reverse('mediafiles:serve_thumbnail', kwargs={'file_id': self.cover_file_id})
         return None
 
+    def get_storage_directory(self, kind='originals'):
+        """
+        Return the directory holding this series' files of the given kind.
+
+        File serving looks photos up under the series creation month, so all
+        photos of a series live in photo_series/YYYY/MM/{originals,thumbnails}.
+        """
+        created_at = self.created_at or timezone.now()
+        return Path(settings.MEDIA_ROOT) / 'photo_series' / created_at.strftime('%Y/%m') / kind
+
+    def add_photos_batch(self, uploaded_files):
+        """
+        Add uploaded images to the series in one batch.
+
+        Every file is validated before anything is written, so an invalid
+        file rejects the whole batch. The originals are then stored and
+        handed to add_stored_photos().
+
+        Args:
+            uploaded_files: List of Django UploadedFile objects, in series order
+
+        Returns:
+            List of created PhotoSeriesFile instances
+
+        Raises:
+            ValidationError: If any file fails validation
+        """
+        for uploaded_file in uploaded_files:
+            FileValidator.validate_image_file(uploaded_file)
+
+        originals_dir = self.get_storage_directory('originals')
+        originals_dir.mkdir(parents=True, exist_ok=True)
+
+        stored = []
+        try:
+            for uploaded_file in uploaded_files:
+                file_id = str(uuid.uuid4())
+                destination = originals_dir / f"{file_id}{Path(uploaded_file.name).suffix.lower()}"
+                uploaded_file.seek(0)
+                with open(destination, 'wb') as out:
+                    for chunk in uploaded_file.chunks():
+                        out.write(chunk)
+                stored.append((file_id, normalize_filename(uploaded_file.name), destination))
+        except Exception:
+            for _, _, path in stored:
+                path.unlink(missing_ok=True)
+            raise
+
+        return self.add_stored_photos(stored)
+
+    def add_stored_photos(self, stored):
+        """
+        Add images already stored in this series' originals directory.
+
+        Metadata and thumbnails are produced in parallel by
+        ImageProcessor.process_batch(), then all PhotoSeriesFile rows are
+        inserted with one bulk_create in a single transaction, appended
+        after any existing photos. If any image cannot be read, no rows are
+        created and the batch's files are removed.
+
+        Args:
+            stored: List of (file_id, original_filename, path) tuples
+
+        Returns:
+            List of created PhotoSeriesFile instances
+
+        Raises:
+            ValidationError: If an image cannot be decoded
+        """
+        thumbnails_dir = self.get_storage_directory('thumbnails')
+        thumbnails_dir.mkdir(parents=True, exist_ok=True)
+        thumbnail_paths = [thumbnails_dir / f"{file_id}_thumb.jpg" for file_id, _, _ in stored]
+
+        results = ImageProcessor.process_batch(
+            [(path, thumbnail) for (_, _, path), thumbnail in zip(stored, thumbnail_paths)]
+        )
+
+        try:
+            for (_, original_filename, _), (metadata, _) in zip(stored, results):
+                if not metadata:
+                    raise ValidationError(f"Invalid image file: {original_filename}")
+
+            with transaction.atomic():
+                # Lock the series so concurrent batches get distinct orders
+                PhotoSeries._base_manager.select_for_update().values('pk').get(pk=self.pk)
+                last_order = self.photoseriesfile_set.aggregate(last=Max('order'))['last'] or 0
+
+                photos = PhotoSeriesFile.objects.bulk_create([
+                    PhotoSeriesFile(
+                        photo_series=self,
+                        file_id=file_id,
+                        original_filename=original_filename,
+                        file_size=metadata.get('size', 0),
+                        width=metadata.get('width'),
+                        height=metadata.get('height'),
+                        thumbnail_path=(
+                            str(thumbnail.relative_to(settings.MEDIA_ROOT)) if has_thumbnail else ''
+                        ),
+                        order=last_order + position,
+                    )
+                    for position, ((file_id, original_filename, _), (metadata, has_thumbnail), thumbnail)
+                    in enumerate(zip(stored, results, thumbnail_paths), start=1)
+                ])
+                self.refresh_summary()
+        except Exception:
+            for (_, _, path), thumbnail in zip(stored, thumbnail_paths):
+                Path(path).unlink(missing_ok=True)
+                thumbnail.unlink(missing_ok=True)
+            raise
+
+        return photos
+
+    def remove_photo(self, photo_file):
+        """
+        Remove a photo from the series.
+
+        The row is deleted and the summary refreshed in one transaction;
+        the original and thumbnail are deleted once it commits.
+
+        Args:
+            photo_file: PhotoSeriesFile of this series
+        """
+        paths = [
+            self.get_storage_directory('originals')
+            / f"{photo_file.file_id}{Path(photo_file.original_filename or '').suffix.lower()}"
+        ]
+        if photo_file.thumbnail_path:
+            paths.append(Path(settings.MEDIA_ROOT) / photo_file.thumbnail_path)
+
+        with transaction.atomic():
+            PhotoSeries._base_manager.select_for_update().values('pk').get(pk=self.pk)
+            photo_file.delete()
+            self.refresh_summary()
+            transaction.on_commit(lambda: self._delete_paths(paths))
+
+    @staticmethod
+    def _delete_paths(paths):
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def reorder_photos(self, photo_ids):
+        """
+        Put the series photos in the given order.
+
+        Args:
+            photo_ids: Ids of every PhotoSeriesFile of the series, each once,
+                in their new order
+
+        Raises:
+            ValidationError: If photo_ids is not exactly the series photos
+        """
+        photo_ids = [str(photo_id) for photo_id in photo_ids]
+
+        with transaction.atomic():
+            PhotoSeries._base_manager.select_for_update().values('pk').get(pk=self.pk)
+            photos = {str(photo.pk): photo for photo in PhotoSeriesFile.objects.filter(photo_series=self)}
+            if len(photo_ids) != len(set(photo_ids)) or set(photo_ids) != set(photos):
+                raise ValidationError("Photo order must list every photo of the series once")
+
+            # Move every row past the current orders first, so the new orders
+            # never collide with the (photo_series, order) unique constraint
+            offset = max((photo.order or 0 for photo in photos.values()), default=0) + len(photos)
+            PhotoSeriesFile.objects.filter(photo_series=self).update(order=F('order') + offset)
+
+            for order, photo_id in enumerate(photo_ids, start=1):
+                photos[photo_id].order = order
+            PhotoSeriesFile.objects.bulk_update(photos.values(), ['order'])
+            self.refresh_summary()
+
+    def refresh_summary(self):
+        """
+        Recompute photo_count, total_bytes and cover_file_id.
+
+        Must be called after photos are added, removed or reordered. The
+        summary is written with update() so updated_at is left alone.
+        """
+        photos = PhotoSeriesFile.objects.filter(photo_series=self)
+        totals = photos.aggregate(count=Count('id'), total=Sum('file_size'))
+        cover = photos.order_by('order').values_list('file_id', 'thumbnail_path').first()
+
+        self.photo_count = totals['count']
+        self.total_bytes = totals['total'] or 0
+        self.cover_file_id = (cover[0] or '') if cover and cover[1] else ''
+
+        PhotoSeries._base_manager.filter(pk=self.pk).update(
+            photo_count=self.photo_count,
+            total_bytes=self.total_bytes,
+            cover_file_id=self.cover_file_id,
+        )
+
 
 class VideoClipManager(models.Manager):
     """Custom manager for VideoClip model."""
@@ -0,0 +1,101 @@
+# MediaFiles Prefetching
+# Bulk-load media rows for pages of timeline and gallery events
+
+from django.db.models import Count, Prefetch, prefetch_related_objects
+
+from apps.events.models import Event
+from .models import PhotoSeries, PhotoSeriesFile
+
+
+# Attribute holding preloaded media counts on Patient instances
+MEDIA_COUNTS_ATTRIBUTE = '_media_counts'
+
+# Media type names used by the template tags, mapped to event types
+MEDIA_EVENT_TYPES = {
+    'photo': Event.PHOTO_EVENT,
+    'photo_series': Event.PHOTO_SERIES_EVENT,
+    'video': Event.VIDEO_CLIP_EVENT,
+}
+
+
+def prefetch_series_photos(events):
+    """
+    Load ordered photos for every PhotoSeries in a page of events at once.
+
+    ``events`` may be any iterable of Event subclass instances (for example
+    a page of ``select_subclasses()`` results); non-series events are
+    ignored. Afterwards ``series.get_photos()`` is served from the
+    prefetch cache, so rendering the cards issues no further queries.
+
+    Args:
+        events: Iterable of Event instances
+
+    Returns:
+        List of the PhotoSeries instances that were prefetched
+    """
+    series_list = [event for event in events if isinstance(event, PhotoSeries)]
+    if series_list:
+        prefetch_related_objects(
+            series_list,
+            Prefetch('photoseriesfile_set', queryset=PhotoSeriesFile.objects.order_by('order')),
+        )
+    return series_list
+
+
+def prefetch_media_counts(patients):
+    """
+    Attach media event counts to patients with a single grouped query.
+
+    Each patient gets a ``{media_type: count}`` dict (see
+    MEDIA_EVENT_TYPES) that ``mediafiles_count_for_patient`` reads instead
+    of counting per call. Several instances of the same patient all
+    receive the counts.
+
+    Args:
+        patients: Iterable of Patient instances
+    """
+    patients_by_id = {}
+    for patient in patients:
+        if patient is not None:
+            patients_by_id.setdefault(patient.pk, []).append(patient)
+    if not patients_by_id:
+        return
+
+    counts = {patient_id: dict.fromkeys(MEDIA_EVENT_TYPES, 0) for patient_id in patients_by_id}
+    media_types = {event_type: name for name, event_type in MEDIA_EVENT_TYPES.items()}
+
+    rows = (
+        Event.objects.filter(patient_id__in=patients_by_id, event_type__in=media_types)
+        .values_list('patient_id', 'event_type')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for patient_id, event_type, count in rows:
+        counts[patient_id][media_types[event_type]] = count
+
+    for patient_id, instances in patients_by_id.items():
+        for patient in instances:
+            setattr(patient, MEDIA_COUNTS_ATTRIBUTE, counts[patient_id])
+
+
+def prefetch_timeline_media(events, patients=()):
+    """
+    Preload everything the media cards and tags need for a page of events.
+
+    Photos of photo series are fetched in one query and media counts for
+    the patients on the page in another. Photo and VideoClip events carry
+    their file metadata on the event row itself, so the media template
+    tags render the page without further queries.
+
+    Args:
+        events: Iterable of Event subclass instances, with ``patient``
+            selected
+        patients: Additional Patient instances rendered on the page
+
+    Returns:
+        List of the events, evaluated
+    """
+    events = list(events)
+    prefetch_series_photos(events)
+    prefetch_media_counts([*patients, *(event.patient for event in events)])
+    return events
@@ -0,0 +1,243 @@
+# MediaFiles Video Probe
+# Single, memoized ffprobe pass shared by validation, metadata and conversion
+
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import ffmpeg
+    FFMPEG_AVAILABLE = True
+except ImportError:
+    FFMPEG_AVAILABLE = False
+
+
+# Attribute used to memoize a probe on upload/file objects
+PROBE_ATTRIBUTE = '_video_probe'
+
+# Maximum number of probe results kept per process
+PROBE_CACHE_SIZE = 256
+
+# ffprobe is killed if a single run takes longer than this
+PROBE_TIMEOUT_SECONDS = 30
+
+# Quiet ffprobe run printing only the JSON format and stream info
+FFPROBE_ARGS = ['-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams']
+
+_probe_cache: "OrderedDict[tuple, VideoProbe]" = OrderedDict()
+_probe_cache_lock = threading.Lock()
+
+
+class VideoProbe:
+    """
+    Parsed ffprobe result for one video file.
+
+    Wraps the raw JSON returned by ffprobe (see ``run_ffprobe``) and exposes the values
+    the validators, metadata extractors and the transcode planner need.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    @property
+    def streams(self) -> list:
+        return self.data.get('streams', [])
+
+    @property
+    def format(self) -> Dict[str, Any]:
+        return self.data.get('format', {})
+
+    @property
+    def video_stream(self) -> Optional[Dict[str, Any]]:
+        return next((stream for stream in self.streams
+                     if stream.get('codec_type') == 'video'), None)
+
+    @property
+    def audio_stream(self) -> Optional[Dict[str, Any]]:
+        return next((stream for stream in self.streams
+                     if stream.get('codec_type') == 'audio'), None)
+
+    @property
+    def video_streams(self) -> list:
+        return [stream for stream in self.streams if stream.get('codec_type') == 'video']
+
+    @property
+    def duration(self) -> float:
+        """Video stream duration, falling back to the container duration."""
+        video_stream = self.video_stream or {}
+        return float(video_stream.get('duration') or self.format.get('duration') or 0)
+
+    @property
+    def width(self) -> int:
+        return int((self.video_stream or {}).get('width', 0))
+
+    @property
+    def height(self) -> int:
+        return int((self.video_stream or {}).get('height', 0))
+
+    @property
+    def codec_name(self) -> str:
+        return (self.video_stream or {}).get('codec_name', '')
+
+    @property
+    def format_name(self) -> str:
+        return self.format.get('format_name', '')
+
+
+def _cache_key(file_path: str) -> tuple:
+    stat = os.stat(file_path)
+    return (os.path.realpath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def cache_video_probe(file_path, probe: VideoProbe) -> None:
+    """
+    Register a probe result for a file on disk.
+
+    Used when an upload that was already probed is written to its final
+    storage path, so the stored copy is not probed again.
+    """
+    key = _cache_key(str(file_path))
+    with _probe_cache_lock:
+        _probe_cache[key] = probe
+        _probe_cache.move_to_end(key)
+        while len(_probe_cache) > PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+
+
+def clear_video_probe_cache() -> None:
+    """Drop all memoized probe results."""
+    with _probe_cache_lock:
+        _probe_cache.clear()
+
+
+def run_ffprobe(file_path) -> Dict[str, Any]:
+    """
+    Run ffprobe on a file and return its parsed JSON output.
+
+    ffmpeg.probe cannot time out in ffmpeg-python 0.2.0, so ffprobe is run
+    directly and killed after PROBE_TIMEOUT_SECONDS.
+
+    Raises:
+        ffmpeg.Error: If ffprobe fails or times out
+    """
+    try:
+        result = subprocess.run(
+            ['ffprobe', *FFPROBE_ARGS, str(file_path)],
+            capture_output=True,
+            timeout=PROBE_TIMEOUT_SECONDS,
+        )
+    except subprocess.TimeoutExpired as e:
+        message = f"ffprobe timed out after {PROBE_TIMEOUT_SECONDS} seconds"
+        raise ffmpeg.Error('ffprobe', e.stdout or b'', message.encode())
+
+    if result.returncode != 0:
+        raise ffmpeg.Error('ffprobe', result.stdout, result.stderr)
+    return json.loads(result.stdout.decode('utf-8'))
+
+
+def probe_video_path(file_path) -> VideoProbe:
+    """
+    Probe a file on disk, memoized by path, mtime and size.
+
+    Raises:
+        ValueError: If ffmpeg is not available
+        ffmpeg.Error: If ffprobe fails
+    """
+    if not FFMPEG_AVAILABLE:
+        raise ValueError("ffmpeg is required for video probing")
+
+    file_path = str(file_path)
+    key = _cache_key(file_path)
+
+    with _probe_cache_lock:
+        probe = _probe_cache.get(key)
+        if probe is not None:
+            _probe_cache.move_to_end(key)
+            return probe
+
+    probe = VideoProbe(run_ffprobe(file_path))
+    cache_video_probe(file_path, probe)
+    return probe
+
+
+def get_video_probe(video_file) -> VideoProbe:
+    """
+    Return the probe result for a video, running ffprobe at most once.
+
+    Accepts a filesystem path, a MediaFile, a FieldFile or an uploaded
+    file. Uploads kept in memory are spooled to a temporary file once and
+    the result is memoized on the upload object itself.
+
+    Args:
+        video_file: Path, MediaFile, FieldFile or UploadedFile
+
+    Returns:
+        VideoProbe for the file
+    """
+    if isinstance(video_file, VideoProbe):
+        return video_file
+
+    if isinstance(video_file, (str, Path)):
+        return probe_video_path(video_file)
+
+    # Files already in storage are memoized by path (see probe_video_path)
+    file_path = _get_stored_path(video_file)
+    if file_path:
+        return probe_video_path(file_path)
+
+    probe = getattr(video_file, PROBE_ATTRIBUTE, None)
+    if probe is not None:
+        return probe
+
+    if hasattr(video_file, 'temporary_file_path'):
+        probe = probe_video_path(video_file.temporary_file_path())
+    else:
+        probe = _probe_in_memory_upload(video_file)
+
+    try:
+        setattr(video_file, PROBE_ATTRIBUTE, probe)
+    except AttributeError:
+        pass
+    return probe
+
+
+def _get_stored_path(video_file) -> Optional[str]:
+    """Return the on-disk path of a MediaFile or FieldFile, if it has one."""
+    # MediaFile instances carry the FieldFile on ``file``
+    field_file = getattr(video_file, 'file', None)
+    for candidate in (field_file, video_file):
+        try:
+            path = getattr(candidate, 'path', None)
+        except ValueError:
+            # FieldFile without an associated file
+            continue
+        if isinstance(path, str) and os.path.exists(path):
+            return path
+    return None
+
+
+def _probe_in_memory_upload(file_obj) -> VideoProbe:
+    """Spool an in-memory upload to disk once and probe it."""
+    if not FFMPEG_AVAILABLE:
+        raise ValueError("ffmpeg is required for video probing")
+
+    suffix = Path(getattr(file_obj, 'name', '') or '').suffix
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        file_obj.seek(0)
+        for chunk in file_obj.chunks():
+            temp_file.write(chunk)
+        temp_file_path = temp_file.name
+
+    try:
+        return VideoProbe(run_ffprobe(temp_file_path))
+    finally:
+        file_obj.seek(0)
+        try:
+            os.unlink(temp_file_path)
+        except OSError:
+            pass
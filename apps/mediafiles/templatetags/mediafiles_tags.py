@@ -173,6 +173,14 @@ def mediafiles_count_for_patient(patient, media_type=None):
     if not patient:
         return 0
 
+    # Counts preloaded for the page (see prefetch_media_counts)
+    from ..prefetch import MEDIA_COUNTS_ATTRIBUTE
+    preloaded = getattr(patient, MEDIA_COUNTS_ATTRIBUTE, None)
+    if preloaded is not None:
+        if media_type:
+            return preloaded.get(media_type, 0)
+        return sum(preloaded.values())
+
     from apps.events.models import Event
 
     # Build queryset
@@ -280,7 +288,7 @@ def photo_thumbnail(photo, size="medium", css_class=""):
     Returns:
         HTML for photo thumbnail display
     """
-    if not photo or not hasattr(photo, 'media_file'):
+    if not photo:
         return ""
 
     # Size mappings for photos
@@ -293,14 +301,10 @@ def photo_thumbnail(photo, size="medium", css_class=""):
     size_class = size_classes.get(size, 'photo-thumbnail-md')
     all_classes = f"photo-thumbnail {size_class} {css_class}".strip()
 
-    # Get thumbnail URL
-    if hasattr(photo.media_file, 'thumbnail_path') and photo.media_file.thumbnail_path:
-        thumbnail_url = f"{settings.MEDIA_URL}{photo.media_file.thumbnail_path}"
-    else:
-        # Fallback to original file
-        thumbnail_url = f"{settings.MEDIA_URL}{photo.media_file.file.name}"
+    # Get thumbnail URL, falling back to the original file
+    thumbnail_url = photo.get_thumbnail_url() or photo.get_secure_url()
 
-    alt_text = f"Foto: {photo.description or photo.media_file.original_filename}"
+    alt_text = f"Foto: {photo.description or photo.original_filename}"
 
     return format_html(
         '<img src="{}" alt="{}" class="{}" loading="lazy">',
@@ -323,17 +327,17 @@ def photo_modal_trigger(photo, trigger_text="Ver foto", css_class=""):
     Returns:
         HTML for modal trigger button
     """
-    if not photo or not hasattr(photo, 'media_file'):
+    if not photo:
         return ""
 
     # Get photo data for modal
-    photo_url = f"{settings.MEDIA_URL}{photo.media_file.file.name}"
+    photo_url = photo.get_secure_url()
 
     dimensions = ""
-    if photo.media_file.width and photo.media_file.height:
-        dimensions = f"{photo.media_file.width}x{photo.media_file.height}"
+    if photo.width and photo.height:
+        dimensions = f"{photo.width}x{photo.height}"
 
-    file_size = format_file_size(photo.media_file.file_size) if photo.media_file.file_size else ""
+    file_size = format_file_size(photo.file_size) if photo.file_size else ""
 
     created_date = photo.event_datetime.strftime("%d/%m/%Y %H:%M") if photo.event_datetime else ""
     author = photo.created_by.get_full_name() if photo.created_by else ""
@@ -351,7 +355,7 @@ def photo_modal_trigger(photo, trigger_text="Ver foto", css_class=""):
         photo.id,
         photo_url,
         photo.description or "Foto",
-        photo.media_file.original_filename,
+        photo.original_filename,
         file_size,
         dimensions,
         created_date,
@@ -372,21 +376,21 @@ def photo_metadata(photo, show_technical=True):
     Returns:
         Context for photo metadata template
     """
-    if not photo or not hasattr(photo, 'media_file'):
+    if not photo:
         return {}
 
     metadata = {
         'photo': photo,
-        'media_file': photo.media_file,
+        'media_file': photo,
         'show_technical': show_technical,
-        'file_size': format_file_size(photo.media_file.file_size) if photo.media_file.file_size else None,
+        'file_size': format_file_size(photo.file_size) if photo.file_size else None,
         'dimensions': None,
         'created_date': photo.event_datetime.strftime("%d/%m/%Y %H:%M") if photo.event_datetime else None,
         'author': photo.created_by.get_full_name() if photo.created_by else None,
     }
 
-    if photo.media_file.width and photo.media_file.height:
-        metadata['dimensions'] = f"{photo.media_file.width}x{photo.media_file.height}"
+    if photo.width and photo.height:
+        metadata['dimensions'] = f"{photo.width}x{photo.height}"
 
     return metadata
 
@@ -402,10 +406,10 @@ def photo_file_size(photo):
     Returns:
         Formatted file size string
     """
-    if not photo or not hasattr(photo, 'media_file') or not photo.media_file.file_size:
+    if not photo or not photo.file_size:
         return ""
 
-    return format_file_size(photo.media_file.file_size)
+    return format_file_size(photo.file_size)
 
 
 # PhotoSeries-specific template tags (Step 3.7)
@@ -449,21 +453,15 @@ def photoseries_thumbnail(series, css_class=""):
     if not series:
         return ""
 
-    primary_thumbnail = series.get_primary_thumbnail()
-    if not primary_thumbnail:
+    # Served from the denormalized cover, no query needed
+    thumbnail_url = series.get_primary_thumbnail()
+    if not thumbnail_url:
         # Fallback to placeholder
         return format_html(
             '<div class="photoseries-thumbnail-placeholder {}"><i class="bi bi-images"></i></div>',
             css_class
         )
 
-    # Get thumbnail URL
-    if hasattr(primary_thumbnail, 'thumbnail_path') and primary_thumbnail.thumbnail_path:
-        thumbnail_url = f"{settings.MEDIA_URL}{primary_thumbnail.thumbnail_path}"
-    else:
-        # Fallback to original file
-        thumbnail_url = f"{settings.MEDIA_URL}{primary_thumbnail.file.name}"
-
     alt_text = f"Série de fotos: {series.description or 'Sem descrição'}"
     all_classes = f"photoseries-thumbnail {css_class}".strip()
 
@@ -582,7 +580,7 @@ def photoseries_photo_position(photo, series):
     Get position of photo in PhotoSeries.
 
     Args:
-        photo: MediaFile instance
+        photo: PhotoSeriesFile instance
         series: PhotoSeries instance
 
     Returns:
@@ -591,15 +589,10 @@ def photoseries_photo_position(photo, series):
     if not photo or not series:
         return ""
 
-    try:
-        from ..models import PhotoSeriesFile
-        series_file = PhotoSeriesFile.objects.get(
-            photo_series=series,
-            media_file=photo
-        )
-        return series_file.order
-    except PhotoSeriesFile.DoesNotExist:
-        return ""
+    # Photos carry their own order; no lookup needed
+    if getattr(photo, 'photo_series_id', None) == series.pk:
+        return photo.order
+    return ""
 
 
 @register.simple_tag
@@ -634,11 +627,7 @@ def photoseries_total_size(series):
     if not series:
         return ""
 
-    total_bytes = 0
-    for photo in series.get_ordered_photos():
-        if photo.file_size:
-            total_bytes += photo.file_size
-
+    total_bytes = series.total_bytes
     return format_file_size(total_bytes) if total_bytes > 0 else ""
 
 
@@ -659,7 +648,7 @@ def video_player(videoclip, controls=True, autoplay=False, muted=False, css_clas
     Returns:
         HTML for video player
     """
-    if not videoclip or not hasattr(videoclip, 'media_file'):
+    if not videoclip:
         return ""
 
     from django.urls import reverse
@@ -673,10 +662,9 @@ def video_player(videoclip, controls=True, autoplay=False, muted=False, css_clas
     all_classes = f"video-player {css_class}".strip()
 
     poster_attr = ""
-    if hasattr(videoclip.media_file, 'get_thumbnail_url'):
-        poster_url = videoclip.media_file.get_thumbnail_url()
-        if poster_url:
-            poster_attr = f'poster="{poster_url}"'
+    poster_url = videoclip.get_thumbnail()
+    if poster_url:
+        poster_attr = format_html('poster="{}"', poster_url)
 
     return format_html(
         '''<video class="{}" {} {} {} {} preload="metadata" data-video-id="{}">
@@ -690,7 +678,7 @@ def video_player(videoclip, controls=True, autoplay=False, muted=False, css_clas
         poster_attr,
         videoclip.id,
         video_url,
-        videoclip.media_file.mime_type or 'video/mp4'
+        getattr(videoclip, 'mime_type', None) or 'video/mp4'
     )
 
 
@@ -707,7 +695,7 @@ def video_thumbnail(videoclip, size="medium", css_class=""):
     Returns:
         HTML for video thumbnail display
     """
-    if not videoclip or not hasattr(videoclip, 'media_file'):
+    if not videoclip:
         return ""
 
     # Size mappings for videos
@@ -721,9 +709,7 @@ def video_thumbnail(videoclip, size="medium", css_class=""):
     all_classes = f"video-thumbnail {size_class} {css_class}".strip()
 
     # Get thumbnail URL
-    thumbnail_url = ""
-    if hasattr(videoclip.media_file, 'get_thumbnail_url'):
-        thumbnail_url = videoclip.media_file.get_thumbnail_url()
+    thumbnail_url = videoclip.get_thumbnail()
 
     if not thumbnail_url:
         # Fallback to placeholder
@@ -732,12 +718,12 @@ def video_thumbnail(videoclip, size="medium", css_class=""):
             all_classes
         )
 
-    alt_text = f"Vídeo: {videoclip.description or videoclip.media_file.original_filename}"
+    alt_text = f"Vídeo: {videoclip.description or videoclip.original_filename}"
 
     # Duration badge
     duration_badge = ""
-    if videoclip.media_file.duration:
-        duration_display = format_duration(videoclip.media_file.duration)
+    if videoclip.duration:
+        duration_display = format_duration(videoclip.duration)
         duration_badge = format_html(
             '<div class="video-duration-overlay"><div class="video-duration-badge"><i class="bi bi-clock me-1"></i>{}</div></div>',
             duration_display
@@ -771,10 +757,10 @@ def video_duration(videoclip):
     Returns:
         Formatted duration string
     """
-    if not videoclip or not hasattr(videoclip, 'media_file') or not videoclip.media_file.duration:
+    if not videoclip or not videoclip.duration:
         return ""
 
-    return format_duration(videoclip.media_file.duration)
+    return format_duration(videoclip.duration)
 
 
 @register.simple_tag
@@ -790,7 +776,7 @@ def video_modal_trigger(videoclip, trigger_text="Reproduzir vídeo", css_class="
     Returns:
         HTML for modal trigger button
     """
-    if not videoclip or not hasattr(videoclip, 'media_file'):
+    if not videoclip:
         return ""
 
     from django.urls import reverse
@@ -799,10 +785,10 @@ def video_modal_trigger(videoclip, trigger_text="Reproduzir vídeo", css_class="
     video_url = reverse('mediafiles:videoclip_stream', kwargs={'pk': videoclip.pk})
 
     duration_display = ""
-    if videoclip.media_file.duration:
-        duration_display = format_duration(videoclip.media_file.duration)
+    if videoclip.duration:
+        duration_display = format_duration(videoclip.duration)
 
-    file_size = format_file_size(videoclip.media_file.file_size) if videoclip.media_file.file_size else ""
+    file_size = format_file_size(videoclip.file_size) if videoclip.file_size else ""
 
     created_date = videoclip.event_datetime.strftime("%d/%m/%Y %H:%M") if videoclip.event_datetime else ""
     author = videoclip.created_by.get_full_name() if videoclip.created_by else ""
@@ -820,7 +806,7 @@ def video_modal_trigger(videoclip, trigger_text="Reproduzir vídeo", css_class="
         videoclip.id,
         video_url,
         videoclip.description or "Vídeo",
-        videoclip.media_file.original_filename,
+        videoclip.original_filename,
         file_size,
         duration_display,
         created_date,
@@ -841,20 +827,20 @@ def video_metadata(videoclip, show_technical=True):
     Returns:
         Context for video metadata template
     """
-    if not videoclip or not hasattr(videoclip, 'media_file'):
+    if not videoclip:
         return {}
 
     metadata = {
         'videoclip': videoclip,
-        'media_file': videoclip.media_file,
+        'media_file': videoclip,
         'show_technical': show_technical,
-        'file_size': format_file_size(videoclip.media_file.file_size) if videoclip.media_file.file_size else None,
-        'duration': format_duration(videoclip.media_file.duration) if videoclip.media_file.duration else None,
+        'file_size': format_file_size(videoclip.file_size) if videoclip.file_size else None,
+        'duration': format_duration(videoclip.duration) if videoclip.duration else None,
         'created_date': videoclip.event_datetime.strftime("%d/%m/%Y %H:%M") if videoclip.event_datetime else None,
         'author': videoclip.created_by.get_full_name() if videoclip.created_by else None,
-        'codec': videoclip.media_file.video_codec if hasattr(videoclip.media_file, 'video_codec') else None,
-        'fps': videoclip.media_file.fps if hasattr(videoclip.media_file, 'fps') else None,
-        'bitrate': videoclip.media_file.video_bitrate if hasattr(videoclip.media_file, 'video_bitrate') else None,
+        'codec': getattr(videoclip, 'video_codec', None),
+        'fps': getattr(videoclip, 'fps', None),
+        'bitrate': getattr(videoclip, 'video_bitrate', None),
     }
 
     return metadata
@@ -871,10 +857,10 @@ def video_file_size(videoclip):
     Returns:
         Formatted file size string
     """
-    if not videoclip or not hasattr(videoclip, 'media_file') or not videoclip.media_file.file_size:
+    if not videoclip or not videoclip.file_size:
         return ""
 
-    return format_file_size(videoclip.media_file.file_size)
+    return format_file_size(videoclip.file_size)
 
 
 @register.simple_tag
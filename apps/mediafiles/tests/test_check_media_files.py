@@ -0,0 +1,148 @@
+# MediaFiles Integrity Scanner Tests
+# Tests for the check_media_files management command
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from io import StringIO
+from pathlib import Path
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from apps.mediafiles.models import MediaFile, Photo, PhotoSeries, PhotoSeriesFile, VideoClip
+from apps.patients.models import Patient
+
+User = get_user_model()
+
+
+class CheckMediaFilesTests(TestCase):
+    """Tests for batched, resumable media integrity checks"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.directory = Path(self.media_root) / 'photos' / '2024' / '01' / 'originals'
+        self.directory.mkdir(parents=True)
+        self.report_path = os.path.join(self.media_root, 'report.json')
+        self.checkpoint_path = os.path.join(self.media_root, 'checkpoint.json')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _create_media_file(self, name, content=b'\x00' * 16, stored_hash=None):
+        if content is not None:
+            (self.directory / name).write_bytes(content)
+        media_file = MediaFile(
+            file=f'photos/2024/01/originals/{name}',
+            original_filename=name,
+            file_hash=stored_hash or hashlib.sha256(content or name.encode()).hexdigest(),
+            file_size=16,
+            mime_type='video/mp4',
+        )
+        # bulk_create skips save-time hashing and thumbnail generation
+        MediaFile.objects.bulk_create([media_file])
+        return media_file
+
+    def _read_report(self):
+        with open(self.report_path) as f:
+            return json.load(f)
+
+    def test_report_lists_missing_corrupt_and_orphaned_files(self):
+        """Test the JSON report covers every finding category"""
+        self._create_media_file('ok.mp4')
+        missing = self._create_media_file('missing.mp4', content=None)
+        corrupt = self._create_media_file('corrupt.mp4', stored_hash='0' * 64)
+        (self.directory / 'stray.mp4').write_bytes(b'\x01')
+
+        call_command(
+            'check_media_files', '--verify-hash', '--scan-orphans', '--workers', '2',
+            '--chunk-size', '2', '--report', self.report_path, stdout=StringIO(),
+        )
+
+        report = self._read_report()
+        self.assertEqual(report['summary']['checked'], 3)
+        self.assertEqual([f['id'] for f in report['missing']], [str(missing.id)])
+        self.assertEqual([f['id'] for f in report['corrupt']], [str(corrupt.id)])
+        self.assertEqual(report['orphaned_files'], ['photos/2024/01/originals/stray.mp4'])
+
+    def _write_media(self, relative_path):
+        path = Path(self.media_root) / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'\x00' * 16)
+
+    def test_filepond_uploads_are_not_orphaned(self):
+        """Test Photo, PhotoSeriesFile and VideoClip files are found by file_id"""
+        user = User.objects.create_user(username='scanner', password='testpass123')
+        patient = Patient.objects.create(
+            name='Test Patient', birthday='1990-01-01', created_by=user, updated_by=user
+        )
+        event_fields = {
+            'patient': patient, 'description': 'Teste', 'event_datetime': timezone.now(),
+            'created_by': user, 'updated_by': user,
+        }
+        photo_id, series_file_id, video_id = (str(uuid.uuid4()) for _ in range(3))
+        Photo.objects.create(
+            file_id=photo_id, original_filename='ferida.jpg',
+            thumbnail_path=f'photos/2024/01/thumbnails/{photo_id}_thumb.jpg', **event_fields
+        )
+        series = PhotoSeries.objects.create(**event_fields)
+        PhotoSeriesFile.objects.create(
+            photo_series=series, file_id=series_file_id, original_filename='serie.JPG', order=1,
+            thumbnail_path=f'photo_series/2024/01/thumbnails/{series_file_id}_thumb.jpg',
+        )
+        VideoClip.objects.create(file_id=video_id, original_filename='marcha.mov', **event_fields)
+        for relative_path in (
+            f'photos/2024/01/originals/{photo_id}.jpg',
+            f'photos/2024/01/thumbnails/{photo_id}_thumb.jpg',
+            f'photo_series/2024/01/originals/{series_file_id}.jpg',
+            f'photo_series/2024/01/thumbnails/{series_file_id}_thumb.jpg',
+            f'videos/2024/01/originals/{video_id}.mov',
+            f'videos/2024/01/thumbnails/{video_id}_thumb.jpg',
+            'videos/2024/01/originals/stray.mov',
+        ):
+            self._write_media(relative_path)
+
+        call_command(
+            'check_media_files', '--scan-orphans', '--report', self.report_path, stdout=StringIO(),
+        )
+
+        self.assertEqual(self._read_report()['orphaned_files'], ['videos/2024/01/originals/stray.mov'])
+
+    def test_resume_skips_checked_records(self):
+        """Test a saved checkpoint restores progress and findings"""
+        first, second = sorted(
+            [self._create_media_file('a.mp4', content=None),
+             self._create_media_file('b.mp4', content=None)],
+            key=lambda media_file: str(media_file.pk),
+        )
+        with open(self.checkpoint_path, 'w') as f:
+            json.dump({
+                'last_pk': str(first.pk),
+                'checked': 1,
+                'findings': {
+                    'missing': [{'id': str(first.pk), 'original_filename': 'a.mp4',
+                                 'file': first.file.name, 'issues': ['missing_original']}],
+                    'broken': [], 'corrupt': [], 'orphaned_thumbnails': [],
+                },
+            }, f)
+
+        call_command(
+            'check_media_files', '--checkpoint', self.checkpoint_path, '--resume',
+            '--report', self.report_path, stdout=StringIO(),
+        )
+
+        report = self._read_report()
+        self.assertEqual(report['summary']['checked'], 2)
+        self.assertEqual(
+            [finding['id'] for finding in report['missing']],
+            [str(first.pk), str(second.pk)],
+        )
+        self.assertFalse(os.path.exists(self.checkpoint_path))
@@ -0,0 +1,128 @@
+# MediaFiles EXIF Metadata Tests
+# Tests for compact EXIF extraction, orientation handling and the slimming backfill
+
+import hashlib
+import io
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from PIL import Image
+from apps.mediafiles.image_processor import ImageProcessor
+from apps.mediafiles.models import MediaFile
+from apps.mediafiles.utils import (
+    EXIF_DATETIME_ORIGINAL,
+    EXIF_IFD_POINTER,
+    EXIF_MAKE,
+    EXIF_MODEL,
+    EXIF_ORIENTATION,
+    extract_exif_summary,
+    summarize_legacy_exif,
+)
+
+
+def make_exif_jpeg(size=(200, 100), orientation=6):
+    """Return JPEG bytes carrying a few EXIF tags."""
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    exif[EXIF_MAKE] = 'Acme\x00'
+    exif[EXIF_MODEL] = 'Phone 12'
+    exif.get_ifd(EXIF_IFD_POINTER)[EXIF_DATETIME_ORIGINAL] = '2024:03:05 14:30:00'
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+class ExifSummaryTests(SimpleTestCase):
+    """Tests for the whitelisted EXIF schema"""
+
+    def test_extract_exif_summary(self):
+        """Test only typed, whitelisted fields are kept"""
+        with Image.open(io.BytesIO(make_exif_jpeg())) as img:
+            summary = extract_exif_summary(img)
+
+        self.assertEqual(summary, {
+            'orientation': 6,
+            'captured_at': '2024-03-05T14:30:00',
+            'make': 'Acme',
+            'model': 'Phone 12',
+        })
+
+    def test_summarize_legacy_exif(self):
+        """Test legacy tag-id keyed strings convert to the same schema"""
+        legacy = {
+            '274': '6',
+            '271': 'Acme',
+            '306': '2024:03:05 14:30:00',
+            '40962': '4032',
+            '40963': '3024',
+            '37500': 'maker note noise',
+            '36867': '0000:00:00 00:00:00',
+        }
+
+        self.assertEqual(summarize_legacy_exif(legacy), {
+            'orientation': 6,
+            'captured_at': '2024-03-05T14:30:00',
+            'make': 'Acme',
+            'width': 4032,
+            'height': 3024,
+        })
+
+    def test_thumbnail_applies_orientation(self):
+        """Test rotated photos produce upright thumbnails"""
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        image_path = directory / 'rotated.jpg'
+        image_path.write_bytes(make_exif_jpeg(size=(200, 100), orientation=6))
+        thumbnail_path = directory / 'rotated_thumb.jpg'
+
+        self.assertTrue(ImageProcessor.generate_thumbnail(str(image_path), str(thumbnail_path)))
+
+        with Image.open(thumbnail_path) as thumbnail:
+            self.assertEqual(thumbnail.size, (100, 200))
+
+
+class MediaFileMetadataTests(TestCase):
+    """Tests for metadata storage on MediaFile"""
+
+    def _create_media_file(self, metadata):
+        media_file = MediaFile(
+            file='photos/2024/01/originals/photo.jpg',
+            original_filename='photo.jpg',
+            file_hash=hashlib.sha256(str(metadata).encode()).hexdigest(),
+            file_size=1024,
+            mime_type='image/jpeg',
+            metadata=metadata,
+        )
+        # bulk_create skips save-time hashing and thumbnail generation
+        MediaFile.objects.bulk_create([media_file])
+        return media_file
+
+    def test_metadata_deferred_by_default(self):
+        """Test the metadata JSON is not loaded with MediaFile rows"""
+        media_file = self._create_media_file({'exif': {'orientation': 1}})
+
+        loaded = MediaFile.objects.get(pk=media_file.pk)
+
+        self.assertEqual(loaded.get_deferred_fields(), {'metadata'})
+        self.assertEqual(loaded.metadata, {'exif': {'orientation': 1}})
+
+    def test_slim_media_metadata_command(self):
+        """Test the backfill rewrites legacy EXIF and leaves compact rows alone"""
+        legacy = self._create_media_file({'exif': {'274': '3', '37500': 'noise'}, 'other': 1})
+        noise_only = self._create_media_file({'exif': {'37500': 'noise'}})
+        compact = self._create_media_file({'exif': {'orientation': 8}})
+
+        call_command('slim_media_metadata', stdout=StringIO())
+        self.assertIn('274', MediaFile.objects.get(pk=legacy.pk).metadata['exif'])
+
+        call_command('slim_media_metadata', '--fix', '--chunk-size', '1', stdout=StringIO())
+
+        self.assertEqual(
+            MediaFile.objects.get(pk=legacy.pk).metadata,
+            {'exif': {'orientation': 3}, 'other': 1},
+        )
+        self.assertEqual(MediaFile.objects.get(pk=noise_only.pk).metadata, {})
+        self.assertEqual(MediaFile.objects.get(pk=compact.pk).metadata, {'exif': {'orientation': 8}})
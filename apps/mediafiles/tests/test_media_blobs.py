@@ -0,0 +1,103 @@
+# MediaFiles Blob Store Tests
+# Tests for content-addressed storage, reference counting and blob GC
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import Mock, patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from apps.mediafiles.models import MediaBlob, MediaFile
+
+
+class MediaBlobTests(TestCase):
+    """Tests for shared blob storage of identical uploads"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        test_image_path = os.path.join(os.path.dirname(__file__), 'test_media', 'small_image.jpg')
+        with open(test_image_path, 'rb') as f:
+            self.image_content = f.read()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _upload(self, name='photo.jpg'):
+        upload = SimpleUploadedFile(name, self.image_content, content_type='image/jpeg')
+        return MediaFile.objects.create_from_upload(upload)
+
+    def _blob_files(self):
+        return sorted(Path(self.media_root, 'blobs').rglob('*.jpg'))
+
+    def test_identical_uploads_share_one_blob(self):
+        """Test duplicates get their own rows but are stored once"""
+        first = self._upload('a.jpg')
+        second = self._upload('b.jpg')
+
+        self.assertNotEqual(first.pk, second.pk)
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(MediaBlob.objects.get().ref_count, 2)
+        self.assertEqual(len(self._blob_files()), 1)
+        self.assertTrue(second.get_file_path().is_file())
+
+    def test_delete_releases_reference(self):
+        """Test deleting one duplicate leaves the shared content in place"""
+        first = self._upload('a.jpg')
+        second = self._upload('b.jpg')
+
+        first.delete()
+
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+        self.assertTrue(second.get_file_path().is_file())
+
+    def test_gc_collects_unreferenced_blobs(self):
+        """Test GC removes blobs only once nothing references them"""
+        first = self._upload('a.jpg')
+        second = self._upload('b.jpg')
+
+        # Bulk deletes skip delete(), GC recounts from the MediaFile table
+        MediaFile.objects.filter(pk=first.pk).delete()
+        call_command('gc_media_blobs', '--fix', '--grace-hours', '0', stdout=StringIO())
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+        self.assertEqual(len(self._blob_files()), 1)
+
+        second.delete()
+        call_command('gc_media_blobs', '--fix', '--grace-hours', '0', stdout=StringIO())
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertEqual(self._blob_files(), [])
+
+    def test_video_thumbnail_leaves_no_stray_blob_files(self):
+        """Test the intermediate ffmpeg frame is not written under blob storage"""
+        # Video uploads need ffprobe to validate; a blob-backed row treated as
+        # video exercises the same thumbnail path
+        video = self._upload('clip.jpg')
+        video.mime_type = 'video/mp4'
+        video.thumbnail = None
+
+        def fake_popen(args, **kwargs):
+            # Stand in for the ffmpeg binary: write the requested output frame
+            Path(args[args.index('-y') - 1]).write_bytes(self.image_content)
+            process = Mock(returncode=0)
+            process.communicate.return_value = (b'', b'')
+            process.poll.return_value = 0
+            return process
+
+        with patch('ffmpeg._run.subprocess.Popen', side_effect=fake_popen):
+            video.generate_video_thumbnail()
+
+        self.assertNotIn('video_thumbnail_error', video.metadata)
+        self.assertTrue(video.thumbnail)
+        self.assertNotIn('blobs/', video.thumbnail.name)
+
+        out = StringIO()
+        call_command('gc_media_blobs', stdout=out)
+        self.assertIn('Files in blob storage without a record: 0', out.getvalue())
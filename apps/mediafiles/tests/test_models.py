@@ -1051,8 +1051,10 @@ class MediaFileSecurityTests(TestCase):
         media_file1 = MediaFile.objects.create_from_upload(uploaded_file1)
         media_file2 = MediaFile.objects.create_from_upload(uploaded_file2)
 
-        # Should be the same object due to deduplication
-        self.assertEqual(media_file1.id, media_file2.id)
+        # Each upload gets its own row, the content is stored once
+        self.assertNotEqual(media_file1.id, media_file2.id)
+        self.assertEqual(media_file1.blob_id, media_file2.blob_id)
+        self.assertEqual(media_file1.file.name, media_file2.file.name)
 
     def test_secure_filename_generation(self):
         """Test that filenames are securely generated"""
@@ -1069,10 +1071,8 @@ class MediaFileSecurityTests(TestCase):
         self.assertNotIn('etc', media_file.file.name)
         self.assertNotIn('passwd', media_file.file.name)
 
-        # Should contain UUID pattern
-        import re
-        uuid_pattern = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
-        self.assertTrue(re.search(uuid_pattern, media_file.file.name))
+        # Should be named by content hash
+        self.assertIn(media_file.file_hash, media_file.file.name)
 
     def test_file_extension_validation(self):
         """Test file extension validation"""
@@ -1510,7 +1510,7 @@ class MediaFileVideoMethodsTests(TestCase):
             }
         }
 
-        with patch('ffmpeg.probe', return_value=mock_probe_result):
+        with patch('apps.mediafiles.probe.run_ffprobe', return_value=mock_probe_result):
             video_file.extract_video_metadata()
 
             self.assertEqual(video_file.duration, 60)
@@ -0,0 +1,161 @@
+# MediaFiles PhotoSeries Batch Upload Tests
+# Tests for validated, parallel-processed, bulk-inserted series uploads
+
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import skipIf
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from apps.mediafiles import image_processor
+from apps.mediafiles.image_processor import ImageProcessor
+from apps.mediafiles.models import PhotoSeries, PhotoSeriesFile
+from apps.patients.models import Patient
+
+User = get_user_model()
+
+
+def make_jpeg(name, size=(640, 480), color=(200, 30, 30)):
+    """Return an uploaded JPEG generated with Pillow."""
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class PhotoSeriesBatchUploadTests(TestCase):
+    """Tests for PhotoSeries.add_photos_batch"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_BATCH_WORKERS=2)
+        self.settings_override.enable()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.patient = Patient.objects.create(
+            name='Test Patient',
+            birthday='1990-01-01',
+            created_by=self.user,
+            updated_by=self.user
+        )
+        self.series = PhotoSeries.objects.create(
+            patient=self.patient,
+            description='Evolução da ferida',
+            event_datetime=timezone.now(),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_batch_creates_rows_with_one_insert(self):
+        """Test photos are processed and inserted in one statement"""
+        files = [make_jpeg(f'photo_{i}.jpg', color=(i * 40, 0, 0)) for i in range(4)]
+
+        with CaptureQueriesContext(connection) as queries:
+            photos = self.series.add_photos_batch(files)
+
+        inserts = [q['sql'] for q in queries if q['sql'].startswith('INSERT INTO "mediafiles_photoseriesfile"')]
+        self.assertEqual(len(inserts), 1)
+
+        self.assertEqual([photo.order for photo in photos], [1, 2, 3, 4])
+        self.assertEqual(photos[0].original_filename, 'photo_0.jpg')
+        self.assertEqual((photos[0].width, photos[0].height), (640, 480))
+        for photo in photos:
+            self.assertTrue(Path(self.media_root, photo.thumbnail_path).is_file())
+
+        self.series.refresh_from_db()
+        self.assertEqual(self.series.photo_count, 4)
+        self.assertEqual(self.series.cover_file_id, photos[0].file_id)
+
+    def test_batch_appends_after_existing_photos(self):
+        """Test a second batch continues the series order"""
+        self.series.add_photos_batch([make_jpeg('first.jpg')])
+        photos = self.series.add_photos_batch([make_jpeg('second.jpg'), make_jpeg('third.jpg')])
+
+        self.assertEqual([photo.order for photo in photos], [2, 3])
+        self.assertEqual(self.series.photo_count, 3)
+
+    def test_invalid_file_rejects_whole_batch(self):
+        """Test nothing is stored when any file fails validation"""
+        files = [
+            make_jpeg('good.jpg'),
+            SimpleUploadedFile('bad.jpg', b'not an image', content_type='image/jpeg'),
+        ]
+
+        with self.assertRaises(ValidationError):
+            self.series.add_photos_batch(files)
+
+        self.assertFalse(PhotoSeriesFile.objects.exists())
+        self.assertEqual(list(Path(self.media_root).rglob('*.jpg')), [])
+
+    def test_undecodable_image_rejects_whole_batch(self):
+        """Test a file that passes header checks but cannot be decoded"""
+        files = [
+            make_jpeg('good.jpg'),
+            SimpleUploadedFile('broken.jpg', b'\xff\xd8\xff' + b'\x00' * 64, content_type='image/jpeg'),
+        ]
+
+        with self.assertRaises(ValidationError):
+            self.series.add_photos_batch(files)
+
+        self.assertFalse(PhotoSeriesFile.objects.exists())
+        self.assertEqual(list(Path(self.media_root).rglob('*.jpg')), [])
+
+
+class ImageProcessorBatchTests(TestCase):
+    """Tests for ImageProcessor.process_batch"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_pool_and_serial_results_match(self):
+        """Test the process pool returns the same results as inline processing"""
+        jobs = []
+        for i in range(3):
+            image_path = self.directory / f'{i}.png'
+            Image.new('RGB', (100 + i, 50), 'white').save(image_path)
+            jobs.append((image_path, self.directory / f'{i}_thumb.jpg'))
+
+        pooled = ImageProcessor.process_batch(jobs, max_workers=2)
+        serial = ImageProcessor.process_batch(jobs, max_workers=1)
+
+        self.assertEqual(pooled, serial)
+        self.assertEqual([metadata['width'] for metadata, _ in pooled], [100, 101, 102])
+        self.assertTrue(all(created for _, created in pooled))
+
+    @skipIf((os.cpu_count() or 1) < 2, "needs more than one CPU for a pool")
+    def test_pool_is_reused_across_batches(self):
+        """Test batches share one process pool instead of starting their own"""
+        jobs = []
+        for i in range(2):
+            image_path = self.directory / f'{i}.png'
+            Image.new('RGB', (80, 60), 'white').save(image_path)
+            jobs.append((image_path, self.directory / f'{i}_thumb.jpg'))
+
+        with patch.object(
+            image_processor, 'ProcessPoolExecutor', wraps=image_processor.ProcessPoolExecutor
+        ) as pool_class:
+            ImageProcessor.process_batch(jobs, max_workers=2)
+            ImageProcessor.process_batch(jobs, max_workers=2)
+
+        self.assertLessEqual(pool_class.call_count, 1)
+        self.assertEqual(image_processor._pool_key, (os.getpid(), 2))
@@ -0,0 +1,207 @@
+# MediaFiles PhotoSeries Summary Tests
+# Tests for denormalized series summary fields and bulk photo prefetching
+
+import json
+import shutil
+import tempfile
+import uuid
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from apps.events.models import Event
+from apps.mediafiles.models import PhotoSeries, PhotoSeriesFile
+from apps.mediafiles.prefetch import prefetch_series_photos
+from apps.mediafiles.templatetags.mediafiles_tags import (
+    photoseries_count,
+    photoseries_photo_position,
+    photoseries_thumbnail,
+    photoseries_total_size,
+)
+from apps.patients.models import Patient
+
+User = get_user_model()
+
+
+class PhotoSeriesSummaryTests(TestCase):
+    """Tests for PhotoSeries summary maintenance"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.patient = Patient.objects.create(
+            name='Test Patient',
+            birthday='1990-01-01',
+            created_by=self.user,
+            updated_by=self.user
+        )
+
+    def _create_series(self, photo_sizes):
+        series = PhotoSeries.objects.create(
+            patient=self.patient,
+            description='Série de teste',
+            event_datetime=timezone.now(),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        for order, size in enumerate(photo_sizes, start=1):
+            PhotoSeriesFile.objects.create(
+                photo_series=series,
+                file_id=str(uuid.uuid4()),
+                original_filename=f'photo{order}.jpg',
+                file_size=size,
+                thumbnail_path=f'photo_series/2024/01/thumbnails/{order}_thumb.jpg',
+                order=order,
+            )
+        series.refresh_summary()
+        return series
+
+    def test_refresh_summary(self):
+        """Test count, total size and cover are recomputed"""
+        series = self._create_series([1000, 2000, 3000])
+
+        series = PhotoSeries.objects.get(pk=series.pk)
+        self.assertEqual(series.photo_count, 3)
+        self.assertEqual(series.total_bytes, 6000)
+        self.assertEqual(series.cover_file_id, series.get_photos()[0].file_id)
+
+        # Removing the cover photo moves the cover to the next one
+        second_photo = series.photoseriesfile_set.get(order=2)
+        series.photoseriesfile_set.get(order=1).delete()
+        series.refresh_summary()
+        self.assertEqual(series.photo_count, 2)
+        self.assertEqual(series.cover_file_id, second_photo.file_id)
+
+    def test_card_tags_use_summary(self):
+        """Test series card tags render without queries"""
+        series = PhotoSeries.objects.get(pk=self._create_series([1024, 1024]).pk)
+        cover, photo = series.get_photos()
+
+        with self.assertNumQueries(0):
+            self.assertIn('2 fotos', photoseries_count(series))
+            self.assertIn(cover.file_id, photoseries_thumbnail(series))
+            self.assertEqual(photoseries_total_size(series), '2.0 KB')
+            self.assertEqual(photoseries_photo_position(photo, series), 2)
+
+    def test_prefetch_series_photos(self):
+        """Test ordered photos for a page of series are loaded in one query"""
+        for _ in range(3):
+            self._create_series([10, 20])
+
+        events = list(Event.objects.filter(patient=self.patient).select_subclasses())
+        with self.assertNumQueries(1):
+            prefetch_series_photos(events)
+
+        with self.assertNumQueries(0):
+            for series in events:
+                photos = series.get_photos()
+                self.assertEqual([photo.order for photo in photos], [1, 2])
+                self.assertEqual(photos.first().order, 1)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class PhotoSeriesEditSummaryTests(TestCase):
+    """Tests for the summary after photos are removed or reordered"""
+
+    def setUp(self):
+        """Set up a series of three photos with files on disk"""
+        self.addCleanup(shutil.rmtree, settings.MEDIA_ROOT, ignore_errors=True)
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            password_change_required=False,
+            terms_accepted=True,
+        )
+        self.client.force_login(self.user)
+        patient = Patient.objects.create(
+            name='Test Patient',
+            birthday='1990-01-01',
+            created_by=self.user,
+            updated_by=self.user
+        )
+        self.series = PhotoSeries.objects.create(
+            patient=patient,
+            description='Série de teste',
+            event_datetime=timezone.now(),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        originals_dir = self.series.get_storage_directory('originals')
+        originals_dir.mkdir(parents=True)
+        self.photos = []
+        for order, size in enumerate([1000, 2000, 3000], start=1):
+            file_id = str(uuid.uuid4())
+            (originals_dir / f'{file_id}.jpg').write_bytes(b'x' * size)
+            self.photos.append(PhotoSeriesFile.objects.create(
+                photo_series=self.series,
+                file_id=file_id,
+                original_filename=f'photo{order}.jpg',
+                file_size=size,
+                thumbnail_path=f'photo_series/2024/01/thumbnails/{order}_thumb.jpg',
+                order=order,
+            ))
+        self.series.refresh_summary()
+
+    def _summary(self):
+        series = PhotoSeries.objects.get(pk=self.series.pk)
+        return series.photo_count, series.total_bytes, series.cover_file_id
+
+    def test_remove_photo_updates_summary_and_deletes_file(self):
+        cover, second, _ = self.photos
+        url = reverse('mediafiles:photoseries_remove_photo', kwargs={'pk': self.series.pk, 'photo_id': cover.pk})
+        original = self.series.get_storage_directory('originals') / f'{cover.file_id}.jpg'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
+
+        self.assertEqual(response.json(), {
+            'success': True, 'photo_count': 2, 'message': 'Photo removed successfully'
+        })
+        self.assertEqual(self._summary(), (2, 5000, second.file_id))
+        self.assertFalse(PhotoSeriesFile.objects.filter(pk=cover.pk).exists())
+        self.assertFalse(original.exists())
+
+    def test_last_photo_is_not_removed(self):
+        for photo in self.photos[1:]:
+            self.series.remove_photo(photo)
+        url = reverse(
+            'mediafiles:photoseries_remove_photo', kwargs={'pk': self.series.pk, 'photo_id': self.photos[0].pk}
+        )
+
+        self.assertEqual(self.client.post(url).status_code, 400)
+        self.assertEqual(self._summary(), (1, 1000, self.photos[0].file_id))
+
+    def test_reorder_updates_order_and_cover(self):
+        first, second, third = self.photos
+        url = reverse('mediafiles:photoseries_reorder', kwargs={'pk': self.series.pk})
+
+        response = self.client.post(
+            url, data=json.dumps({'photo_order': [str(third.pk), str(first.pk), str(second.pk)]}),
+            content_type='application/json',
+        )
+
+        self.assertEqual(
+            [(photo['photo_id'], photo['order']) for photo in response.json()['ordered_photos']],
+            [(str(third.pk), 1), (str(first.pk), 2), (str(second.pk), 3)],
+        )
+        self.assertEqual(self._summary(), (3, 6000, third.file_id))
+
+    def test_reorder_rejects_incomplete_order(self):
+        url = reverse('mediafiles:photoseries_reorder', kwargs={'pk': self.series.pk})
+
+        response = self.client.post(
+            url, data=json.dumps({'photo_order': [str(self.photos[1].pk)]}), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            list(PhotoSeriesFile.objects.filter(photo_series=self.series).values_list('order', flat=True)),
+            [1, 2, 3],
+        )
+        self.assertEqual(self._summary(), (3, 6000, self.photos[0].file_id))
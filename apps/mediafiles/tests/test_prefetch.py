@@ -0,0 +1,102 @@
+# MediaFiles Prefetch Tests
+# Tests for timeline/gallery media prefetching and query-free media tags
+
+import uuid
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from apps.events.models import Event
+from apps.mediafiles.models import Photo, PhotoSeries, PhotoSeriesFile, VideoClip
+from apps.mediafiles.prefetch import prefetch_timeline_media
+from apps.mediafiles.templatetags.mediafiles_tags import (
+    mediafiles_count_for_patient,
+    photo_file_size,
+    photo_thumbnail,
+    video_duration,
+    video_player,
+    video_thumbnail,
+)
+from apps.patients.models import Patient
+
+User = get_user_model()
+
+
+class TimelineMediaPrefetchTests(TestCase):
+    """Tests for bulk media loading on timeline pages"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.patient = Patient.objects.create(
+            name='Test Patient',
+            birthday='1990-01-01',
+            created_by=self.user,
+            updated_by=self.user
+        )
+        common = {
+            'patient': self.patient,
+            'event_datetime': timezone.now(),
+            'created_by': self.user,
+            'updated_by': self.user,
+        }
+
+        for _ in range(2):
+            Photo.objects.create(
+                description='Foto', file_id=str(uuid.uuid4()), original_filename='photo.jpg',
+                file_size=2048, thumbnail_path='photos/2024/01/thumbnails/x_thumb.jpg', **common
+            )
+        VideoClip.objects.create(
+            description='Vídeo', file_id=str(uuid.uuid4()), original_filename='clip.mp4',
+            file_size=4096, duration=75, **common
+        )
+        series = PhotoSeries.objects.create(description='Série', **common)
+        PhotoSeriesFile.objects.create(photo_series=series, file_id=str(uuid.uuid4()), order=1)
+
+    def _load_page(self):
+        return list(
+            Event.objects.filter(patient=self.patient)
+            .select_subclasses()
+            .select_related('patient', 'created_by')
+        )
+
+    def test_page_media_loaded_in_two_queries(self):
+        """Test series photos and patient media counts are loaded in bulk"""
+        events = self._load_page()
+
+        with self.assertNumQueries(2):
+            prefetch_timeline_media(events, patients=[self.patient])
+
+        self.assertEqual(mediafiles_count_for_patient(self.patient), 4)
+        self.assertEqual(mediafiles_count_for_patient(events[0].patient, 'photo'), 2)
+
+    def test_media_tags_do_not_query(self):
+        """Test media tags read preloaded data only"""
+        events = prefetch_timeline_media(self._load_page())
+
+        with self.assertNumQueries(0):
+            for event in events:
+                self.assertEqual(mediafiles_count_for_patient(event.patient, 'video'), 1)
+                if isinstance(event, Photo):
+                    self.assertIn(f'/thumbnail/{event.file_id}/', photo_thumbnail(event))
+                    self.assertEqual(photo_file_size(event), '2.0 KB')
+                elif isinstance(event, VideoClip):
+                    self.assertEqual(video_duration(event), '1:15')
+                    self.assertIn('video/mp4', video_player(event))
+                elif isinstance(event, PhotoSeries):
+                    self.assertEqual(len(event.get_photos()), 1)
+
+    def test_video_tags_use_clip_thumbnail(self):
+        """Test video tags render the thumbnail returned by VideoClip.get_thumbnail"""
+        videoclip = VideoClip.objects.get(patient=self.patient)
+
+        with patch.object(VideoClip, 'get_thumbnail', return_value='/thumbs/clip.jpg'):
+            self.assertIn('poster="/thumbs/clip.jpg"', video_player(videoclip))
+            self.assertIn('<img src="/thumbs/clip.jpg"', video_thumbnail(videoclip))
+
+        self.assertNotIn('poster=', video_player(videoclip))
+        self.assertIn('video-thumbnail-placeholder', video_thumbnail(videoclip))
@@ -0,0 +1,131 @@
+# MediaFiles Probe Tests
+# Tests for the shared, memoized ffprobe pass
+
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest.mock import patch
+import ffmpeg
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from apps.mediafiles.probe import (
+    PROBE_TIMEOUT_SECONDS,
+    VideoProbe,
+    cache_video_probe,
+    clear_video_probe_cache,
+    get_video_probe,
+    run_ffprobe,
+)
+from apps.mediafiles.utils import VideoProcessor, validate_video_file
+from apps.mediafiles.validators import VideoValidator
+
+
+PROBE_RESULT = {
+    'streams': [
+        {'codec_type': 'video', 'codec_name': 'h264', 'width': 1280, 'height': 720,
+         'duration': '12.5', 'pix_fmt': 'yuv420p', 'r_frame_rate': '30/1'},
+        {'codec_type': 'audio', 'codec_name': 'aac'},
+    ],
+    'format': {'format_name': 'mov,mp4,m4a,3gp,3g2,mj2', 'size': '1024', 'duration': '12.5'},
+}
+
+
+class VideoProbeTests(SimpleTestCase):
+    """Tests for probe memoization"""
+
+    def setUp(self):
+        """Set up test data"""
+        clear_video_probe_cache()
+        self.temp_dir = tempfile.mkdtemp()
+        self.video_path = os.path.join(self.temp_dir, 'clip.mp4')
+        with open(self.video_path, 'wb') as f:
+            f.write(b'\x00' * 1024)
+
+    def tearDown(self):
+        clear_video_probe_cache()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_probe_properties(self):
+        """Test parsed values exposed by VideoProbe"""
+        probe = VideoProbe(PROBE_RESULT)
+
+        self.assertEqual(probe.duration, 12.5)
+        self.assertEqual((probe.width, probe.height), (1280, 720))
+        self.assertEqual(probe.codec_name, 'h264')
+        self.assertEqual(probe.audio_stream['codec_name'], 'aac')
+
+    @patch('apps.mediafiles.probe.run_ffprobe', return_value=PROBE_RESULT)
+    def test_path_probe_is_memoized(self, mock_probe):
+        """Test repeated probes of an unchanged file spawn ffprobe once"""
+        get_video_probe(self.video_path)
+        get_video_probe(self.video_path)
+
+        self.assertEqual(mock_probe.call_count, 1)
+
+    @patch('apps.mediafiles.probe.run_ffprobe', return_value=PROBE_RESULT)
+    def test_modified_file_is_probed_again(self, mock_probe):
+        """Test memoization is keyed by mtime and size"""
+        get_video_probe(self.video_path)
+        with open(self.video_path, 'ab') as f:
+            f.write(b'\x00' * 16)
+        get_video_probe(self.video_path)
+
+        self.assertEqual(mock_probe.call_count, 2)
+
+    @patch('apps.mediafiles.probe.run_ffprobe', return_value=PROBE_RESULT)
+    def test_cached_upload_probe_is_reused_for_stored_file(self, mock_probe):
+        """Test a probe registered for a stored copy avoids a new ffprobe"""
+        cache_video_probe(self.video_path, VideoProbe(PROBE_RESULT))
+
+        get_video_probe(self.video_path)
+
+        mock_probe.assert_not_called()
+
+    @patch('apps.mediafiles.probe.run_ffprobe', return_value=PROBE_RESULT)
+    def test_validation_and_metadata_share_one_probe(self, mock_probe):
+        """Test upload validators and metadata extraction share one probe"""
+        upload = SimpleUploadedFile('clip.mp4', b'\x00' * 1024, content_type='video/mp4')
+
+        VideoValidator.validate_video_format(upload)
+        validate_video_file(upload)
+
+        self.assertEqual(mock_probe.call_count, 1)
+
+        processor = VideoProcessor()
+        processor.extract_metadata(self.video_path)
+        processor.validate_video_file(self.video_path)
+        processor.extract_metadata_secure(self.video_path)
+
+        self.assertEqual(mock_probe.call_count, 2)
+
+
+class RunFfprobeTests(SimpleTestCase):
+    """Tests for the ffprobe subprocess call"""
+
+    @patch('subprocess.run')
+    def test_ffprobe_runs_quietly_with_timeout(self, mock_run):
+        """Test ffprobe is quiet and bounded by the probe timeout"""
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b'{"streams": [], "format": {}}')
+
+        self.assertEqual(run_ffprobe('/tmp/clip.mp4'), {'streams': [], 'format': {}})
+
+        args = mock_run.call_args.args[0]
+        self.assertEqual(args[:3], ['ffprobe', '-v', 'quiet'])
+        self.assertEqual(args[-1], '/tmp/clip.mp4')
+        self.assertEqual(mock_run.call_args.kwargs['timeout'], PROBE_TIMEOUT_SECONDS)
+
+    @patch('subprocess.run', side_effect=subprocess.TimeoutExpired('ffprobe', PROBE_TIMEOUT_SECONDS))
+    def test_timeout_raises_ffmpeg_error(self, mock_run):
+        """Test a hung ffprobe surfaces as ffmpeg.Error"""
+        with self.assertRaises(ffmpeg.Error):
+            run_ffprobe('/tmp/clip.mp4')
+
+    @patch('subprocess.run')
+    def test_failure_raises_ffmpeg_error(self, mock_run):
+        """Test a non-zero exit surfaces as ffmpeg.Error"""
+        mock_run.return_value = subprocess.CompletedProcess([], 1, stdout=b'', stderr=b'Invalid data')
+
+        with self.assertRaises(ffmpeg.Error) as context:
+            run_ffprobe('/tmp/clip.mp4')
+        self.assertEqual(context.exception.stderr, b'Invalid data')
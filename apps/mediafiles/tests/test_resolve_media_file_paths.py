@@ -0,0 +1,78 @@
+# MediaFiles Path Resolution Tests
+# Tests for the resolve_media_file_paths management command
+
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from apps.mediafiles.models import MediaFile
+
+
+class ResolveMediaFilePathsTests(TestCase):
+    """Tests for recording legacy media file locations"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.directory = Path(self.media_root) / 'photos' / '2024' / '01' / 'originals'
+        self.directory.mkdir(parents=True)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _create_media_file(self, name, on_disk=None):
+        if on_disk:
+            (self.directory / on_disk).write_bytes(b'\x00' * 16)
+        media_file = MediaFile(
+            file=f'photos/2024/01/originals/{name}',
+            original_filename=name,
+            file_hash=name.ljust(64, '0'),
+            file_size=16,
+            mime_type='image/jpeg',
+        )
+        # bulk_create skips save-time hashing and thumbnail generation
+        MediaFile.objects.bulk_create([media_file])
+        return media_file
+
+    def test_legacy_file_is_resolved_once(self):
+        """Test a file stored under a different name is recorded with --fix"""
+        current = self._create_media_file('current.jpg', on_disk='current.jpg')
+        legacy = self._create_media_file('legacy.jpg', on_disk='0f1e2d3c.jpg')
+
+        call_command('resolve_media_file_paths', '--fix', stdout=StringIO())
+
+        current.refresh_from_db()
+        legacy.refresh_from_db()
+        self.assertEqual(current.resolved_path, '')
+        self.assertEqual(legacy.resolved_path, 'photos/2024/01/originals/0f1e2d3c.jpg')
+        self.assertTrue(legacy.get_file_path().is_file())
+
+    def test_dry_run_makes_no_changes(self):
+        """Test default mode only reports"""
+        legacy = self._create_media_file('legacy.jpg', on_disk='0f1e2d3c.jpg')
+
+        out = StringIO()
+        call_command('resolve_media_file_paths', stdout=out)
+
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.resolved_path, '')
+        self.assertIn('Newly resolved: 1', out.getvalue())
+
+    def test_ambiguous_candidates_are_not_guessed(self):
+        """Test several unclaimed candidates leave the file unresolved"""
+        legacy = self._create_media_file('legacy.jpg')
+        (self.directory / 'aaaa.jpg').write_bytes(b'\x00')
+        (self.directory / 'bbbb.jpg').write_bytes(b'\x00')
+
+        out = StringIO()
+        call_command('resolve_media_file_paths', '--fix', stdout=out)
+
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.resolved_path, '')
+        self.assertIn('ambiguous', out.getvalue())
@@ -1,8 +1,10 @@
 # MediaFiles Utility Tests
 # Tests for media file utilities
 
+import io
 import os
 import tempfile
+import zipfile
 from django.test import TestCase, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from apps.mediafiles.utils import (
@@ -12,6 +14,7 @@ from apps.mediafiles.utils import (
     validate_file_extension,
     clean_filename
 )
+from apps.mediafiles.zip_stream import ZipStreamer
 
 
 class FileUtilityTests(TestCase):
@@ -208,3 +211,64 @@ class FileStorageTests(TestCase):
         """Test file cleanup functionality"""
         # TODO: Implement when cleanup utilities are available
         pass
+
+
+class ZipStreamerTests(TestCase):
+    """Tests for the streaming ZIP builder used by PhotoSeries downloads"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.temp_dir, 'photo.jpg')
+        self.text_path = os.path.join(self.temp_dir, 'notes.txt')
+        self.image_content = os.urandom(200 * 1024)
+        self.text_content = b'wound care notes ' * 1000
+
+        with open(self.image_path, 'wb') as f:
+            f.write(self.image_content)
+        with open(self.text_path, 'wb') as f:
+            f.write(self.text_content)
+
+    def _build_archive(self, streamer):
+        return zipfile.ZipFile(io.BytesIO(b''.join(streamer.stream())))
+
+    def test_stream_produces_valid_archive(self):
+        """Test streamed bytes form a readable archive with correct CRCs"""
+        streamer = ZipStreamer(chunk_size=16 * 1024)
+        streamer.add_file(self.image_path, '01_photo.jpg')
+        streamer.add_file(self.text_path, '02_notes.txt')
+
+        with self._build_archive(streamer) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.namelist(), ['01_photo.jpg', '02_notes.txt'])
+            self.assertEqual(archive.read('01_photo.jpg'), self.image_content)
+            self.assertEqual(archive.read('02_notes.txt'), self.text_content)
+
+    def test_compressed_media_is_stored(self):
+        """Test already-compressed media is stored while other files are deflated"""
+        streamer = ZipStreamer()
+        streamer.add_file(self.image_path, 'photo.jpg')
+        streamer.add_file(self.text_path, 'notes.txt')
+
+        with self._build_archive(streamer) as archive:
+            self.assertEqual(archive.getinfo('photo.jpg').compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.getinfo('notes.txt').compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_stream_yields_incrementally(self):
+        """Test archive is emitted in chunks rather than as one buffer"""
+        streamer = ZipStreamer(chunk_size=16 * 1024)
+        streamer.add_file(self.image_path, 'photo.jpg')
+
+        chunks = list(streamer.stream())
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 64 * 1024 for chunk in chunks))
+
+    def test_missing_file_is_skipped(self):
+        """Test files removed before streaming do not break the archive"""
+        streamer = ZipStreamer()
+        streamer.add_file(os.path.join(self.temp_dir, 'missing.jpg'), 'missing.jpg')
+        streamer.add_file(self.text_path, 'notes.txt')
+
+        with self._build_archive(streamer) as archive:
+            self.assertEqual(archive.namelist(), ['notes.txt'])
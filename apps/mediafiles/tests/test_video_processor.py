@@ -0,0 +1,145 @@
+# MediaFiles Video Processor Tests
+# Tests for the H.264 transcode planner and conversion pipeline
+
+import io
+import os
+import shutil
+import tempfile
+from unittest.mock import patch, MagicMock
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, override_settings
+from apps.mediafiles.probe import VideoProbe
+from apps.mediafiles.video_processor import VideoProcessor
+
+
+def make_probe(video_codec='h264', audio_codec='aac', format_name='mov,mp4,m4a,3gp,3g2,mj2',
+               width=1280, height=720, pix_fmt='yuv420p', duration='12.0'):
+    """Build a minimal ffprobe result."""
+    streams = [{
+        'codec_type': 'video',
+        'codec_name': video_codec,
+        'width': width,
+        'height': height,
+        'pix_fmt': pix_fmt,
+        'duration': duration,
+    }]
+    if audio_codec:
+        streams.append({'codec_type': 'audio', 'codec_name': audio_codec})
+    return VideoProbe({'streams': streams, 'format': {'format_name': format_name, 'duration': duration}})
+
+
+class TranscodePlanTests(SimpleTestCase):
+    """Tests for per-stream transcode planning"""
+
+    def test_compatible_mp4_is_skipped(self):
+        """Test H.264/AAC in MP4 needs no ffmpeg run"""
+        plan = VideoProcessor.plan_transcode(make_probe(), 'clip.mp4')
+
+        self.assertEqual(plan.video, 'copy')
+        self.assertEqual(plan.audio, 'copy')
+        self.assertEqual(plan.strategy, 'skip')
+
+    def test_compatible_mov_is_remuxed(self):
+        """Test H.264/AAC in a .mov container is remuxed, not re-encoded"""
+        plan = VideoProcessor.plan_transcode(make_probe(), 'clip.mov')
+
+        self.assertEqual(plan.strategy, 'remux')
+        args = VideoProcessor._build_output_args(plan)
+        self.assertEqual(args['vcodec'], 'copy')
+        self.assertEqual(args['acodec'], 'copy')
+        self.assertEqual(args['movflags'], '+faststart')
+
+    def test_incompatible_audio_only_reencodes_audio(self):
+        """Test only the incompatible stream is re-encoded"""
+        plan = VideoProcessor.plan_transcode(make_probe(audio_codec='opus'), 'clip.mp4')
+
+        self.assertEqual(plan.strategy, 'transcode')
+        args = VideoProcessor._build_output_args(plan)
+        self.assertEqual(args['vcodec'], 'copy')
+        self.assertEqual(args['acodec'], 'aac')
+
+    def test_incompatible_video_is_encoded(self):
+        """Test VP9 WebM is fully transcoded with even dimensions"""
+        probe = make_probe(video_codec='vp9', audio_codec=None, format_name='matroska,webm',
+                           width=641, height=481)
+        plan = VideoProcessor.plan_transcode(probe, 'clip.webm')
+
+        self.assertEqual(plan.video, 'encode')
+        self.assertEqual(plan.audio, 'none')
+        self.assertEqual((plan.width, plan.height), (640, 480))
+        self.assertNotIn('acodec', VideoProcessor._build_output_args(plan))
+
+    @override_settings(MEDIA_VIDEO_SHORT_CLIP_MAX_DURATION=30,
+                       MEDIA_VIDEO_SHORT_CLIP_PRESET='veryfast',
+                       MEDIA_VIDEO_PRESET='medium')
+    def test_preset_depends_on_duration(self):
+        """Test short clips use the fast preset"""
+        short_plan = VideoProcessor.plan_transcode(make_probe(video_codec='hevc', duration='10'), 'a.mp4')
+        long_plan = VideoProcessor.plan_transcode(make_probe(video_codec='hevc', duration='90'), 'a.mp4')
+        forced_plan = VideoProcessor.plan_transcode(make_probe(video_codec='hevc'), 'a.mp4', preset='slow')
+
+        self.assertEqual(short_plan.preset, 'veryfast')
+        self.assertEqual(long_plan.preset, 'medium')
+        self.assertEqual(forced_plan.preset, 'slow')
+
+
+class ConvertToH264Tests(SimpleTestCase):
+    """Tests for conversion execution and progress reporting"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.temp_dir, 'clip.mov')
+        with open(self.input_path, 'wb') as f:
+            f.write(b'\x00' * 1024)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _fake_process(self, progress_lines, returncode=0):
+        process = MagicMock()
+        process.stdout = io.BytesIO(''.join(f'{line}\n' for line in progress_lines).encode())
+        process.stderr = io.BytesIO(b'')
+        process.wait.return_value = returncode
+        return process
+
+    @patch('apps.mediafiles.probe.run_ffprobe')
+    def test_supplied_probe_is_reused(self, mock_probe):
+        """Test a provided probe result avoids spawning ffprobe"""
+        mp4_path = os.path.join(self.temp_dir, 'clip.mp4')
+        os.rename(self.input_path, mp4_path)
+
+        result = VideoProcessor.convert_to_h264(mp4_path, mp4_path, probe=make_probe())
+
+        mock_probe.assert_not_called()
+        self.assertEqual(result['strategy'], 'skip')
+        self.assertEqual((result['width'], result['height']), (1280, 720))
+
+    def test_progress_is_reported(self):
+        """Test -progress output is turned into percent complete"""
+        process = self._fake_process([
+            'frame=10', 'out_time_us=3000000', 'progress=continue',
+            'out_time_us=6000000', 'progress=continue',
+            'out_time_us=12000000', 'progress=end',
+        ])
+        reported = []
+
+        with patch('ffmpeg.nodes.OutputStream.run_async', return_value=process):
+            result = VideoProcessor.convert_to_h264(
+                self.input_path, self.input_path,
+                probe=make_probe(), progress_callback=reported.append,
+            )
+
+        self.assertEqual(result['strategy'], 'remux')
+        self.assertEqual(reported, [25, 50, 99, 100])
+
+    def test_ffmpeg_failure_raises_validation_error(self):
+        """Test non-zero ffmpeg exit is surfaced as a validation error"""
+        process = self._fake_process([], returncode=1)
+
+        with patch('ffmpeg.nodes.OutputStream.run_async', return_value=process):
+            with self.assertRaises(ValidationError):
+                VideoProcessor.convert_to_h264(self.input_path, self.input_path, probe=make_probe())
+
+        # Original file is left untouched and no temp output remains
+        self.assertEqual(os.listdir(self.temp_dir), ['clip.mov'])
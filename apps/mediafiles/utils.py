@@ -5,6 +5,7 @@ import os
 import re
 import hashlib
 import mimetypes
+from datetime import datetime
 from pathlib import Path
 from typing import Tuple, Dict, Any, Optional
 
@@ -13,8 +14,10 @@ from django.core.files.uploadedfile import UploadedFile
 from django.utils.text import slugify
 from django.utils import timezone
 
+from .probe import get_video_probe
+
 try:
-    from PIL import Image
+    from PIL import Image, ImageOps
     PILLOW_AVAILABLE = True
 except ImportError:
     PILLOW_AVAILABLE = False
@@ -159,6 +162,34 @@ def get_secure_upload_path(instance, filename: str) -> str:
     return secure_path
 
 
+def get_blob_upload_path(instance, filename: str) -> str:
+    """
+    Generate content-addressed path for a MediaBlob.
+
+    Blobs are named by their SHA-256 hash and fanned out over two levels of
+    directories, so identical content always maps to the same path.
+
+    Args:
+        instance: MediaBlob instance (sha256 must be set)
+        filename: Original filename, only its extension is kept
+
+    Returns:
+        Path like ``blobs/ab/cd/abcd...ef.jpg``
+
+    Raises:
+        ValueError: If the hash is not a SHA-256 hex digest
+    """
+    sha256 = (instance.sha256 or '').lower()
+    if not re.fullmatch(r'[0-9a-f]{64}', sha256):
+        raise ValueError("Blob hash must be a SHA-256 hex digest")
+
+    ext = Path(filename).suffix.lower()
+    if not re.fullmatch(r'(\.[a-z0-9]{1,10})?', ext):
+        raise ValueError("Invalid file extension")
+
+    return f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+
 def normalize_filename(filename: str) -> str:
     """
     Normalize and sanitize original filename for safe database storage.
@@ -349,6 +380,9 @@ def generate_thumbnail(image_path: str, size: Tuple[int, int] = (150, 150)) -> O
     try:
         # Open and process image
         with Image.open(image_path) as img:
+            # Apply EXIF orientation so thumbnails display upright
+            img = ImageOps.exif_transpose(img)
+
             # Convert to RGB if necessary (for PNG with transparency)
             if img.mode in ('RGBA', 'LA', 'P'):
                 img = img.convert('RGB')
@@ -480,15 +514,13 @@ def get_file_metadata(file_path: str) -> Dict[str, Any]:
         # Get video metadata if it's a video
         elif mime_type and mime_type.startswith('video/') and FFMPEG_AVAILABLE:
             try:
-                probe = ffmpeg.probe(file_path)
-                video_stream = next((stream for stream in probe['streams']
-                                   if stream['codec_type'] == 'video'), None)
+                probe = get_video_probe(file_path)
 
-                if video_stream:
-                    metadata['width'] = int(video_stream.get('width', 0))
-                    metadata['height'] = int(video_stream.get('height', 0))
-                    metadata['duration'] = float(video_stream.get('duration', 0))
-                    metadata['format'] = probe.get('format', {}).get('format_name')
+                if probe.video_stream:
+                    metadata['width'] = probe.width
+                    metadata['height'] = probe.height
+                    metadata['duration'] = probe.duration
+                    metadata['format'] = probe.format_name
             except Exception:
                 pass
 
@@ -498,6 +530,110 @@ def get_file_metadata(file_path: str) -> Dict[str, Any]:
     return metadata
 
 
+# EXIF tags kept in MediaFile.metadata['exif'], by tag id
+EXIF_IFD_POINTER = 0x8769
+EXIF_ORIENTATION = 0x0112
+EXIF_MAKE = 0x010F
+EXIF_MODEL = 0x0110
+EXIF_DATETIME = 0x0132
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_PIXEL_X_DIMENSION = 0xA002
+EXIF_PIXEL_Y_DIMENSION = 0xA003
+
+EXIF_TEXT_MAX_LENGTH = 64
+
+
+def _exif_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _exif_text(value) -> Optional[str]:
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='ignore')
+    if not isinstance(value, str):
+        return None
+    value = value.replace('\x00', '').strip()
+    return value[:EXIF_TEXT_MAX_LENGTH] or None
+
+
+def _exif_datetime(value) -> Optional[str]:
+    text = _exif_text(value)
+    if not text:
+        return None
+    try:
+        return datetime.strptime(text[:19], '%Y:%m:%d %H:%M:%S').isoformat()
+    except ValueError:
+        return None
+
+
+def _build_exif_summary(get_tag) -> Dict[str, Any]:
+    """Build the compact EXIF dict from a tag-id lookup function."""
+    summary = {}
+
+    orientation = _exif_int(get_tag(EXIF_ORIENTATION))
+    if orientation and 1 <= orientation <= 8:
+        summary['orientation'] = orientation
+
+    captured_at = _exif_datetime(get_tag(EXIF_DATETIME_ORIGINAL)) or _exif_datetime(get_tag(EXIF_DATETIME))
+    if captured_at:
+        summary['captured_at'] = captured_at
+
+    for key, tag in (('make', EXIF_MAKE), ('model', EXIF_MODEL)):
+        value = _exif_text(get_tag(tag))
+        if value:
+            summary[key] = value
+
+    width = _exif_int(get_tag(EXIF_PIXEL_X_DIMENSION))
+    height = _exif_int(get_tag(EXIF_PIXEL_Y_DIMENSION))
+    if width and height:
+        summary['width'] = width
+        summary['height'] = height
+
+    return summary
+
+
+def extract_exif_summary(img) -> Dict[str, Any]:
+    """
+    Extract the whitelisted EXIF fields from an open Pillow image.
+
+    Only IFD0 and the Exif sub-IFD are read; maker notes, GPS and
+    thumbnails are never decoded.
+
+    Args:
+        img: Open PIL Image
+
+    Returns:
+        Dict with any of orientation (int 1-8), captured_at (ISO datetime),
+        make, model, width and height (ints); empty if there is no EXIF
+    """
+    exif = img.getexif()
+    if not exif:
+        return {}
+    exif_ifd = exif.get_ifd(EXIF_IFD_POINTER)
+    return _build_exif_summary(lambda tag: exif_ifd.get(tag, exif.get(tag)))
+
+
+def is_legacy_exif(exif: Dict[str, Any]) -> bool:
+    """Return True for EXIF stored the old way, keyed by numeric tag id."""
+    return any(str(key).isdigit() for key in exif)
+
+
+def summarize_legacy_exif(exif: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert legacy ``{str(tag_id): str(value)}`` EXIF to the compact schema.
+
+    Args:
+        exif: EXIF dict as stored by older versions
+
+    Returns:
+        Compact EXIF dict, see extract_exif_summary()
+    """
+    return _build_exif_summary(lambda tag: exif.get(str(tag)))
+
+
 def validate_image_file(file_obj: UploadedFile) -> Dict[str, Any]:
     """
     Validate image file format and content.
@@ -606,42 +742,28 @@ def validate_video_file(file_obj: UploadedFile) -> Dict[str, Any]:
         # Enhanced validation if ffmpeg is available
         if FFMPEG_AVAILABLE:
             try:
-                # Save temporary file for ffmpeg analysis
-                import tempfile
-                with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file_obj.name).suffix) as temp_file:
-                    file_obj.seek(0)
-                    for chunk in file_obj.chunks():
-                        temp_file.write(chunk)
-                    temp_file_path = temp_file.name
-
-                try:
-                    # Probe video file
-                    probe = ffmpeg.probe(temp_file_path)
-                    video_stream = next((stream for stream in probe['streams']
-                                       if stream['codec_type'] == 'video'), None)
-
-                    if video_stream:
-                        duration = float(video_stream.get('duration', 0))
-                        max_duration = getattr(settings, 'MEDIA_VIDEO_MAX_DURATION', 120)
-
-                        if duration > max_duration:
-                            result['errors'].append(f"Video duration ({duration:.1f}s) exceeds maximum allowed ({max_duration}s)")
-                            result['is_valid'] = False
-                        else:
-                            result['metadata'] = {
-                                'width': int(video_stream.get('width', 0)),
-                                'height': int(video_stream.get('height', 0)),
-                                'duration': duration,
-                                'codec': video_stream.get('codec_name'),
-                                'format': probe.get('format', {}).get('format_name')
-                            }
-                    else:
-                        result['errors'].append("No video stream found in file")
-                        result['is_valid'] = False
+                # Probe video file once; the result is memoized on the upload
+                probe = get_video_probe(file_obj)
+                video_stream = probe.video_stream
+
+                if video_stream:
+                    duration = probe.duration
+                    max_duration = getattr(settings, 'MEDIA_VIDEO_MAX_DURATION', 120)
 
-                finally:
-                    # Clean up temporary file
-                    os.unlink(temp_file_path)
+                    if duration > max_duration:
+                        result['errors'].append(f"Video duration ({duration:.1f}s) exceeds maximum allowed ({max_duration}s)")
+                        result['is_valid'] = False
+                    else:
+                        result['metadata'] = {
+                            'width': probe.width,
+                            'height': probe.height,
+                            'duration': duration,
+                            'codec': video_stream.get('codec_name'),
+                            'format': probe.format_name
+                        }
+                else:
+                    result['errors'].append("No video stream found in file")
+                    result['is_valid'] = False
 
                 file_obj.seek(0)  # Reset for subsequent use
 
@@ -971,19 +1093,17 @@ class VideoProcessor:
             else:
                 file_path = str(video_file)
             
-            # Probe video file for comprehensive metadata
-            probe = ffmpeg.probe(file_path)
-            video_stream = next((stream for stream in probe['streams']
-                              if stream['codec_type'] == 'video'), None)
-            audio_stream = next((stream for stream in probe['streams']
-                              if stream['codec_type'] == 'audio'), None)
+            # Probe video file for comprehensive metadata (memoized per file)
+            probe = get_video_probe(file_path)
+            video_stream = probe.video_stream
+            audio_stream = probe.audio_stream
             
             if not video_stream:
                 raise ValueError("No video stream found in file")
             
             # Extract video metadata
             metadata = {
-                'duration': float(video_stream.get('duration', 0)),
+                'duration': probe.duration,
                 'width': int(video_stream.get('width', 0)),
                 'height': int(video_stream.get('height', 0)),
                 'codec_name': video_stream.get('codec_name', ''),
@@ -994,9 +1114,9 @@ class VideoProcessor:
                 'bit_rate': int(video_stream.get('bit_rate', 0)) if video_stream.get('bit_rate') else None,
                 'frame_rate': self._parse_frame_rate(video_stream.get('r_frame_rate', '0/1')),
                 'avg_frame_rate': self._parse_frame_rate(video_stream.get('avg_frame_rate', '0/1')),
-                'format_name': probe.get('format', {}).get('format_name', ''),
-                'format_long_name': probe.get('format', {}).get('format_long_name', ''),
-                'size': int(probe.get('format', {}).get('size', 0)),
+                'format_name': probe.format.get('format_name', ''),
+                'format_long_name': probe.format.get('format_long_name', ''),
+                'size': int(probe.format.get('size', 0)),
                 'has_audio': audio_stream is not None,
             }
             
@@ -1404,24 +1524,18 @@ class VideoProcessor:
             # Sanitize file path for ffmpeg command
             sanitized_path = self._sanitize_ffmpeg_path(file_path)
 
-            # Probe video file with timeout and security restrictions
-            probe = ffmpeg.probe(
-                sanitized_path,
-                cmd=['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams'],
-                timeout=30  # 30 second timeout
-            )
+            # Probe the sanitized path once; the result is memoized per file
+            probe = get_video_probe(sanitized_path)
 
-            video_stream = next((stream for stream in probe['streams']
-                              if stream['codec_type'] == 'video'), None)
-            audio_stream = next((stream for stream in probe['streams']
-                              if stream['codec_type'] == 'audio'), None)
+            video_stream = probe.video_stream
+            audio_stream = probe.audio_stream
 
             if not video_stream:
                 raise ValueError("No video stream found in file")
 
             # Extract video metadata with validation
             metadata = {
-                'duration': self._validate_numeric_value(video_stream.get('duration', 0), 'duration'),
+                'duration': self._validate_numeric_value(probe.duration, 'duration'),
                 'width': self._validate_numeric_value(video_stream.get('width', 0), 'width'),
                 'height': self._validate_numeric_value(video_stream.get('height', 0), 'height'),
                 'codec_name': self._sanitize_string_value(video_stream.get('codec_name', '')),
@@ -1432,9 +1546,9 @@ class VideoProcessor:
                 'bit_rate': self._validate_numeric_value(video_stream.get('bit_rate', 0), 'bit_rate') if video_stream.get('bit_rate') else None,
                 'frame_rate': self._parse_frame_rate(video_stream.get('r_frame_rate', '0/1')),
                 'avg_frame_rate': self._parse_frame_rate(video_stream.get('avg_frame_rate', '0/1')),
-                'format_name': self._sanitize_string_value(probe.get('format', {}).get('format_name', '')),
-                'format_long_name': self._sanitize_string_value(probe.get('format', {}).get('format_long_name', '')),
-                'size': self._validate_numeric_value(probe.get('format', {}).get('size', 0), 'size'),
+                'format_name': self._sanitize_string_value(probe.format.get('format_name', '')),
+                'format_long_name': self._sanitize_string_value(probe.format.get('format_long_name', '')),
+                'size': self._validate_numeric_value(probe.format.get('size', 0), 'size'),
                 'has_audio': audio_stream is not None,
             }
 
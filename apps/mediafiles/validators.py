@@ -11,6 +11,8 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 
+from .probe import get_video_probe
+
 try:
     import magic
     PYTHON_MAGIC_AVAILABLE = True
@@ -323,25 +325,16 @@ class VideoValidator:
             # Basic validation without ffmpeg
             return {'basic_validation': True}
         
-        import tempfile
-        
-        # Create temporary file for ffmpeg analysis
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file_obj.name).suffix) as temp_file:
-            file_obj.seek(0)
-            for chunk in file_obj.chunks():
-                temp_file.write(chunk)
-            temp_file_path = temp_file.name
         
         try:
-            # Probe video file
-            probe = ffmpeg.probe(temp_file_path)
-            video_stream = next((stream for stream in probe['streams']
-                               if stream['codec_type'] == 'video'), None)
+            # Probe video file once; the result is memoized on the upload
+            probe = get_video_probe(file_obj)
+            video_stream = probe.video_stream
             
             if not video_stream:
                 raise ValidationError("No video stream found in file")
             
-            duration = float(video_stream.get('duration', 0))
+            duration = probe.duration
             max_duration = getattr(settings, 'MEDIA_VIDEO_MAX_DURATION', 120)
             
             if duration > max_duration:
@@ -350,11 +343,11 @@ class VideoValidator:
                 )
             
             metadata = {
-                'width': int(video_stream.get('width', 0)),
-                'height': int(video_stream.get('height', 0)),
+                'width': probe.width,
+                'height': probe.height,
                 'duration': duration,
                 'codec': video_stream.get('codec_name'),
-                'format': probe.get('format', {}).get('format_name')
+                'format': probe.format.get('format_name')
             }
             
             file_obj.seek(0)
@@ -363,12 +356,6 @@ class VideoValidator:
         except Exception as e:
             file_obj.seek(0)
             raise ValidationError(f"Video validation error: {str(e)}")
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except OSError:
-                pass
 
 
 def sanitize_filename(filename: str) -> str:
@@ -1,10 +1,50 @@
 import os
+import shutil
 import tempfile
 import ffmpeg
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Optional
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
+from .probe import VideoProbe, get_video_probe
+
+
+# Pixel formats that play everywhere without re-encoding
+COMPATIBLE_PIXEL_FORMATS = ('yuv420p', 'yuvj420p')
+
+
+@dataclass(frozen=True)
+class TranscodePlan:
+    """
+    Per-stream decision for bringing a video to H.264/AAC in MP4.
+
+    ``video`` is 'copy' or 'encode'; ``audio`` is 'copy', 'encode' or
+    'none' (no audio stream). ``strategy`` summarises the plan:
+
+    - 'skip': already H.264/AAC in MP4, nothing to run
+    - 'remux': streams are compatible, only the container is rewritten
+      (``-c copy -movflags +faststart``)
+    - 'transcode': at least one stream must be re-encoded
+    """
+
+    video: str
+    audio: str
+    container_ok: bool
+    preset: str
+    duration: float
+    width: int
+    height: int
+
+    @property
+    def strategy(self) -> str:
+        if self.video == 'encode' or self.audio == 'encode':
+            return 'transcode'
+        if not self.container_ok:
+            return 'remux'
+        return 'skip'
+
 
 class VideoProcessor:
     """
@@ -12,13 +52,150 @@ class VideoProcessor:
     """
 
     @staticmethod
-    def convert_to_h264(input_path: str, output_path: str) -> dict:
+    def get_preset(duration: float) -> str:
+        """
+        Choose the x264 preset for a clip.
+
+        Short clinical clips use the fast preset; longer clips fall back to
+        the default quality preset.
+        """
+        short_clip_max = getattr(settings, 'MEDIA_VIDEO_SHORT_CLIP_MAX_DURATION', 30)
+        if duration <= short_clip_max:
+            return getattr(settings, 'MEDIA_VIDEO_SHORT_CLIP_PRESET', 'veryfast')
+        return getattr(settings, 'MEDIA_VIDEO_PRESET', 'medium')
+
+    @staticmethod
+    def plan_transcode(probe: VideoProbe, input_path: str, preset: Optional[str] = None) -> TranscodePlan:
+        """
+        Build a transcode plan from an ffprobe result.
+
+        Args:
+            probe: Probe result for the input file
+            input_path: Path to input video file
+            preset: Optional x264 preset overriding the duration-based choice
+
+        Returns:
+            TranscodePlan describing what to do with each stream
+        """
+        video_stream = probe.video_stream
+        if not video_stream:
+            raise ValidationError("No video stream found")
+
+        audio_stream = probe.audio_stream
+        duration = probe.duration
+        width, height = probe.width, probe.height
+
+        video_copyable = (
+            video_stream.get('codec_name', '').lower() == 'h264' and
+            video_stream.get('pix_fmt', '') in COMPATIBLE_PIXEL_FORMATS and
+            width % 2 == 0 and height % 2 == 0
+        )
+
+        if audio_stream is None:
+            audio_action = 'none'
+        elif audio_stream.get('codec_name', '').lower() == 'aac':
+            audio_action = 'copy'
+        else:
+            audio_action = 'encode'
+
+        format_names = probe.format_name.split(',')
+        container_ok = 'mp4' in format_names and Path(input_path).suffix.lower() == '.mp4'
+
+        if not video_copyable:
+            # Re-encoding pads to even dimensions, see the scale filter below
+            width, height = width - width % 2, height - height % 2
+
+        return TranscodePlan(
+            video='copy' if video_copyable else 'encode',
+            audio=audio_action,
+            container_ok=container_ok,
+            preset=preset or VideoProcessor.get_preset(duration),
+            duration=duration,
+            width=width,
+            height=height,
+        )
+
+    @staticmethod
+    def _build_output_args(plan: TranscodePlan) -> dict:
+        """Translate a plan into ffmpeg output arguments."""
+        output_args = {
+            'format': 'mp4',
+            'movflags': '+faststart',  # Web optimization
+        }
+
+        if plan.video == 'copy':
+            output_args['vcodec'] = 'copy'
+        else:
+            output_args.update({
+                'vcodec': getattr(settings, 'MEDIA_VIDEO_CODEC', 'libx264'),
+                'preset': plan.preset,
+                'crf': getattr(settings, 'MEDIA_VIDEO_CRF', 23),  # Good quality for medical content
+                'pix_fmt': 'yuv420p',  # Universal compatibility
+                'vf': 'scale=trunc(iw/2)*2:trunc(ih/2)*2',  # Ensure even dimensions
+            })
+
+        if plan.audio == 'copy':
+            output_args['acodec'] = 'copy'
+        elif plan.audio == 'encode':
+            output_args['acodec'] = 'aac'
+
+        return output_args
+
+    @staticmethod
+    def _run_with_progress(stream, duration: float,
+                           progress_callback: Optional[Callable[[int], None]]) -> None:
+        """
+        Run an ffmpeg command, reporting percent complete from ``-progress``.
+
+        ffmpeg writes ``key=value`` lines to stdout; ``out_time_us`` gives the
+        position reached in the output, which against the input duration
+        yields the percentage.
+        """
+        process = (
+            stream
+            .global_args('-progress', 'pipe:1', '-nostats', '-loglevel', 'error')
+            .overwrite_output()
+            .run_async(pipe_stdout=True, pipe_stderr=True)
+        )
+
+        last_percent = -1
+        for raw_line in process.stdout:
+            key, _, value = raw_line.decode('utf-8', 'replace').strip().partition('=')
+            if key not in ('out_time_us', 'out_time_ms') or not duration:
+                continue
+            try:
+                position = int(value) / 1_000_000
+            except ValueError:
+                continue
+            percent = max(0, min(99, int(position * 100 / duration)))
+            if percent != last_percent:
+                last_percent = percent
+                if progress_callback:
+                    progress_callback(percent)
+
+        stderr = process.stderr.read()
+        process.stdout.close()
+        process.stderr.close()
+        if process.wait() != 0:
+            raise ffmpeg.Error('ffmpeg', None, stderr)
+
+    @staticmethod
+    def convert_to_h264(input_path: str, output_path: str, probe: Optional[VideoProbe] = None,
+                        preset: Optional[str] = None,
+                        progress_callback: Optional[Callable[[int], None]] = None) -> dict:
         """
         Convert video to H.264/MP4 for universal mobile compatibility.
 
+        The input is probed once; the same result drives validation, the
+        transcode plan and the returned metadata. Compatible streams are
+        copied, so an H.264/AAC ``.mov`` is only remuxed.
+
         Args:
             input_path: Path to input video file
             output_path: Path for output video file
+            probe: Optional probe result already computed for input_path
+            preset: Optional x264 preset overriding the duration-based choice
+            progress_callback: Optional callable receiving percent complete
 
         Returns:
             dict: Conversion results with metadata
@@ -27,88 +204,51 @@ class VideoProcessor:
             # Validate input file exists
             if not os.path.exists(input_path):
                 raise ValidationError(f"Input video file not found: {input_path}")
-            
-            # Probe input file
-            probe = ffmpeg.probe(input_path)
-            video_stream = next((stream for stream in probe['streams']
-                               if stream['codec_type'] == 'video'), None)
 
-            if not video_stream:
-                raise ValidationError("No video stream found")
+            original_size = os.path.getsize(input_path)
+
+            # Probe input file (single pass, memoized per file)
+            if probe is None:
+                probe = get_video_probe(input_path)
+
+            plan = VideoProcessor.plan_transcode(probe, input_path, preset=preset)
 
             # Check duration limit
-            duration = float(video_stream.get('duration', 0))
             max_duration = getattr(settings, 'MEDIA_VIDEO_MAX_DURATION', 120)
-            if duration > max_duration:
-                raise ValidationError(f"Video too long: {duration}s > {max_duration}s")
-
-            # Check if video is already in correct format
-            current_codec = video_stream.get('codec_name', '').lower()
-            current_format = Path(input_path).suffix.lower()
-            
-            # Get audio stream info
-            audio_stream = next((stream for stream in probe['streams']
-                               if stream['codec_type'] == 'audio'), None)
-            current_audio_codec = audio_stream.get('codec_name', '').lower() if audio_stream else None
-            
-            # Check if conversion is needed
-            needs_conversion = (
-                current_codec != 'h264' or
-                current_format != '.mp4' or
-                current_audio_codec != 'aac'
-            )
-            
-            # If file is already in correct format and paths are the same, skip conversion
-            if not needs_conversion and input_path == output_path:
-                # No conversion needed, file is already in correct format
-                pass  # Skip the conversion block
-            
-            if needs_conversion:
-                # Use temporary file if input and output are the same
-                if input_path == output_path:
-                    temp_output = output_path.replace('.mp4', '_temp.mp4')
-                else:
-                    temp_output = output_path
-                
-                # Convert to H.264/MP4 with mobile-optimized settings
-                (
-                    ffmpeg
-                    .input(input_path)
-                    .output(
-                        temp_output,
-                        vcodec='libx264',
-                        acodec='aac',
-                        preset='medium',
-                        crf=23,  # Good quality for medical content
-                        movflags='+faststart',  # Web optimization
-                        pix_fmt='yuv420p',  # Universal compatibility
-                        vf='scale=trunc(iw/2)*2:trunc(ih/2)*2'  # Ensure even dimensions
+            if plan.duration > max_duration:
+                raise ValidationError(f"Video too long: {plan.duration}s > {max_duration}s")
+
+            if plan.strategy != 'skip':
+                # Always write to a separate file, then move into place
+                output_dir = os.path.dirname(os.path.abspath(output_path))
+                fd, temp_output = tempfile.mkstemp(suffix='.mp4', dir=output_dir)
+                os.close(fd)
+
+                try:
+                    stream = ffmpeg.input(input_path).output(
+                        temp_output, **VideoProcessor._build_output_args(plan)
                     )
-                    .overwrite_output()
-                    .run(capture_stdout=True, capture_stderr=True)
-                )
-                
-                # If we used a temporary file, replace the original
-                if temp_output != output_path:
-                    import shutil
+                    VideoProcessor._run_with_progress(stream, plan.duration, progress_callback)
                     shutil.move(temp_output, output_path)
-            else:
-                # Video is already in correct format, no conversion needed
-                pass
+                finally:
+                    if os.path.exists(temp_output):
+                        os.unlink(temp_output)
+            elif input_path != output_path:
+                shutil.copyfile(input_path, output_path)
 
-            # Get output file info
-            output_probe = ffmpeg.probe(output_path)
-            output_video = next((stream for stream in output_probe['streams']
-                               if stream['codec_type'] == 'video'), None)
+            if progress_callback:
+                progress_callback(100)
 
             return {
                 'success': True,
-                'original_size': os.path.getsize(input_path),
+                'original_size': original_size,
                 'converted_size': os.path.getsize(output_path),
-                'duration': duration,
-                'width': int(output_video.get('width', 0)),
-                'height': int(output_video.get('height', 0)),
-                'codec': output_video.get('codec_name', 'h264')
+                'duration': plan.duration,
+                'width': plan.width,
+                'height': plan.height,
+                'codec': 'h264',
+                'strategy': plan.strategy,
+                'preset': plan.preset if plan.video == 'encode' else None,
             }
 
         except ffmpeg.Error as e:
@@ -138,4 +278,4 @@ class VideoProcessor:
             )
             return True
         except Exception:
-            return False
\ No newline at end of file
+            return False
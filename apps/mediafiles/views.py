@@ -20,7 +20,7 @@ from pathlib import Path
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, ValidationError
 from django.http import HttpRequest, HttpResponse, FileResponse, Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
@@ -36,7 +36,7 @@ from django.views.decorators.http import require_POST
 import json
 import re
 
-from .models import Photo, MediaFile, PhotoSeries, VideoClip
+from .models import Photo, MediaFile, PhotoSeries, PhotoSeriesFile, VideoClip
 from .forms import PhotoCreateForm, PhotoCreateFormNew, PhotoUpdateForm, PhotoSeriesCreateForm, PhotoSeriesCreateFormNew, PhotoSeriesUpdateForm, PhotoSeriesPhotoForm, VideoClipCreateForm, VideoClipUpdateForm
 from apps.patients.models import Patient
 from apps.core.permissions import (
@@ -173,7 +173,9 @@ class SecureFileServeView(View):
         """
         Serve file with comprehensive security headers.
 
-        Includes fallback logic to handle both old (random UUID) and new (MediaFile.id) naming strategies.
+        Legacy files saved under a random UUID are served from the location
+        recorded by the resolve_media_file_paths command; the directory is
+        never listed on the request path.
 
         Args:
             media_file: MediaFile object
@@ -184,15 +186,11 @@ class SecureFileServeView(View):
         Raises:
             Http404: If file not found on disk
         """
-        file_path = Path(settings.MEDIA_ROOT) / media_file.file.name
+        file_path = media_file.get_file_path()
 
-        # Check if file exists with current naming strategy
-        if not file_path.exists() or not file_path.is_file():
-            # FALLBACK: Try to find file with old naming strategy (random UUID)
-            file_path = self._find_file_with_fallback(media_file, file_path)
-
-            if not file_path or not file_path.exists():
-                raise Http404("File not found on disk")
+        if not file_path.is_file():
+            self._log_unresolved_file(media_file, file_path)
+            raise Http404("File not found on disk")
 
         # Get MIME type
         content_type, _ = mimetypes.guess_type(str(file_path))
@@ -224,39 +222,14 @@ class SecureFileServeView(View):
 
         return response
 
-    def _find_file_with_fallback(self, media_file, expected_path):
-        """
-        Find file using fallback strategy for old naming convention.
-
-        Args:
-            media_file: MediaFile object
-            expected_path: Path where file should be with new naming
-
-        Returns:
-            Path object if file found, None otherwise
-        """
-        # Get the directory where the file should be
-        file_dir = expected_path.parent
-        if not file_dir.exists():
-            return None
-
-        # Get the expected file extension
-        file_extension = expected_path.suffix
-
-        # Look for any file with the same extension in the directory
-        # This handles the case where file was saved with random UUID
-        matching_files = list(file_dir.glob(f'*{file_extension}'))
-
-        if len(matching_files) == 1:
-            # Found exactly one file with matching extension - likely our file
-            return matching_files[0]
-        elif len(matching_files) > 1:
-            # Multiple files found - log this for investigation
-            import logging
-            logger = logging.getLogger('mediafiles.serving')
-            logger.warning(f"Multiple files found for MediaFile {media_file.id} in {file_dir}: {[f.name for f in matching_files]}")
-
-        return None
+    def _log_unresolved_file(self, media_file, file_path) -> None:
+        """Log files missing from their expected or recorded location."""
+        import logging
+        logger = logging.getLogger('mediafiles.serving')
+        logger.warning(
+            f"Unresolved file for MediaFile {media_file.id}: {file_path} does not exist. "
+            f"Run 'manage.py resolve_media_file_paths' to record legacy file locations."
+        )
 
     def _log_file_access(self, user, media_file, action: str, extra_data: dict = None) -> None:
         """Log file access for audit trail."""
@@ -680,7 +653,7 @@ class SecureVideoStreamView(SecureFileServeView):
         Returns:
             HttpResponse with partial content
         """
-        file_path = Path(settings.MEDIA_ROOT) / media_file.file.name
+        file_path = media_file.get_file_path()
 
         if not file_path.exists():
             raise Http404("Video file not found on disk")
@@ -738,7 +711,7 @@ class SecureVideoStreamView(SecureFileServeView):
         Returns:
             FileResponse with complete video
         """
-        file_path = Path(settings.MEDIA_ROOT) / media_file.file.name
+        file_path = media_file.get_file_path()
 
         if not file_path.exists():
             raise Http404("Video file not found on disk")
@@ -1533,23 +1506,22 @@ def photoseries_add_photo(request, pk):
         # Process form
         form = PhotoSeriesPhotoForm(request.POST, request.FILES)
         if form.is_valid():
-            # Create MediaFile from uploaded image
+            # Store and append the image through the batch pipeline
             image = form.cleaned_data['image']
             description = form.cleaned_data.get('description', '')
-            order = form.cleaned_data.get('order')
             
-            media_file = MediaFile.objects.create_from_upload(image)
-            
-            # Add to series
-            photoseries.add_photo(media_file, order=order, description=description)
+            photo_file, = photoseries.add_photos_batch([image])
+            if description:
+                photo_file.description = description
+                photo_file.save(update_fields=['description'])
             
             return JsonResponse({
                 'success': True,
-                'photo_id': str(media_file.id),
-                'photo_url': media_file.get_secure_url(),
-                'thumbnail_url': media_file.get_thumbnail_url(),
-                'filename': media_file.original_filename,
-                'order': photoseries.photoseriesfile_set.filter(media_file=media_file).first().order,
+                'photo_id': str(photo_file.id),
+                'photo_url': photo_file.get_secure_url(),
+                'thumbnail_url': photo_file.get_thumbnail_url(),
+                'filename': photo_file.original_filename,
+                'order': photo_file.order,
                 'description': description,
                 'photo_count': photoseries.get_photo_count()
             })
@@ -1592,19 +1564,19 @@ def photoseries_remove_photo(request, pk, photo_id):
                 'error': 'You cannot edit this photo series anymore'
             }, status=403)
         
-        # Get media file
-        media_file = get_object_or_404(MediaFile, pk=photo_id)
-        
-        # Remove from series
-        photoseries.remove_photo(media_file)
+        # Get the photo of this series
+        photo_file = get_object_or_404(PhotoSeriesFile, pk=photo_id, photo_series=photoseries)
         
-        # Check if series still has photos
-        if photoseries.get_photo_count() == 0:
+        # A series must keep at least one photo
+        if photoseries.get_photo_count() <= 1:
             return JsonResponse({
                 'success': False,
                 'error': 'Cannot remove last photo from series'
             }, status=400)
         
+        # Remove from series (refreshes the summary)
+        photoseries.remove_photo(photo_file)
+        
         return JsonResponse({
             'success': True,
             'photo_count': photoseries.get_photo_count(),
@@ -1654,14 +1626,20 @@ def photoseries_reorder(request, pk):
                 'error': 'Photo order list is required'
             }, status=400)
         
-        # Reorder photos
-        photoseries.reorder_photos(photo_order_list)
+        # Reorder photos (refreshes the summary, the cover photo may have changed)
+        try:
+            photoseries.reorder_photos(photo_order_list)
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': e.messages[0]
+            }, status=400)
         
         # Return updated order
         ordered_photos = []
-        for photo_file in photoseries.photoseriesfile_set.all().order_by('order'):
+        for photo_file in PhotoSeriesFile.objects.filter(photo_series=photoseries).order_by('order'):
             ordered_photos.append({
-                'photo_id': str(photo_file.media_file.id),
+                'photo_id': str(photo_file.id),
                 'order': photo_file.order,
                 'description': photo_file.description
             })
@@ -1684,7 +1662,7 @@ def photoseries_download(request, pk):
     """
     Download view for PhotoSeries instances.
     
-    Serves all photos in series as ZIP file.
+    Streams all photos in series as a ZIP file, without temporary files.
     """
     try:
         # Get photo series and check permissions
@@ -1696,27 +1674,26 @@ def photoseries_download(request, pk):
                 "You don't have permission to access this patient's photo series"
             )
         
-        import zipfile
-        import tempfile
-        from django.http import FileResponse
-        
-        # Create temporary ZIP file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-        
-        with zipfile.ZipFile(temp_file, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for photo_file in photoseries.photoseriesfile_set.all().order_by('order'):
-                media_file = photo_file.media_file
-                
-                # Create filename with order prefix
-                zip_filename = f"{photo_file.order:02d}_{media_file.original_filename}"
-                
-                # Add file to ZIP
-                file_path = Path(settings.MEDIA_ROOT) / media_file.file.name
-                if file_path.exists():
-                    zip_file.write(file_path, zip_filename)
-        
-        temp_file.close()
-        
+        from django.http import StreamingHttpResponse
+        from .zip_stream import ZipStreamer
+
+        # Queue files; the archive is built while the response is streamed
+        streamer = ZipStreamer()
+        originals_dir = photoseries.get_storage_directory('originals')
+        for photo_file in photoseries.photoseriesfile_set.order_by('order'):
+            if not photo_file.file_id:
+                continue
+
+            # Originals are stored as <file_id><original suffix>
+            suffix = Path(photo_file.original_filename or '').suffix.lower()
+            file_path = originals_dir / f"{photo_file.file_id}{suffix}"
+
+            # Create filename with order prefix
+            zip_filename = f"{photo_file.order:02d}_{photo_file.original_filename}"
+
+            if file_path.exists():
+                streamer.add_file(file_path, zip_filename)
+
         # Log download access
         import logging
         security_logger = logging.getLogger('security.mediafiles')
@@ -1724,16 +1701,15 @@ def photoseries_download(request, pk):
             f"PhotoSeries ZIP download: user={request.user.username} "
             f"series={photoseries.id} "
             f"patient={photoseries.patient.id} "
-            f"photo_count={photoseries.get_photo_count()}"
+            f"photo_count={len(streamer)}"
         )
-        
-        # Serve ZIP file
-        response = FileResponse(
-            open(temp_file.name, 'rb'),
-            content_type='application/zip',
-            as_attachment=True
+
+        # Stream ZIP file
+        response = StreamingHttpResponse(
+            streamer.stream(),
+            content_type='application/zip'
         )
-        
+
         # Create descriptive filename
         safe_patient_name = re.sub(r'[^\w\s-]', '', photoseries.patient.name)[:20]
         zip_filename = f"fotos_{safe_patient_name}_{photoseries.event_datetime.strftime('%Y%m%d')}.zip"
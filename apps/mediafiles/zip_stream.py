@@ -0,0 +1,111 @@
+import io
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+
+class _StreamBuffer(io.RawIOBase):
+    """
+    Write-only, non-seekable sink that collects bytes written by ZipFile.
+
+    Because ``tell()``/``seek()`` are unsupported, ZipFile switches to its
+    streaming mode: local headers are followed by data descriptors and the
+    CRC-32 of each entry is computed while its bytes are being written.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Return everything written since the last drain and reset the buffer."""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class ZipStreamer:
+    """
+    Streaming ZIP archive builder for media downloads.
+
+    Entries are read and emitted chunk by chunk, so memory usage stays
+    constant regardless of how many files the archive contains and no
+    temporary file is written to disk. Already-compressed media (JPEG, PNG,
+    WebP, MP4, ...) is stored as-is instead of being deflated again.
+    """
+
+    # Formats whose payload is already compressed; deflating them only burns CPU
+    COMPRESSED_EXTENSIONS = {
+        '.jpg', '.jpeg', '.png', '.webp', '.gif', '.heic', '.heif',
+        '.mp4', '.webm', '.mov', '.m4v', '.zip', '.pdf',
+    }
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._entries: List[Tuple[Path, str]] = []
+
+    def add_file(self, file_path, arcname: str) -> None:
+        """
+        Queue a file on disk to be written into the archive.
+
+        Args:
+            file_path: Path to the source file
+            arcname: Name of the entry inside the archive
+        """
+        self._entries.append((Path(file_path), arcname))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_compress_type(self, file_path: Path) -> int:
+        """Pick ZIP_STORED for already-compressed media, ZIP_DEFLATED otherwise."""
+        if file_path.suffix.lower() in self.COMPRESSED_EXTENSIONS:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Yield the archive bytes incrementally.
+
+        Files that disappear between queueing and streaming are skipped.
+        """
+        sink = _StreamBuffer()
+
+        with zipfile.ZipFile(sink, mode='w') as archive:
+            for file_path, arcname in self._entries:
+                try:
+                    source = open(file_path, 'rb')
+                except OSError:
+                    continue
+
+                with source:
+                    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                    zinfo.compress_type = self.get_compress_type(file_path)
+
+                    with archive.open(zinfo, mode='w') as entry:
+                        while True:
+                            chunk = source.read(self.chunk_size)
+                            if not chunk:
+                                break
+                            entry.write(chunk)
+                            data = sink.drain()
+                            if data:
+                                yield data
+
+                data = sink.drain()
+                if data:
+                    yield data
+
+        # Central directory is written when the archive is closed
+        data = sink.drain()
+        if data:
+            yield data
@@ -1,11 +1,12 @@
 from django import forms
 from django.forms import inlineformset_factory
+from django.urls import reverse_lazy
 from django.utils import timezone
 from django.db import models
 from apps.events.forms import EventForm
 from apps.outpatientprescriptions.models import OutpatientPrescription, PrescriptionItem
 from apps.drugtemplates.models import DrugTemplate
-from apps.outpatientprescriptions.widgets import DrugTemplateField, AutoCompleteWidget
+from apps.outpatientprescriptions.widgets import DrugTemplateField, AutoCompleteWidget, TypeaheadSelect
 
 
 class OutpatientPrescriptionForm(EventForm):
@@ -39,7 +40,11 @@ class OutpatientPrescriptionForm(EventForm):
                 }
             ),
             "status": forms.RadioSelect(),
-            "patient": forms.Select(attrs={"class": "form-control"}),
+            "patient": TypeaheadSelect(
+                search_url=reverse_lazy("patients:api_patient_search"),
+                placeholder="Digite o nome, CPF ou prontuário do paciente",
+                attrs={"class": "form-control"},
+            ),
         }
 
     def __init__(self, *args, **kwargs):
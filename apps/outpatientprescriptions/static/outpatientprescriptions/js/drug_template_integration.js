@@ -28,6 +28,7 @@
     function initializeDrugTemplateIntegration() {
         initializeTemplateSelects();
         initializePrescriptionTemplateSelect();
+        initializeTypeaheadSelects();
         initializeAutocomplete();
         initializeDrugNameAutocomplete();
         loadTemplateData();
@@ -259,6 +260,81 @@
     }
 
 
+    /**
+     * Initialize selects whose options come from a search endpoint
+     * (patient and prescription template pickers). The page only renders the
+     * selected option; the paired search input fetches the others.
+     */
+    function initializeTypeaheadSelects() {
+        document.querySelectorAll('select[data-search-url]').forEach(select => {
+            const input = document.querySelector(`input[data-typeahead-for="${select.id}"]`);
+            const minChars = parseInt(select.dataset.minChars || '2', 10);
+            let debounceTimer = null;
+            let lastRequest = 0;
+
+            const search = query => {
+                if (query.length < minChars) {
+                    return;
+                }
+                const request = ++lastRequest;
+                const url = new URL(select.dataset.searchUrl, window.location.origin);
+                url.searchParams.set('q', query);
+
+                fetch(url)
+                    .then(response => {
+                        if (!response.ok) {
+                            throw new Error(`HTTP error! status: ${response.status}`);
+                        }
+                        return response.json();
+                    })
+                    .then(data => {
+                        // Ignore answers to queries the user has already typed past
+                        if (request === lastRequest) {
+                            replaceSelectOptions(select, data.results || [], data.has_next);
+                        }
+                    })
+                    .catch(error => console.error('Typeahead search error:', error));
+            };
+
+            if (input) {
+                input.addEventListener('input', () => {
+                    clearTimeout(debounceTimer);
+                    debounceTimer = setTimeout(() => search(input.value.trim()), CONFIG.debounceDelay);
+                });
+            }
+
+            if (minChars === 0) {
+                search('');
+            }
+        });
+    }
+
+    /**
+     * Replace the options of a typeahead select, keeping the placeholder and the current selection
+     */
+    function replaceSelectOptions(select, results, hasNext) {
+        const kept = Array.from(select.options).filter(option => option.value === '' || option.selected);
+        const keptValues = new Set(kept.map(option => option.value));
+
+        select.innerHTML = '';
+        kept.forEach(option => select.appendChild(option));
+
+        results.forEach(result => {
+            if (keptValues.has(result.id)) {
+                return;
+            }
+            const label = result.display_text ||
+                [result.name, result.current_record_number].filter(Boolean).join(' - ');
+            select.appendChild(new Option(label, result.id));
+        });
+
+        if (hasNext) {
+            const more = new Option('Refine a busca para ver mais resultados', '');
+            more.disabled = true;
+            select.appendChild(more);
+        }
+    }
+
     // Manual entry toggle function removed - no longer needed
 
     /**
@@ -0,0 +1,156 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.drugtemplates.models import DrugTemplate, PrescriptionTemplate, PrescriptionTemplateItem
+from apps.outpatientprescriptions.forms.prescription_forms import OutpatientPrescriptionForm
+from apps.patients.models import Patient
+
+User = get_user_model()
+
+
+def _create_user(username):
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="testpass123",
+        password_change_required=False,
+        terms_accepted=True,
+        terms_accepted_at=timezone.now(),
+    )
+
+
+def _create_template(name, creator, is_public=False, items=1):
+    template = PrescriptionTemplate.objects.create(name=name, creator=creator, is_public=is_public)
+    for order in range(1, items + 1):
+        PrescriptionTemplateItem.objects.create(
+            template=template,
+            drug_name=f"Medicamento {order}",
+            presentation="comprimido",
+            usage_instructions="Tomar 1 comprimido ao dia",
+            quantity="30 comprimidos",
+            order=order,
+        )
+    return template
+
+
+class PrescriptionFormTypeaheadTests(TestCase):
+    def setUp(self):
+        self.user = _create_user("typeahead-doctor")
+        self.user.user_permissions.add(Permission.objects.get(codename="add_event", content_type__app_label="events"))
+        self.client.force_login(self.user)
+        self.patient = Patient.objects.create(
+            name="Paciente Listado",
+            birthday="1980-01-01",
+            status=1,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        _create_template("Hipertensao", self.user, items=2)
+
+    def test_create_form_renders_without_bulk_lists(self):
+        response = self.client.get(reverse("outpatientprescriptions:outpatientprescription_create"))
+
+        self.assertEqual(response.status_code, 200)
+        for key in ("drug_templates", "prescription_templates", "available_patients"):
+            self.assertNotIn(key, response.context)
+        self.assertNotContains(response, "Paciente Listado")
+        self.assertNotContains(response, "Hipertensao")
+        self.assertContains(response, reverse("patients:api_patient_search"))
+        self.assertContains(response, reverse("outpatientprescriptions:search_prescription_templates"))
+
+    def test_patient_select_renders_only_the_selected_patient(self):
+        Patient.objects.create(
+            name="Outro Paciente", birthday="1990-01-01", status=1, created_by=self.user, updated_by=self.user
+        )
+        form = OutpatientPrescriptionForm(initial={"patient": self.patient.pk}, user=self.user)
+
+        html = str(form["patient"])
+        self.assertIn("Paciente Listado", html)
+        self.assertNotIn("Outro Paciente", html)
+
+        bound = OutpatientPrescriptionForm(data={"patient": "not-a-uuid"}, user=self.user)
+        self.assertEqual(str(bound["patient"]).count("<option"), 1)
+
+
+class PrescriptionTemplateSearchTests(TestCase):
+    def setUp(self):
+        self.user = _create_user("template-searcher")
+        self.other = _create_user("template-author")
+        self.client.force_login(self.user)
+        self.url = reverse("outpatientprescriptions:search_prescription_templates")
+
+        _create_template("Diabetes tipo 2", self.user, items=3)
+        _create_template("Hipertensao arterial", self.other, is_public=True)
+        _create_template("Hipertensao privada", self.other, is_public=False)
+
+    def test_empty_query_lists_visible_templates_with_item_counts(self):
+        payload = self.client.get(self.url).json()
+
+        self.assertEqual(
+            [(result["name"], result["items_count"]) for result in payload["results"]],
+            [("Diabetes tipo 2", 3), ("Hipertensao arterial", 1)],
+        )
+        self.assertFalse(payload["has_next"])
+
+    def test_query_is_case_insensitive_and_paginated(self):
+        first = self.client.get(self.url, {"q": "HIPERTENSAO", "limit": 1}).json()
+        self.assertEqual([result["name"] for result in first["results"]], ["Hipertensao arterial"])
+        self.assertFalse(first["has_next"])
+
+        page = self.client.get(self.url, {"limit": 1, "page": 2}).json()
+        self.assertEqual([result["name"] for result in page["results"]], ["Hipertensao arterial"])
+        self.assertEqual(page["page"], 2)
+        self.assertFalse(page["has_next"])
+        self.assertTrue(self.client.get(self.url, {"limit": 1}).json()["has_next"])
+
+    def test_query_uses_the_trigram_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {"q": "hipert"})
+        sql = next(q["sql"] for q in queries if "drugtemplates_prescriptiontemplate" in q["sql"] and "LIKE" in q["sql"])
+
+        # UPPER(...) LIKE UPPER(...) (icontains) cannot use the index
+        self.assertNotIn("UPPER(", sql)
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn("prescriptiontpl_name_trgm_idx", plan)
+
+
+class DrugTemplateSearchPaginationTests(TestCase):
+    def test_search_pages_through_matches(self):
+        user = _create_user("drug-searcher")
+        self.client.force_login(user)
+        for name in ("Amoxicilina", "Amoxicilina com clavulanato", "Amoxil"):
+            DrugTemplate.objects.create(
+                name=name,
+                concentration="500 mg",
+                pharmaceutical_form="capsula",
+                usage_instructions="Tomar 1 capsula a cada 8 horas.",
+                creator=user,
+            )
+        url = reverse("outpatientprescriptions:search_drug_templates")
+
+        first = self.client.get(url, {"q": "amox", "limit": 2}).json()
+        second = self.client.get(url, {"q": "amox", "limit": 2, "page": 2}).json()
+
+        self.assertEqual([result["name"] for result in first["results"]], ["Amoxicilina", "Amoxicilina com clavulanato"])
+        self.assertTrue(first["has_next"])
+        self.assertEqual([result["name"] for result in second["results"]], ["Amoxil"])
+        self.assertFalse(second["has_next"])
+
+    def test_search_compiles_to_plain_like(self):
+        user = _create_user("drug-like-searcher")
+        self.client.force_login(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("outpatientprescriptions:search_drug_templates"), {"q": "Amóx"})
+
+        sql = next(q["sql"] for q in queries if "drugtemplates_drugtemplate" in q["sql"] and "LIKE" in q["sql"])
+        # UPPER(...) LIKE UPPER(...) (icontains) cannot use drugtpl_name_trgm_idx
+        self.assertNotIn("UPPER(", sql)
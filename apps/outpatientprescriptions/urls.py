@@ -16,5 +16,6 @@ urlpatterns = [
     # AJAX endpoints
     path('ajax/drug-template/<uuid:template_id>/', views.get_drug_template_data, name='get_drug_template_data'),
     path('ajax/drug-templates/search/', views.search_drug_templates, name='search_drug_templates'),
+    path('ajax/prescription-templates/search/', views.search_prescription_templates, name='search_prescription_templates'),
     path('ajax/prescription-template/<uuid:template_id>/', views.get_prescription_template_data, name='get_prescription_template_data'),
 ]
\ No newline at end of file
@@ -9,7 +9,7 @@ from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.contrib import messages
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Func, TextField, Value
+from django.db.models import Count, Q, Func, TextField, Value
 from django.db.models.functions import Lower
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
@@ -29,11 +29,14 @@ from apps.core.permissions import (
     can_access_patient,
     can_edit_event,
     can_delete_event,
+    get_patient_access_scope,
+    patient_access_filter,
 )
 from apps.patients.models import Patient
 from apps.sample_content.models import SampleContent
 from apps.events.models import Event
 from apps.drugtemplates.models import DrugTemplate, PrescriptionTemplate, PrescriptionTemplateItem
+from apps.core.api.http_cache import reference_cache
 
 
 class ImmutableUnaccent(Func):
@@ -64,14 +67,7 @@ class OutpatientPrescriptionListView(LoginRequiredMixin, ListView):
         # Filter by patient access permissions (single hospital configuration)
         # All users can access all patients in the single hospital setup
 
-        # Optimize patient access check with bulk operations
-        from apps.core.permissions.cache import get_user_accessible_patients
-
-        accessible_patient_ids = get_user_accessible_patients(self.request.user)
-        if accessible_patient_ids:
-            queryset = queryset.filter(patient__id__in=accessible_patient_ids)
-        else:
-            queryset = queryset.none()
+        queryset = queryset.filter(patient_access_filter(self.request.user, "patient"))
 
         # Search functionality
         search_query = self.request.GET.get("search", "")
@@ -128,21 +124,15 @@ class OutpatientPrescriptionListView(LoginRequiredMixin, ListView):
         context["selected_creator"] = self.request.GET.get("creator", "")
 
         # Cache key for filter options
-        cache_key = f"prescriptions_filters_{self.request.user.id}"
+        cache_key = f"prescriptions_filters_{get_patient_access_scope(self.request.user)}"
 
         # Try to get filter options from cache
         filter_options = cache.get(cache_key)
         if filter_options is None:
             # Get available patients for filter dropdown (only accessible ones)
-            from apps.core.permissions.cache import get_user_accessible_patients
-
-            accessible_patient_ids = get_user_accessible_patients(self.request.user)
-            if accessible_patient_ids:
-                accessible_patients = Patient.objects.filter(
-                    id__in=accessible_patient_ids
-                ).only("id", "name", "fiscal_number")
-            else:
-                accessible_patients = Patient.objects.none()
+            accessible_patients = Patient.objects.filter(
+                patient_access_filter(self.request.user)
+            ).only("id", "name", "fiscal_number")
 
             # Get available creators (users who have created prescriptions)
             from django.contrib.auth import get_user_model
@@ -150,8 +140,8 @@ class OutpatientPrescriptionListView(LoginRequiredMixin, ListView):
             User = get_user_model()
             available_creators = (
                 User.objects.filter(
+                    patient_access_filter(self.request.user, "event_set__patient"),
                     event_set__event_type=Event.OUTPT_PRESCRIPTION_EVENT,
-                    event_set__patient__id__in=accessible_patient_ids
                 )
                 .distinct()
                 .only("id", "first_name", "last_name", "email")
@@ -240,26 +230,8 @@ class OutpatientPrescriptionCreateView(LoginRequiredMixin, PermissionRequiredMix
         formset_data = PrescriptionItemFormSetHelper.prepare_formset_data(formset)
         context.update(formset_data)
         
-        # Add drug templates for manual entry/autocomplete functionality
-        context['drug_templates'] = DrugTemplate.objects.filter(
-            Q(creator=self.request.user) | Q(is_public=True)
-        ).order_by('name')
-        
-        # Add prescription templates (multi-drug templates)
-        context['prescription_templates'] = PrescriptionTemplate.objects.filter(
-            Q(creator=self.request.user) | Q(is_public=True)
-        ).prefetch_related('items').order_by('name')
-        
-        # Add available patients for selection if no patient specified
-        if not patient:
-            from apps.core.permissions.cache import get_user_accessible_patients
-            accessible_patient_ids = get_user_accessible_patients(self.request.user)
-            if accessible_patient_ids:
-                context['available_patients'] = Patient.objects.filter(
-                    id__in=accessible_patient_ids
-                ).only("id", "name", "fiscal_number").order_by('name')
-            else:
-                context['available_patients'] = Patient.objects.none()
+        # Drug templates, prescription templates and patients are not listed
+        # here: the form looks them up through the AJAX search endpoints.
         
         return context
     
@@ -304,6 +276,7 @@ class OutpatientPrescriptionCreateView(LoginRequiredMixin, PermissionRequiredMix
 
 
 @login_required
+@reference_cache(DrugTemplate, max_age=None, per_user=True)
 def get_drug_template_data(request, template_id):
     """
     AJAX view to get drug template data by ID.
@@ -331,13 +304,14 @@ def get_drug_template_data(request, template_id):
 
 
 @login_required
+@reference_cache(DrugTemplate, max_age=None, per_user=True)
 def search_drug_templates(request):
     """
     AJAX view to search both drug templates and prescription template items for autocomplete functionality.
     Returns unified results including individual drug templates and complete prescription items.
     """
     query = request.GET.get('q', '').strip()
-    limit = min(int(request.GET.get('limit', 10)), 50)  # Max 50 results
+    limit, offset, page = _typeahead_page(request, default_limit=10)
     
     if len(query) < 2:
         return JsonResponse({'results': []})
@@ -347,6 +321,8 @@ def search_drug_templates(request):
         
         # Search individual drug templates only (accent- and case-insensitive)
         # Wrap query as a literal to avoid Django treating it as a field name.
+        # Both sides are already lowered and unaccented: __contains compiles
+        # to a plain LIKE that the gin_trgm_ops index on the name can serve.
         normalized_query = ImmutableUnaccent(Lower(Value(query)))
         drug_templates = (
             DrugTemplate.objects.filter(Q(creator=request.user) | Q(is_public=True))
@@ -356,15 +332,17 @@ def search_drug_templates(request):
                 form_normalized=ImmutableUnaccent(Lower("pharmaceutical_form")),
             )
             .filter(
-                Q(name_normalized__icontains=normalized_query)
-                | Q(concentration_normalized__icontains=normalized_query)
-                | Q(form_normalized__icontains=normalized_query)
+                Q(name_normalized__contains=normalized_query)
+                | Q(concentration_normalized__contains=normalized_query)
+                | Q(form_normalized__contains=normalized_query)
             )
             .select_related("creator")
-            .order_by("name")[:limit]
+            .order_by("name", "id")[offset:offset + limit + 1]
         )
+        drug_templates = list(drug_templates)
+        has_next = len(drug_templates) > limit
         
-        for template in drug_templates:
+        for template in drug_templates[:limit]:
             results.append({
                 'id': str(template.id),
                 'name': template.name,
@@ -382,13 +360,65 @@ def search_drug_templates(request):
         return JsonResponse({
             'results': results,
             'total': len(results),
-            'query': query
+            'query': query,
+            'page': page,
+            'has_next': has_next,
         })
         
     except Exception as e:
         return JsonResponse({'error': 'Erro na busca'}, status=500)
 
 
+@login_required
+def search_prescription_templates(request):
+    """
+    AJAX view to search prescription templates for the template picker.
+    An empty query lists the first page of templates in name order.
+    """
+    query = request.GET.get('q', '').strip()
+    limit, offset, page = _typeahead_page(request, default_limit=20)
+    
+    templates = (
+        PrescriptionTemplate.objects.filter(Q(creator=request.user) | Q(is_public=True))
+        .annotate(items_count=Count("items"))
+    )
+    if query:
+        # Plain LIKE on the normalized name, served by prescriptiontpl_name_trgm_idx
+        templates = templates.annotate(
+            name_normalized=ImmutableUnaccent(Lower("name"))
+        ).filter(name_normalized__contains=ImmutableUnaccent(Lower(Value(query))))
+    templates = list(
+        templates.only("id", "name").order_by("name", "id")[offset:offset + limit + 1]
+    )
+    
+    results = [
+        {
+            'id': str(template.id),
+            'name': template.name,
+            'items_count': template.items_count,
+            'display_text': f"{template.name} ({template.items_count} medicamentos)",
+        }
+        for template in templates[:limit]
+    ]
+    
+    return JsonResponse({
+        'results': results,
+        'query': query,
+        'page': page,
+        'has_next': len(templates) > limit,
+    })
+
+
+def _typeahead_page(request, default_limit):
+    """Return (limit, offset, page) from the limit/page query parameters."""
+    try:
+        limit = min(max(int(request.GET.get('limit', default_limit)), 1), 50)  # Max 50 results
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        limit, page = default_limit, 1
+    return limit, (page - 1) * limit, page
+
+
 class OutpatientPrescriptionDetailView(LoginRequiredMixin, DetailView):
     """
     Detail view for OutpatientPrescription instances showing complete prescription information.
@@ -488,16 +518,6 @@ class OutpatientPrescriptionUpdateView(LoginRequiredMixin, PermissionRequiredMix
         formset_data = PrescriptionItemFormSetHelper.prepare_formset_data(formset)
         context.update(formset_data)
         
-        # Add drug templates for AJAX functionality
-        context['drug_templates'] = DrugTemplate.objects.filter(
-            Q(creator=self.request.user) | Q(is_public=True)
-        ).order_by('name')
-        
-        # Add prescription templates (multi-drug templates)
-        context['prescription_templates'] = PrescriptionTemplate.objects.filter(
-            Q(creator=self.request.user) | Q(is_public=True)
-        ).prefetch_related('items').order_by('name')
-        
         # Add permission information
         context['can_edit'] = can_edit_event(self.request.user, self.object)
         context['can_delete'] = can_delete_event(self.request.user, self.object)
@@ -1,4 +1,5 @@
 from django import forms
+from django.core.exceptions import ValidationError
 from django.utils.safestring import mark_safe
 from django.utils.html import format_html
 from django.db import models
@@ -84,6 +85,49 @@ class DrugTemplateField(forms.ModelChoiceField):
         return f"{obj.name} - {obj.presentation}"
 
 
+class TypeaheadSelect(forms.Select):
+    """
+    Select for a ModelChoiceField that renders only the selected option.
+
+    The remaining options are fetched by the page from a JSON search
+    endpoint (data-search-url), so rendering the form does not load the
+    whole queryset.
+    """
+
+    def __init__(self, search_url, placeholder='', min_chars=2, attrs=None):
+        self.search_url = search_url
+        self.placeholder = placeholder
+        self.min_chars = min_chars
+        super().__init__(attrs)
+
+    def get_context(self, name, value, attrs):
+        """Add the search endpoint for the typeahead script."""
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs'].update({
+            'data-search-url': str(self.search_url),
+            'data-min-chars': self.min_chars,
+        })
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        """Build the empty option plus the options of the selected objects."""
+        selected = [str(v) for v in value if v not in (None, '')]
+        options = [self.create_option(name, '', self.placeholder, not selected, 0)]
+
+        if selected:
+            field = self.choices.field
+            try:
+                objects = list(self.choices.queryset.filter(pk__in=selected))
+            except (ValueError, ValidationError):
+                objects = []  # invalid submitted value, reported by the field
+            for index, obj in enumerate(objects, start=1):
+                options.append(self.create_option(
+                    name, str(field.prepare_value(obj)), field.label_from_instance(obj), True, index
+                ))
+
+        return [(None, options, 0)]
+
+
 class PrescriptionFormWidget(forms.Widget):
     """
     Custom widget for rendering prescription forms with enhanced functionality.
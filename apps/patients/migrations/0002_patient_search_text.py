@@ -0,0 +1,55 @@
+# Generated by Django 5.2.1 on 2026-10-18 22:22
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from apps.patients.search import SEARCH_TEXT_FIELDS, build_search_text
+
+
+def populate_search_text(apps, schema_editor):
+    Patient = apps.get_model('patients', 'Patient')
+    PatientRecordNumber = apps.get_model('patients', 'PatientRecordNumber')
+
+    record_numbers = {}
+    for patient_id, record_number in PatientRecordNumber.objects.values_list(
+        'patient_id', 'record_number'
+    ).iterator(chunk_size=2000):
+        record_numbers.setdefault(patient_id, []).append(record_number)
+
+    batch = []
+    for patient in Patient.objects.only('pk', *SEARCH_TEXT_FIELDS).iterator(chunk_size=2000):
+        values = {field: getattr(patient, field) for field in SEARCH_TEXT_FIELDS}
+        patient.search_text = build_search_text(values, record_numbers.get(patient.pk, []))
+        batch.append(patient)
+        if len(batch) >= 2000:
+            Patient.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    Patient.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='patient',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['fiscal_number'], name='patients_pa_fiscal__ad2216_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='patient_search_text_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
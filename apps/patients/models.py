@@ -2,12 +2,14 @@ import uuid
 from datetime import date
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.urls import reverse
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from simple_history.models import HistoricalRecords
 
 from apps.core.models.soft_delete import SoftDeleteModel
+from .search import SEARCH_TEXT_FIELDS, build_search_text
 from .validators import (
     validate_record_number_format,
     validate_admission_datetime,
@@ -703,6 +705,9 @@ class Patient(SoftDeleteModel):
         help_text="Total de dias internado ao longo de todas as internações",
     )
 
+    # Denormalized, normalized name and identifiers for trigram search
+    search_text = models.TextField(blank=True, default="", editable=False)
+
     # Tags are now accessed via reverse relationship: patient.patient_tags.all()
 
     # Tracking fields
@@ -723,6 +728,7 @@ class Patient(SoftDeleteModel):
     history = HistoricalRecords(
         history_change_reason_field=models.TextField(null=True),
         cascade_delete_history=False,
+        excluded_fields=["search_text"],
     )
 
     class Meta:
@@ -739,6 +745,12 @@ class Patient(SoftDeleteModel):
             models.Index(fields=['current_admission_id']),  # For admission lookups
             models.Index(fields=['last_admission_date']),  # For date-based queries
             models.Index(fields=['last_discharge_date']),  # For date-based queries
+            models.Index(fields=['fiscal_number']),  # For exact CPF lookups
+            GinIndex(
+                fields=['search_text'],
+                opclasses=['gin_trgm_ops'],
+                name='patient_search_text_trgm_idx',
+            ),
         ]
 
     def __str__(self):
@@ -776,8 +788,35 @@ class Patient(SoftDeleteModel):
         # Run validation
         self.full_clean()
 
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or not set(SEARCH_TEXT_FIELDS).isdisjoint(update_fields):
+            values = {field: getattr(self, field) for field in SEARCH_TEXT_FIELDS}
+            self.search_text = build_search_text(values, self._record_number_values())
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_text'}
+
         super().save(*args, **kwargs)
 
+    def _record_number_values(self):
+        if self._state.adding:
+            return []
+        return list(
+            PatientRecordNumber.objects.filter(patient_id=self.pk).values_list('record_number', flat=True)
+        )
+
+    @classmethod
+    def refresh_search_text(cls, patient_id):
+        """Rebuild search_text from the stored patient and record numbers."""
+        values = cls.all_objects.filter(pk=patient_id).values(*SEARCH_TEXT_FIELDS).first()
+        if values is None:
+            return
+        record_numbers = PatientRecordNumber.objects.filter(
+            patient_id=patient_id
+        ).values_list('record_number', flat=True)
+        cls.all_objects.filter(pk=patient_id).update(
+            search_text=build_search_text(values, record_numbers)
+        )
+
     def _update_admission_discharge_dates(self, previous_status):
         """Update admission and discharge dates based on status changes"""
         current_date = timezone.now().date()
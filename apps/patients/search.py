@@ -0,0 +1,92 @@
+"""
+Patient lookup by name and identifiers.
+
+Patient.search_text holds the name, document numbers and every record
+number the patient ever had, unaccented and lowercased, behind a pg_trgm
+GIN index. Exact record numbers and CPFs are tried first on their btree
+indexes; only when nothing matches exactly does the substring search run.
+"""
+
+import re
+import unicodedata
+
+from django.db.models import Q
+
+CPF_LENGTH = 11
+
+# Patient fields copied into search_text
+SEARCH_TEXT_FIELDS = (
+    'name',
+    'healthcard_number',
+    'id_number',
+    'fiscal_number',
+    'current_record_number',
+)
+
+
+def normalize_search_text(text):
+    """Lowercase text, strip accents and collapse whitespace."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.lower().split())
+
+
+def build_search_text(values, record_numbers=()):
+    """
+    Build the search_text of a patient.
+
+    Args:
+        values: Mapping with the SEARCH_TEXT_FIELDS of the patient
+        record_numbers: Current and historical record numbers
+
+    Returns:
+        str: One normalized value per line, without duplicates
+    """
+    parts = []
+    for value in [*(values[field] for field in SEARCH_TEXT_FIELDS), *record_numbers]:
+        normalized = normalize_search_text(value)
+        if normalized and normalized not in parts:
+            parts.append(normalized)
+    return '\n'.join(parts)
+
+
+def cpf_variants(query):
+    """Return the stored forms of a CPF typed with or without punctuation."""
+    if not re.fullmatch(r'[\d.\-\s]+', query):
+        return []
+    digits = re.sub(r'\D', '', query)
+    if len(digits) != CPF_LENGTH:
+        return []
+    return [digits, f'{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:]}']
+
+
+def search_patients(queryset, query):
+    """
+    Filter patients matching a search query.
+
+    Args:
+        queryset: Patient queryset to search in
+        query: Name fragment, document number or record number
+
+    Returns:
+        QuerySet: Exact record number/CPF matches if there are any,
+        otherwise patients whose search_text contains the query
+    """
+    from .models import PatientRecordNumber
+
+    query = ' '.join(query.split())
+
+    exact = Q(current_record_number=query) | Q(
+        pk__in=PatientRecordNumber.objects.filter(record_number=query).values('patient_id')
+    )
+    variants = cpf_variants(query)
+    if variants:
+        exact |= Q(fiscal_number__in=variants)
+
+    exact_matches = queryset.filter(exact)
+    if exact_matches.exists():
+        return exact_matches
+
+    return queryset.filter(search_text__contains=normalize_search_text(query))
@@ -135,6 +135,13 @@ def update_patient_record_number(sender, instance, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=PatientRecordNumber)
+@receiver(post_delete, sender=PatientRecordNumber)
+def refresh_patient_search_text(sender, instance, **kwargs):
+    """Keep historical record numbers searchable on the patient"""
+    Patient.refresh_search_text(instance.patient_id)
+
+
 @receiver(pre_save, sender=PatientAdmission)
 def validate_admission_change(sender, instance, **kwargs):
     """Validate admission changes before saving"""
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.patients.models import Patient
+from apps.patients.search import cpf_variants, normalize_search_text, search_patients
+
+
+User = get_user_model()
+
+
+class SearchTextNormalizationTests(SimpleTestCase):
+    def test_normalize_search_text(self):
+        self.assertEqual(normalize_search_text("  JOÃO  da   Conceição "), "joao da conceicao")
+
+    def test_cpf_variants(self):
+        self.assertEqual(cpf_variants("123.456.789-01"), ["12345678901", "123.456.789-01"])
+        self.assertEqual(cpf_variants("12345678901"), ["12345678901", "123.456.789-01"])
+        self.assertEqual(cpf_variants("1234"), [])
+        self.assertEqual(cpf_variants("joao 12345678901"), [])
+
+
+class PatientSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="patient-search-user",
+            email="patient-search-user@example.com",
+            password="testpass123",
+            password_change_required=False,
+            terms_accepted=True,
+            terms_accepted_at=timezone.now(),
+        )
+        self.joao = self._create_patient("João da Conceição", fiscal_number="123.456.789-01")
+        self.maria = self._create_patient("Maria Joana", healthcard_number="700123")
+
+    def _create_patient(self, name, **fields):
+        return Patient.objects.create(
+            name=name,
+            birthday="1980-01-01",
+            status=Patient.Status.OUTPATIENT,
+            created_by=self.user,
+            updated_by=self.user,
+            **fields,
+        )
+
+    def _search(self, query):
+        return set(search_patients(Patient.objects.all(), query))
+
+    def test_search_text_built_on_save_and_refresh(self):
+        self.assertEqual(self.joao.search_text, "joao da conceicao\n123.456.789-01")
+
+        Patient.objects.filter(pk=self.joao.pk).update(healthcard_number="CNS 898")
+        Patient.refresh_search_text(self.joao.pk)
+        self.joao.refresh_from_db()
+
+        self.assertEqual(self.joao.search_text, "joao da conceicao\ncns 898\n123.456.789-01")
+
+    def test_fuzzy_search_on_name_and_documents(self):
+        self.assertEqual(self._search("CONCEICAO"), {self.joao})
+        self.assertEqual(self._search("jo"), {self.joao, self.maria})
+        self.assertEqual(self._search("0012"), {self.maria})
+
+    def test_historical_record_numbers_are_searchable(self):
+        self.joao.update_current_record_number("HC-100", self.user)
+        self.joao.update_current_record_number("HC-200", self.user)
+
+        self.assertEqual(self._search("hc-1"), {self.joao})
+        self.assertEqual(self._search("HC-200"), {self.joao})
+
+    def test_exact_record_number_short_circuits_fuzzy_search(self):
+        self.joao.update_current_record_number("123", self.user)
+        self.maria.update_current_record_number("1234", self.user)
+
+        self.assertEqual(self._search("123"), {self.joao})
+        self.assertEqual(self._search("12"), {self.joao, self.maria})
+
+    def test_exact_cpf_match_with_or_without_punctuation(self):
+        self.assertEqual(self._search("12345678901"), {self.joao})
+        self.assertEqual(self._search("123.456.789-01"), {self.joao})
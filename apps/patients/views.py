@@ -6,13 +6,14 @@ from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.contrib import messages
 from django.shortcuts import get_object_or_404, redirect, render
-from django.db.models import Q, Case, When, IntegerField
+from django.db.models import Case, When, IntegerField
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.http import JsonResponse
 from django.views import View
 from django.utils import timezone
 
 from .models import Patient, AllowedTag, Tag, PatientRecordNumber, PatientAdmission, Ward
+from .search import search_patients
 from .forms import (
     PatientForm, PatientProfileForm, AllowedTagForm, 
     PatientRecordNumberForm, QuickRecordNumberUpdateForm,
@@ -55,14 +56,7 @@ class PatientListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
         # Search functionality
         search_query = self.request.GET.get('q', '').strip()
         if search_query:
-            queryset = queryset.filter(
-                Q(name__unaccent__icontains=search_query) |
-                Q(healthcard_number__icontains=search_query) |
-                Q(id_number__icontains=search_query) |
-                Q(fiscal_number__icontains=search_query) |
-                Q(current_record_number__icontains=search_query) |
-                Q(record_numbers__record_number__icontains=search_query)
-            ).distinct()
+            queryset = search_patients(queryset, search_query)
 
         # Status filter
         status_filter = self.request.GET.get('status')
@@ -356,7 +350,6 @@ from django.http import JsonResponse
 from django.views import View
 from django.core.serializers import serialize
 from django.core.paginator import Paginator
-from django.db.models import Q
 from django.utils import timezone
 import json
 
@@ -861,15 +854,8 @@ class PatientSearchAPIView(LoginRequiredMixin, View):
         if not query:
             return JsonResponse({'results': [], 'total': 0, 'page': page})
 
-        # Search in multiple fields including record numbers
-        patients = Patient.objects.filter(
-            Q(name__unaccent__icontains=query) |
-            Q(healthcard_number__icontains=query) |
-            Q(id_number__icontains=query) |
-            Q(fiscal_number__icontains=query) |
-            Q(current_record_number__icontains=query) |
-            Q(record_numbers__record_number__icontains=query)
-        ).distinct().order_by('name')
+        # Search name, documents and current/historical record numbers
+        patients = search_patients(Patient.objects.all(), query).order_by('name')
 
         # Pagination
         paginator = Paginator(patients, per_page)
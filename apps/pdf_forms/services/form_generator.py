@@ -197,13 +197,14 @@ class DynamicFormGenerator:
                         self.add_error(display_field, "Selecione um procedimento válido da lista.")
                     else:
                         from apps.core.models import MedicalProcedure
-                        try:
-                            procedure = MedicalProcedure.active().get(code__iexact=code_value)
-                        except MedicalProcedure.DoesNotExist:
+                        from apps.core.services.reference_index import get_reference_index
+                        procedure = get_reference_index(MedicalProcedure).get_by_code(code_value)
+                        if (
+                            procedure is None
+                            or not procedure.is_active
+                            or procedure.description.strip() != description_value
+                        ):
                             self.add_error(display_field, "Selecione um procedimento válido da lista.")
-                        else:
-                            if procedure.description.strip() != description_value:
-                                self.add_error(display_field, "Selecione um procedimento válido da lista.")
 
                 cleaned_data.pop(display_field, None)
             return cleaned_data
@@ -16,7 +16,8 @@ from ..models import PDFFormTemplate, PDFFormSubmission
 from ..permissions import check_pdf_form_access, check_pdf_form_creation
 from ..security import PDFFormSecurity
 from ..services.field_mapping import DataFieldMapper
-from apps.core.models import MedicalProcedure
+from apps.core.models import Icd10Code, MedicalProcedure
+from apps.core.services.reference_index import get_reference_entries
 
 logger = logging.getLogger(__name__)
 
@@ -377,12 +378,7 @@ class APACForm(forms.Form):
                     self.add_error(field, "Procedimento duplicado. Escolha outro.")
 
         if selected_ids:
-            valid_ids = set(
-                str(proc_id) for proc_id in MedicalProcedure.objects.filter(
-                    id__in=list(selected_ids.keys()),
-                    is_active=True
-                ).values_list('id', flat=True)
-            )
+            valid_ids = get_reference_entries(MedicalProcedure, selected_ids, active_only=True)
             for proc_id, display_fields in selected_ids.items():
                 if proc_id not in valid_ids:
                     for field in display_fields:
@@ -407,13 +403,7 @@ class APACForm(forms.Form):
                 selected_icd_ids.setdefault(icd_id_str, []).append(display_field)
 
         if selected_icd_ids:
-            from apps.core.models import Icd10Code
-            valid_icd_ids = set(
-                str(code_id) for code_id in Icd10Code.objects.filter(
-                    id__in=list(selected_icd_ids.keys()),
-                    is_active=True
-                ).values_list('id', flat=True)
-            )
+            valid_icd_ids = get_reference_entries(Icd10Code, selected_icd_ids, active_only=True)
             for icd_id, display_fields in selected_icd_ids.items():
                 if icd_id not in valid_icd_ids:
                     for field in display_fields:
@@ -494,7 +484,7 @@ class APACFormView(LoginRequiredMixin, FormView):
                 for slot in APACForm.PROCEDURE_SLOTS
             }
             selected_ids = [proc_id for proc_id in procedure_ids.values() if proc_id]
-            procedures = MedicalProcedure.objects.in_bulk(selected_ids)
+            procedures = get_reference_entries(MedicalProcedure, selected_ids)
 
             # Get ICD-10 codes
             icd10_ids = {
@@ -503,8 +493,7 @@ class APACFormView(LoginRequiredMixin, FormView):
                 'other_icd_id': form.cleaned_data.get('other_icd_id'),
             }
             selected_icd_ids = [icd_id for icd_id in icd10_ids.values() if icd_id]
-            from apps.core.models import Icd10Code
-            icd10_codes = Icd10Code.objects.in_bulk(selected_icd_ids)
+            icd10_codes = get_reference_entries(Icd10Code, selected_icd_ids)
 
             # Prepare form data for storage
             def resolve_icd_code(fallback_key, display_key, icd_id):
@@ -5,3 +5,6 @@ class ResearchConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.research'
     verbose_name = 'Clinical Research'
+
+    def ready(self):
+        import apps.research.signals
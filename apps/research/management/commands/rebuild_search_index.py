@@ -0,0 +1,102 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.dailynotes.signals import search_index_updated
+from apps.events.models import Event
+from apps.research.models import EventSearchEntry
+from apps.research.search_index import SEARCHABLE_EVENTS, index_events
+
+
+class Command(BaseCommand):
+    help = 'Build or refresh the unified research search index for clinical events'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event-type',
+            type=int,
+            action='append',
+            dest='event_types',
+            help='Only index this event type code (repeatable; default: all searchable types)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of events indexed per statement (default: 1000)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to pause between batches to limit database load (default: 0)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be done without making changes',
+        )
+
+    def handle(self, *args, **options):
+        event_types = options['event_types'] or sorted(SEARCHABLE_EVENTS)
+        unknown = set(event_types) - set(SEARCHABLE_EVENTS)
+        if unknown:
+            raise CommandError(f'Event types not searchable: {sorted(unknown)}')
+
+        self.batch_size = options['batch_size']
+        self.pause = options['sleep']
+        dry_run = options['dry_run']
+
+        for event_type in event_types:
+            model, _ = SEARCHABLE_EVENTS[event_type]
+            total = model.objects.count()
+            label = dict(Event.EVENT_TYPE_CHOICES)[event_type]
+
+            if dry_run:
+                self.stdout.write(
+                    self.style.WARNING(f'DRY RUN: Would index {total} {label} records in batches of {self.batch_size}')
+                )
+                continue
+
+            self.stdout.write(f'Indexing {total} {label} records...')
+            indexed = self.index_model(model, total)
+            self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} {label} records'))
+
+        if dry_run:
+            return
+
+        # Entries of events soft-deleted outside save() (e.g. queryset updates)
+        removed, _ = EventSearchEntry.objects.filter(
+            event_type__in=event_types, event__is_deleted=True
+        ).delete()
+        if removed:
+            self.stdout.write(f'Removed {removed} entries of deleted events')
+
+        search_index_updated.send(sender=EventSearchEntry, note_ids=None)
+
+    def index_model(self, model, total):
+        """Index every live instance of a model, walking its primary key."""
+        queryset = model.objects.order_by('pk')
+        indexed = 0
+        last_pk = None
+
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(batch[:self.batch_size])
+            if not batch:
+                break
+
+            index_events(batch)
+            last_pk = batch[-1].pk
+            indexed += len(batch)
+
+            # Progress update
+            self.stdout.write(
+                f'Processed {indexed}/{total} records '
+                f'({(indexed/max(total, 1))*100:.1f}%)'
+            )
+
+            if self.pause:
+                time.sleep(self.pause)
+
+        return indexed
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-18 22:17
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('events', '0005_patientprofilechangeevent_alter_event_event_type_and_more'),
+        ('patients', '0001_initial'),
+        ('dailynotes', '0002_dailynote_search_vector_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSearchEntry',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_entry', serialize=False, to='events.event', verbose_name='Evento')),
+                ('event_type', models.PositiveSmallIntegerField(choices=[(0, 'Anamnese e Exame Físico'), (1, 'Evolução'), (2, 'Nota/Observação'), (3, 'Imagem'), (4, 'Resultado de Exame'), (5, 'Requisição de Exame'), (6, 'Relatório de Alta'), (7, 'Receita'), (8, 'Relatório'), (9, 'Série de Fotos'), (10, 'Vídeo Curto'), (11, 'Formulário PDF'), (12, 'Alteração de Prontuário'), (13, 'Admissão Hospitalar'), (14, 'Alta Hospitalar'), (15, 'Alteração de Status'), (16, 'Admissão de Emergência'), (17, 'Transferência'), (18, 'Declaração de Óbito'), (19, 'Status Ambulatorial'), (20, 'Tag Adicionada'), (21, 'Tag Removida'), (22, 'Tags Removidas em Lote'), (23, 'Termo de Consentimento'), (24, 'Alteração de Perfil')], verbose_name='Tipo de Evento')),
+                ('event_datetime', models.DateTimeField(verbose_name='Data e Hora do Evento')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField()),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='patients.patient', verbose_name='Paciente')),
+            ],
+            options={
+                'verbose_name': 'Entrada do Índice de Busca',
+                'verbose_name_plural': 'Índice de Busca',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_gin_idx')],
+            },
+        ),
+        # Daily notes already have vectors. Every other event type is only
+        # searchable once `manage.py rebuild_search_index` has been run after
+        # deploying this migration.
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO research_eventsearchentry
+                    (event_id, patient_id, event_type, event_datetime, search_vector)
+                SELECT e.id, e.patient_id, e.event_type, e.event_datetime, dn.search_vector
+                FROM dailynotes_dailynote dn
+                JOIN events_event e ON e.id = dn.event_ptr_id
+                WHERE dn.search_vector IS NOT NULL AND NOT e.is_deleted
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
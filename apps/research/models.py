@@ -1,3 +1,43 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
-# Create your models here.
+from apps.events.models import Event
+
+
+class EventSearchEntry(models.Model):
+    """
+    Full-text search document of one text-bearing clinical event.
+
+    One row per indexed event, whatever its type, so research search can
+    rank, filter by type and date, and group by patient on a single table.
+    Maintained on save by apps.research.search_index.
+    """
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_entry',
+        verbose_name="Evento",
+    )
+    patient = models.ForeignKey(
+        "patients.Patient",
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Paciente",
+    )
+    event_type = models.PositiveSmallIntegerField(
+        choices=Event.EVENT_TYPE_CHOICES, verbose_name="Tipo de Evento"
+    )
+    event_datetime = models.DateTimeField(verbose_name="Data e Hora do Evento")
+    search_vector = SearchVectorField()
+
+    def __str__(self):
+        return f"{self.get_event_type_display()} - {self.event_id}"
+
+    class Meta:
+        verbose_name = "Entrada do Índice de Busca"
+        verbose_name_plural = "Índice de Busca"
+        indexes = [
+            GinIndex(fields=['search_vector'], name='event_search_gin_idx'),
+        ]
@@ -0,0 +1,116 @@
+"""
+Unified full-text index over text-bearing clinical events.
+
+Every searchable event has one EventSearchEntry holding its patient, type,
+date and tsvector, so research search runs on a single GIN-indexed table
+instead of one column per note model.
+"""
+
+from django.contrib.postgres.search import SearchVector
+from django.db.models import Value
+
+from apps.dailynotes.models import DailyNote, sanitize_content_for_search
+from apps.dischargereports.models import DischargeReport
+from apps.events.models import Event
+from apps.historyandphysicals.models import HistoryAndPhysical
+from apps.outpatientprescriptions.models import OutpatientPrescription
+from apps.simplenotes.models import SimpleNote
+
+from .models import EventSearchEntry
+
+# Indexed model and text fields of each searchable event type
+SEARCHABLE_EVENTS = {
+    Event.HISTORY_AND_PHYSICAL_EVENT: (HistoryAndPhysical, ('content',)),
+    Event.DAILY_NOTE_EVENT: (DailyNote, ('content',)),
+    Event.SIMPLE_NOTE_EVENT: (SimpleNote, ('content',)),
+    Event.DISCHARGE_REPORT_EVENT: (DischargeReport, (
+        'admission_history',
+        'problems_and_diagnosis',
+        'exams_list',
+        'procedures_list',
+        'inpatient_medical_history',
+        'discharge_status',
+        'discharge_recommendations',
+    )),
+    Event.OUTPT_PRESCRIPTION_EVENT: (OutpatientPrescription, ('instructions',)),
+}
+
+# Event fields copied to the entry, or deciding whether it exists
+ENTRY_EVENT_FIELDS = frozenset({'patient', 'event_type', 'event_datetime', 'is_deleted'})
+
+
+def get_search_text(event):
+    """Return the text indexed for an event of a searchable type."""
+    _, fields = SEARCHABLE_EVENTS[event.event_type]
+    return '\n'.join(filter(None, (getattr(event, field) for field in fields)))
+
+
+def affects_search_entry(event, update_fields):
+    """Whether a save with these update_fields can change the event's entry."""
+    if update_fields is None:
+        return True
+    _, fields = SEARCHABLE_EVENTS[event.event_type]
+    return not ENTRY_EVENT_FIELDS.isdisjoint(update_fields) or not set(fields).isdisjoint(update_fields)
+
+
+def index_events(events):
+    """
+    Insert or refresh the search entries of events in one statement.
+
+    Soft-deleted events have their entries removed instead.
+
+    Args:
+        events: Instances of the models in SEARCHABLE_EVENTS
+    """
+    deleted_ids = [event.pk for event in events if event.is_deleted]
+    if deleted_ids:
+        EventSearchEntry.objects.filter(event_id__in=deleted_ids).delete()
+
+    entries = [
+        EventSearchEntry(
+            event_id=event.pk,
+            patient_id=event.patient_id,
+            event_type=event.event_type,
+            event_datetime=event.event_datetime,
+            search_vector=SearchVector(
+                Value(sanitize_content_for_search(get_search_text(event))), config='portuguese'
+            ),
+        )
+        for event in events
+        if not event.is_deleted
+    ]
+    if entries:
+        EventSearchEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['event'],
+            update_fields=['patient', 'event_type', 'event_datetime', 'search_vector'],
+        )
+
+
+def search_document_sql(entry_alias):
+    """
+    Return SQL giving the original text of the event behind an entry.
+
+    Used for ts_headline on the few entries shown, since the index only
+    stores vectors.
+
+    Args:
+        entry_alias: Alias of a row with event_id and event_type columns
+
+    Returns:
+        tuple: (document expression, LEFT JOIN clauses)
+    """
+    cases = []
+    joins = []
+    for event_type, (model, fields) in sorted(SEARCHABLE_EVENTS.items()):
+        alias = f'doc_{event_type}'
+        opts = model._meta
+        columns = ', '.join(f'{alias}.{opts.get_field(field).column}' for field in fields)
+        joins.append(
+            f'LEFT JOIN {opts.db_table} {alias} '
+            f'ON {alias}.{opts.pk.column} = {entry_alias}.event_id'
+        )
+        cases.append(f"WHEN {event_type} THEN concat_ws(E'\\n', {columns})")
+    document = f"CASE {entry_alias}.event_type {' '.join(cases)} END"
+    return document, '\n'.join(joins)
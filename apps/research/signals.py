@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.dailynotes.signals import search_index_updated
+
+from .search_index import SEARCHABLE_EVENTS, affects_search_entry, index_events
+from .utils import invalidate_search_cache
+
+
+def update_search_entry(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Refresh the search entry of a text-bearing event when it is saved."""
+    if raw or not affects_search_entry(instance, update_fields):
+        return
+    index_events([instance])
+    invalidate_search_cache()
+
+
+def invalidate_search_on_event_delete(sender, instance, **kwargs):
+    """Drop cached search results when an indexed event is removed."""
+    invalidate_search_cache()
+
+
+for _model, _fields in SEARCHABLE_EVENTS.values():
+    post_save.connect(update_search_entry, sender=_model, dispatch_uid=f'research_index_{_model.__name__}')
+    post_delete.connect(
+        invalidate_search_on_event_delete, sender=_model, dispatch_uid=f'research_unindex_{_model.__name__}'
+    )
+
+
+@receiver(search_index_updated)
+def invalidate_search_on_index_update(sender, **kwargs):
+    """Drop cached search results after search vectors are rebuilt in bulk."""
+    invalidate_search_cache()
@@ -0,0 +1,157 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from apps.dailynotes.models import DailyNote
+from apps.patients.models import Patient
+
+from apps.research.utils import (
+    iter_search_results,
+    perform_fulltext_search,
+    perform_fulltext_search_queryset,
+)
+
+
+User = get_user_model()
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="research-user",
+            email="research-user@example.com",
+            password="testpass123",
+            password_change_required=False,
+            terms_accepted=True,
+            terms_accepted_at=timezone.now(),
+            is_researcher=True,
+        )
+        self.frequent = self._create_patient("Maria da Silva")
+        self.single = self._create_patient("José Souza")
+        self.unrelated = self._create_patient("Ana Lima")
+
+        now = timezone.now()
+        self._create_note(self.frequent, "Paciente com diabetes descompensada.", now - timedelta(days=2))
+        self._create_note(self.frequent, "Ajuste de insulina para diabetes.", now - timedelta(days=1))
+        self._create_note(self.single, "Histórico de diabetes na família.", now)
+        self._create_note(self.unrelated, "Pós-operatório sem intercorrências.", now)
+
+    def _create_patient(self, name):
+        return Patient.objects.create(
+            name=name,
+            birthday="1970-05-01",
+            status=Patient.Status.OUTPATIENT,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def _create_note(self, patient, content, event_datetime):
+        return DailyNote.objects.create(
+            patient=patient,
+            description="Evolução diária",
+            content=content,
+            event_datetime=event_datetime,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def test_results_are_grouped_and_ranked(self):
+        results = perform_fulltext_search_queryset("diabetes")
+
+        self.assertEqual(len(results), 2)
+        first_page = results[0:1]
+
+        self.assertEqual(len(first_page), 1)
+        self.assertEqual(first_page[0]["patient"]["pk"], self.frequent.pk)
+        self.assertEqual(first_page[0]["total_matches"], 2)
+        self.assertEqual(first_page[0]["initials"], "M.D.S.")
+        self.assertEqual(results[1]["patient"]["pk"], self.single.pk)
+
+    def test_ranking_is_shared_between_requests(self):
+        self.assertEqual(perform_fulltext_search_queryset("diabetes", max_patients=500).count(), 2)
+
+        # Later pages and larger caps only load the patients they show
+        with self.assertNumQueries(1):
+            page = perform_fulltext_search_queryset("diabetes", max_patients=500)[1:2]
+        with self.assertNumQueries(1):
+            export = list(perform_fulltext_search_queryset("Diabetes", max_patients=1000))
+
+        self.assertEqual(page[0]["patient"]["pk"], self.single.pk)
+        self.assertEqual(len(export), 2)
+
+    def test_indexing_a_note_invalidates_cached_results(self):
+        self.assertEqual(perform_fulltext_search_queryset("diabetes").count(), 2)
+
+        note = self._create_note(self.unrelated, "Suspeita de diabetes.", timezone.now())
+        self.assertEqual(perform_fulltext_search_queryset("diabetes").count(), 3)
+
+        note.delete()
+        self.assertEqual(perform_fulltext_search_queryset("diabetes").count(), 2)
+
+    def test_headline_for_top_note_of_page_patients(self):
+        results = perform_fulltext_search("diabetes", page=2, per_page=1)
+
+        self.assertEqual(results["total_patients"], 2)
+        self.assertEqual(results["total_pages"], 2)
+        self.assertFalse(results["has_next"])
+        [patient_result] = results["patients"]
+        self.assertEqual(patient_result["patient"]["pk"], self.single.pk)
+        [top_note] = patient_result["matching_notes"]
+        self.assertIn("<b>diabetes</b>", top_note["headline"])
+
+    def test_clinical_search_view_paginates(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("apps.research:clinical_search"), {"q": "diabetes"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["page_obj"].paginator.count, 2)
+        self.assertEqual(len(response.context["patients"]), 2)
+
+    def test_iter_search_results_is_uncapped_and_ranked(self):
+        results = list(iter_search_results("diabetes", chunk_size=1))
+
+        self.assertEqual([r["patient"]["pk"] for r in results], [self.frequent.pk, self.single.pk])
+        self.assertEqual(results[0]["total_matches"], 2)
+        self.assertEqual(results[0]["initials"], "M.D.S.")
+
+    def test_export_streams_csv(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse("apps.research:export_search_results"), {"q": "diabetes", "format": "csv"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+        self.assertEqual(lines[0].split(",")[:2], ["Prontuário", "Iniciais"])
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith("N/A,M.D.S.,"))
+
+    def test_export_streams_xlsx(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("apps.research:export_search_results"), {"q": "diabetes"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        rows = list(workbook.active.values)
+        self.assertEqual(rows[0][0], "Prontuário")
+        self.assertEqual([row[1] for row in rows[1:]], ["M.D.S.", "J.S."])
+        self.assertEqual(rows[1][5], 2)
+
+    def test_export_without_results_redirects(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("apps.research:export_search_results"), {"q": "inexistente"})
+
+        self.assertRedirects(response, reverse("apps.research:clinical_search"), fetch_redirect_response=False)
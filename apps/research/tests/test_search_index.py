@@ -0,0 +1,129 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.dailynotes.models import DailyNote
+from apps.events.models import Event
+from apps.outpatientprescriptions.models import OutpatientPrescription
+from apps.patients.models import Patient
+from apps.research.models import EventSearchEntry
+from apps.research.utils import perform_fulltext_search, perform_fulltext_search_queryset
+from apps.simplenotes.models import SimpleNote
+
+
+User = get_user_model()
+
+
+class EventSearchIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="index-user",
+            email="index-user@example.com",
+            password="testpass123",
+            password_change_required=False,
+            terms_accepted=True,
+            terms_accepted_at=timezone.now(),
+            is_researcher=True,
+        )
+        self.daily_patient = self._create_patient("Maria da Silva")
+        self.simple_patient = self._create_patient("José Souza")
+        self.prescription_patient = self._create_patient("Ana Lima")
+
+        self.now = timezone.now()
+        self.daily_note = self._create_event(
+            DailyNote, self.daily_patient, content="Curativo com sinais de infecção.",
+            event_datetime=self.now - timedelta(days=30),
+        )
+        self.simple_note = self._create_event(
+            SimpleNote, self.simple_patient, content="Familiar relata infecção urinária prévia.",
+            event_datetime=self.now,
+        )
+        self.prescription = self._create_event(
+            OutpatientPrescription, self.prescription_patient,
+            instructions="Tomar o antibiótico até o fim do tratamento da infecção.",
+            event_datetime=self.now - timedelta(days=1),
+        )
+
+    def _create_patient(self, name):
+        return Patient.objects.create(
+            name=name,
+            birthday="1970-05-01",
+            status=Patient.Status.OUTPATIENT,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def _create_event(self, model, patient, **fields):
+        return model.objects.create(
+            patient=patient,
+            description="Registro clínico",
+            created_by=self.user,
+            updated_by=self.user,
+            **fields,
+        )
+
+    def _patient_ids(self, results):
+        return {result["patient"]["pk"] for result in results}
+
+    def test_all_text_bearing_events_are_indexed(self):
+        entries = EventSearchEntry.objects.order_by("event_type")
+
+        self.assertEqual(
+            [(entry.event_id, entry.event_type) for entry in entries],
+            [
+                (self.daily_note.pk, Event.DAILY_NOTE_EVENT),
+                (self.simple_note.pk, Event.SIMPLE_NOTE_EVENT),
+                (self.prescription.pk, Event.OUTPT_PRESCRIPTION_EVENT),
+            ],
+        )
+        self.assertEqual(
+            self._patient_ids(perform_fulltext_search_queryset("infecção")),
+            {self.daily_patient.pk, self.simple_patient.pk, self.prescription_patient.pk},
+        )
+
+    def test_filter_by_event_type_and_date_range(self):
+        simple_only = perform_fulltext_search_queryset(
+            "infecção", event_types=[Event.SIMPLE_NOTE_EVENT]
+        )
+        self.assertEqual(self._patient_ids(simple_only), {self.simple_patient.pk})
+
+        recent = perform_fulltext_search_queryset(
+            "infecção", date_from=(self.now - timedelta(days=7)).date(), date_to=self.now.date()
+        )
+        self.assertEqual(self._patient_ids(recent), {self.simple_patient.pk, self.prescription_patient.pk})
+
+    def test_headline_uses_text_of_matching_event_type(self):
+        results = perform_fulltext_search("tratamento")
+
+        [patient_result] = results["patients"]
+        [top_note] = patient_result["matching_notes"]
+        self.assertEqual(top_note["note_id"], self.prescription.pk)
+        self.assertEqual(top_note["event_type"], Event.OUTPT_PRESCRIPTION_EVENT)
+        self.assertIn("<b>tratamento</b>", top_note["headline"])
+
+    def test_entry_follows_edits_and_soft_delete(self):
+        self.simple_note.content = "Sem queixas."
+        self.simple_note.save()
+        self.assertNotIn(
+            self.simple_patient.pk, self._patient_ids(perform_fulltext_search_queryset("infecção"))
+        )
+
+        self.prescription.delete()
+        self.assertFalse(EventSearchEntry.objects.filter(event_id=self.prescription.pk).exists())
+        self.assertEqual(
+            self._patient_ids(perform_fulltext_search_queryset("infecção")), {self.daily_patient.pk}
+        )
+
+    def test_rebuild_search_index_command(self):
+        EventSearchEntry.objects.all().delete()
+
+        call_command("rebuild_search_index", "--batch-size", "1", stdout=StringIO())
+
+        self.assertEqual(EventSearchEntry.objects.count(), 3)
+        self.assertEqual(len(perform_fulltext_search_queryset("infecção")), 3)
@@ -1,9 +1,14 @@
-from collections import defaultdict
+import hashlib
 import math
+import uuid
+from datetime import datetime, time, timedelta
+from django.core.cache import cache
 from django.db import connection
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchHeadline
-from django.db.models import Q
-from apps.dailynotes.models import DailyNote
+from django.utils import timezone
+from apps.patients.models import Patient
+from .search_index import search_document_sql
+
+GENDER_DISPLAY = dict(Patient.GenderChoices.choices)
 
 def get_patient_initials(full_name):
     """
@@ -129,9 +134,317 @@ def optimize_search_query(query_text):
     
     return query_text
 
+# Per-patient match statistics shared by the ranking and the export.
+# {filters} restricts the search entries (si) by event type and date.
+SEARCH_PATIENT_STATS_SQL = """
+    WITH search_query AS (
+        SELECT to_tsquery('portuguese', %s) AS q
+    ),
+    patient_stats AS (
+        SELECT
+            si.patient_id,
+            MAX(ts_rank(si.search_vector, sq.q)) AS highest_rank,
+            COUNT(*) AS total_matches,
+            MAX(si.event_datetime) AS most_recent_match
+        FROM research_eventsearchentry si
+        CROSS JOIN search_query sq
+        WHERE si.search_vector @@ sq.q{filters}
+        GROUP BY si.patient_id
+    )
+"""
+
+# Patient-level ranking: one row per matching patient, best first
+SEARCH_RANKING_SQL = SEARCH_PATIENT_STATS_SQL + """
+    SELECT patient_id, highest_rank, total_matches, most_recent_match
+    FROM patient_stats
+    ORDER BY highest_rank DESC, total_matches DESC, patient_id
+    LIMIT %s
+"""
+
+# Every matching patient with the columns the export needs, best first
+SEARCH_EXPORT_SQL = SEARCH_PATIENT_STATS_SQL + """
+    SELECT
+        p.id, p.name, p.current_record_number, p.gender, p.birthday,
+        ps.highest_rank, ps.total_matches, ps.most_recent_match
+    FROM patient_stats ps
+    JOIN patients_patient p ON p.id = ps.patient_id
+    ORDER BY ps.highest_rank DESC, ps.total_matches DESC, ps.patient_id
+"""
+
+# Best matching event of each given patient with its snippet; the event
+# text is only joined in, and ts_headline only run, for those events.
+SEARCH_TOP_NOTES_SQL = """
+    WITH search_query AS (
+        SELECT to_tsquery('portuguese', %s) AS q
+    )
+    SELECT
+        page.patient_id,
+        top_note.event_id,
+        top_note.event_type,
+        top_note.note_rank,
+        top_note.note_date,
+        ts_headline(
+            'portuguese', {document}, sq.q,
+            'MaxWords=30, MinWords=10, StartSel=<b>, StopSel=</b>'
+        ) AS headline
+    FROM unnest(%s::uuid[]) AS page(patient_id)
+    CROSS JOIN search_query sq
+    JOIN LATERAL (
+        SELECT
+            si.event_id,
+            si.event_type,
+            ts_rank(si.search_vector, sq.q) AS note_rank,
+            si.event_datetime AS note_date
+        FROM research_eventsearchentry si
+        WHERE si.patient_id = page.patient_id
+            AND si.search_vector @@ sq.q{filters}
+        ORDER BY note_rank DESC, si.event_datetime DESC
+        LIMIT 1
+    ) top_note ON TRUE
+    {joins}
+"""
+
+# Ranked results are cached briefly so page turns and AJAX refreshes reuse
+# one ranking; at least this many patients are ranked at once
+SEARCH_RESULT_CACHE_TIMEOUT = 300
+SEARCH_RESULT_CACHE_MIN_PATIENTS = 1000
+SEARCH_INDEX_VERSION_KEY = 'research:search_index_version'
+
+# Rows fetched per round trip from the export's server-side cursor
+SEARCH_EXPORT_CHUNK_SIZE = 2000
+
+
+def build_search_query(query_text):
+    """
+    Validate and optimize a search query.
+
+    Returns:
+        str: tsquery text for to_tsquery('portuguese', ...)
+
+    Raises:
+        ValueError: If the query is invalid
+    """
+    clean_query, error = validate_search_query(query_text)
+    if error:
+        raise ValueError(error)
+    return optimize_search_query(clean_query)
+
+
+def build_entry_filters(event_types=None, date_from=None, date_to=None):
+    """
+    Build the SQL restricting search entries (alias si) by type and date.
+
+    Args:
+        event_types: Event type codes to search, or None for every indexed type
+        date_from: First day to search (inclusive), or None
+        date_to: Last day to search (inclusive), or None
+
+    Returns:
+        tuple: (SQL appended to the WHERE clause, its parameters)
+    """
+    clauses = []
+    params = []
+    if event_types:
+        clauses.append('si.event_type = ANY(%s)')
+        params.append(sorted({int(event_type) for event_type in event_types}))
+    if date_from:
+        clauses.append('si.event_datetime >= %s')
+        params.append(_start_of_day(date_from))
+    if date_to:
+        clauses.append('si.event_datetime < %s')
+        params.append(_start_of_day(date_to + timedelta(days=1)))
+    return ''.join(f' AND {clause}' for clause in clauses), params
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def get_search_index_version():
+    """Return the token identifying the current state of the search index."""
+    version = cache.get(SEARCH_INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(SEARCH_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SEARCH_INDEX_VERSION_KEY)
+    return version
+
+
+def invalidate_search_cache():
+    """Discard all cached search results, e.g. after notes are indexed."""
+    cache.set(SEARCH_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _search_cache_key(optimized_query, filter_params):
+    normalized = ' '.join(optimized_query.lower().split()) + repr(filter_params)
+    digest = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    return f'research:search:{get_search_index_version()}:{digest}'
+
+
+def get_ranked_patients(optimized_query, max_patients, filters=('', [])):
+    """
+    Return the ranked patients for a query, from cache when possible.
+
+    Args:
+        optimized_query: Output of optimize_search_query()
+        max_patients: Maximum number of patients needed
+        filters: Output of build_entry_filters()
+
+    Returns:
+        list: (patient_id, highest_rank, total_matches, most_recent_match)
+        tuples in rank order
+    """
+    filter_sql, filter_params = filters
+    cache_key = _search_cache_key(optimized_query, filter_params)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        limit, rows = cached
+        # Usable if it ranked enough patients, or ranked every match
+        if limit >= max_patients or len(rows) < limit:
+            return rows[:max_patients]
+
+    limit = max(max_patients, SEARCH_RESULT_CACHE_MIN_PATIENTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SEARCH_RANKING_SQL.format(filters=filter_sql),
+            [optimized_query, *filter_params, limit]
+        )
+        rows = [
+            (str(patient_id), highest_rank, total_matches, most_recent_match)
+            for patient_id, highest_rank, total_matches, most_recent_match in cursor.fetchall()
+        ]
+
+    cache.set(cache_key, (limit, rows), SEARCH_RESULT_CACHE_TIMEOUT)
+    return rows[:max_patients]
+
+
+def build_patient_result(patient, highest_rank, total_matches, most_recent_match):
+    """
+    Build the result dict of one matching patient.
+
+    Args:
+        patient: Dict with pk, name, current_record_number, gender and birthday
+        highest_rank: Best ts_rank among the patient's matching events
+        total_matches: Number of matching events
+        most_recent_match: Datetime of the latest matching event
+
+    Returns:
+        dict: Patient result
+    """
+    return {
+        'patient': {
+            'pk': patient['pk'],
+            'name': patient['name']
+        },
+        'registration_number': patient['current_record_number'] or 'N/A',
+        'initials': get_patient_initials(patient['name']),
+        'gender': GENDER_DISPLAY.get(patient['gender'], 'Não informado'),
+        'birthday': patient['birthday'],
+        'highest_rank': highest_rank,
+        'total_matches': total_matches,
+        'most_recent_match': most_recent_match
+    }
+
+
+class FullTextSearchResults:
+    """
+    Lazily evaluated, patient-grouped full-text search results.
+
+    Supports len() and slicing, so it can be handed to Django's Paginator.
+    The ranking (patient ids, ranks and match counts) is computed once and
+    cached; each slice then only loads the patients on it and, when
+    requested, the snippet of their best matching event.
+    """
+
+    def __init__(self, query_text, max_patients=500, with_headlines=False,
+                 event_types=None, date_from=None, date_to=None):
+        self.query_text = query_text
+        self.optimized_query = build_search_query(query_text)
+        self.max_patients = max_patients
+        self.with_headlines = with_headlines
+        self.filters = build_entry_filters(event_types, date_from, date_to)
+        self._ranked = None
+
+    def ranked(self):
+        """Return the ranked (patient_id, rank, matches, most_recent) tuples."""
+        if self._ranked is None:
+            self._ranked = get_ranked_patients(self.optimized_query, self.max_patients, self.filters)
+        return self._ranked
+
+    def count(self):
+        """Return the number of matching patients, capped at max_patients."""
+        return len(self.ranked())
+
+    def __len__(self):
+        return self.count()
+
+    def __bool__(self):
+        return self.count() > 0
+
+    def __iter__(self):
+        return iter(self[0:self.max_patients])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.build_results(self.ranked()[index])
+        return self.build_results([self.ranked()[index]])[0]
+
+    def build_results(self, ranked_rows):
+        """
+        Build patient result dicts for a slice of the ranking.
+
+        Args:
+            ranked_rows: (patient_id, rank, matches, most_recent) tuples
+
+        Returns:
+            list: Patient result dicts in rank order
+        """
+        if not ranked_rows:
+            return []
+
+        patient_ids = [row[0] for row in ranked_rows]
+        patients = {
+            str(patient['pk']): patient
+            for patient in Patient.objects.filter(pk__in=patient_ids).values(
+                'pk', 'name', 'current_record_number', 'gender', 'birthday'
+            )
+        }
+        top_notes = self.fetch_top_notes(patient_ids) if self.with_headlines else {}
+
+        results = []
+        for patient_id, highest_rank, total_matches, most_recent_match in ranked_rows:
+            patient = patients.get(patient_id)
+            if patient is None:
+                continue
+            result = build_patient_result(patient, highest_rank, total_matches, most_recent_match)
+            if self.with_headlines:
+                result['matching_notes'] = top_notes.get(patient_id, [])
+            results.append(result)
+        return results
+
+    def fetch_top_notes(self, patient_ids):
+        """Return {patient_id: [best matching event]} with highlighted snippets."""
+        filter_sql, filter_params = self.filters
+        document, joins = search_document_sql('top_note')
+        sql = SEARCH_TOP_NOTES_SQL.format(filters=filter_sql, document=document, joins=joins)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.optimized_query, patient_ids, *filter_params])
+            return {
+                str(patient_id): [{
+                    'note_id': note_id,
+                    'event_type': event_type,
+                    'rank': note_rank,
+                    'headline': headline,
+                    'note_date': note_date
+                }]
+                for patient_id, note_id, event_type, note_rank, note_date, headline in cursor.fetchall()
+            }
+
+
 def perform_fulltext_search(query_text, page=1, per_page=25):
     """
-    Perform full text search and return patient-grouped results.
+    Perform full text search and return one page of patient-grouped results.
+
+    Each patient includes its best matching event with a highlighted snippet.
 
     Args:
         query_text: The search query
@@ -141,34 +454,13 @@ def perform_fulltext_search(query_text, page=1, per_page=25):
     Returns:
         dict: Search results with pagination info
     """
-    # Validate query
-    clean_query, error = validate_search_query(query_text)
-    if error:
-        return {'error': error}
-    
-    # Optimize query for better search performance
-    optimized_query = optimize_search_query(clean_query)
-
-    # Create PostgreSQL search query with advanced syntax support
-    search_query = SearchQuery(optimized_query, config='portuguese', search_type='raw')
-
-    # Query matching notes with ranking and headlines
-    matching_notes = DailyNote.objects.annotate(
-        rank=SearchRank('search_vector', search_query),
-        headline=SearchHeadline(
-            'content',
-            search_query,
-            config='portuguese',
-            max_words=30,
-            min_words=10,
-            start_sel='<b>',
-            stop_sel='</b>'
-        )
-    ).filter(
-        search_vector=search_query
-    ).select_related('patient').order_by('-rank')
+    try:
+        results = FullTextSearchResults(query_text, with_headlines=True)
+    except ValueError as e:
+        return {'error': str(e)}
 
-    if not matching_notes.exists():
+    total_patients = results.count()
+    if not total_patients:
         return {
             'patients': [],
             'total_patients': 0,
@@ -176,46 +468,11 @@ def perform_fulltext_search(query_text, page=1, per_page=25):
             'message': f'Nenhum resultado encontrado para "{query_text}"'
         }
 
-    # Group notes by patient
-    patient_groups = defaultdict(list)
-    for note in matching_notes:
-        patient_groups[note.patient].append({
-            'note': note,
-            'rank': note.rank,
-            'headline': note.headline,
-            'note_date': note.event_datetime
-        })
-
-    # Build patient results (UPDATED)
-    patient_results = []
-    for patient, notes in patient_groups.items():
-        # Skip age calculation for performance
-
-        # Get top 1 match per patient
-        top_matches = sorted(notes, key=lambda x: x['rank'], reverse=True)[:1]
-
-        patient_results.append({
-            'patient': patient,
-            'registration_number': patient.current_record_number or 'N/A',
-            'initials': get_patient_initials(patient.name),  # UPDATED function
-            'gender': patient.get_gender_display(),
-            'birthday': patient.birthday,
-            'matching_notes': top_matches,
-            'highest_rank': max(n['rank'] for n in notes),
-            'total_matches': len(notes)
-        })
-
-    # Sort by highest rank
-    patient_results.sort(key=lambda x: x['highest_rank'], reverse=True)
-
-    # Implement pagination
-    total_patients = len(patient_results)
     start_idx = (page - 1) * per_page
     end_idx = start_idx + per_page
-    paginated_results = patient_results[start_idx:end_idx]
 
     return {
-        'patients': paginated_results,
+        'patients': results[start_idx:end_idx],
         'total_patients': total_patients,
         'current_page': page,
         'per_page': per_page,
@@ -225,102 +482,80 @@ def perform_fulltext_search(query_text, page=1, per_page=25):
         'query': query_text
     }
 
-def perform_fulltext_search_queryset(query_text, max_patients=500):
+
+def perform_fulltext_search_queryset(query_text, max_patients=500, with_headlines=False,
+                                     event_types=None, date_from=None, date_to=None):
     """
-    Fast full-text search using raw SQL: groups by patient, limits early.
-    
+    Full-text search grouped by patient, ranked and paginated in SQL.
+
+    Searches every indexed clinical event type (see
+    apps.research.search_index.SEARCHABLE_EVENTS) unless restricted.
+
     Args:
         query_text: The search query
         max_patients: Maximum number of patients to return
-        
+        with_headlines: Include the best matching event and its snippet
+        event_types: Event type codes to search, or None for all
+        date_from: First event date to search (inclusive), or None
+        date_to: Last event date to search (inclusive), or None
+
     Returns:
-        list: Patient results suitable for Django Paginator
+        FullTextSearchResults: Lazy results suitable for Django Paginator
+
+    Raises:
+        ValueError: If the query is invalid
     """
-    from django.db import connection
-    import json
-    
-    # Validate query
-    clean_query, error = validate_search_query(query_text)
-    if error:
-        raise ValueError(error)
-    
-    # Optimize query for better search performance
-    optimized_query = optimize_search_query(clean_query)
+    return FullTextSearchResults(
+        query_text,
+        max_patients=max_patients,
+        with_headlines=with_headlines,
+        event_types=event_types,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+
+def iter_search_results(query_text, chunk_size=SEARCH_EXPORT_CHUNK_SIZE,
+                        event_types=None, date_from=None, date_to=None):
+    """
+    Yield every patient matching a query, best first, without a cap.
 
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            WITH search_query AS (
-                SELECT to_tsquery('portuguese', %s) AS q
-            ),
-            ranked_notes AS (
-                SELECT
-                    e.patient_id,
-                    e.event_datetime,
-                    p.name AS patient_name,
-                    p.current_record_number,
-                    p.gender,
-                    p.birthday,
-                    ts_rank(dn.search_vector, sq.q) AS rank
-                FROM dailynotes_dailynote dn
-                CROSS JOIN search_query sq
-                JOIN events_event e ON e.id = dn.event_ptr_id
-                JOIN patients_patient p ON p.id = e.patient_id
-                WHERE dn.search_vector @@ sq.q
-            ),
-            patient_stats AS (
-                SELECT
-                    patient_id,
-                    MAX(rank) AS highest_rank,
-                    COUNT(*) AS total_matches,
-                    MAX(event_datetime) AS most_recent_match
-                FROM ranked_notes
-                GROUP BY patient_id
-            ),
-            top_patients AS (
-                SELECT patient_id
-                FROM patient_stats
-                ORDER BY highest_rank DESC, total_matches DESC
-                LIMIT %s
-            )
-            SELECT DISTINCT
-                rn.patient_id,
-                rn.current_record_number AS registration_number,
-                get_patient_initials(rn.patient_name) AS initials,
-                rn.patient_name,
-                CASE 
-                    WHEN rn.gender = 'M' THEN 'Masculino'
-                    WHEN rn.gender = 'F' THEN 'Feminino'
-                    ELSE 'Não informado'
-                END AS gender_display,
-                rn.gender,
-                rn.birthday,
-                ps.total_matches,
-                ps.highest_rank,
-                ps.most_recent_match
-            FROM ranked_notes rn
-            JOIN top_patients tp ON rn.patient_id = tp.patient_id
-            JOIN patient_stats ps ON ps.patient_id = tp.patient_id
-            ORDER BY ps.highest_rank DESC, ps.total_matches DESC;
-        """, [optimized_query, max_patients])
-
-        columns = [col[0] for col in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-
-    # Post-process: format results (no snippets, much faster)
-    patient_results = []
-    for r in results:
-        patient_results.append({
-            'patient': {
-                'pk': r['patient_id'],
-                'name': r['patient_name']
-            },
-            'registration_number': r['registration_number'] or 'N/A',
-            'initials': r['initials'],
-            'gender': r['gender_display'],
-            'birthday': r['birthday'],
-            'highest_rank': r['highest_rank'],
-            'total_matches': r['total_matches'],
-            'most_recent_match': r['most_recent_match']
-        })
-
-    return patient_results
\ No newline at end of file
+    Rows are read from a server-side cursor chunk by chunk, so memory use
+    does not grow with the number of matches. Meant for exports; the
+    ranking cache is not used.
+
+    Args:
+        query_text: The search query
+        chunk_size: Rows fetched per round trip
+        event_types: Event type codes to search, or None for all
+        date_from: First event date to search (inclusive), or None
+        date_to: Last event date to search (inclusive), or None
+
+    Returns:
+        iterator: Patient result dicts, as built by build_patient_result()
+
+    Raises:
+        ValueError: If the query is invalid (raised on call, not on iteration)
+    """
+    optimized_query = build_search_query(query_text)
+    filters = build_entry_filters(event_types, date_from, date_to)
+    return _iter_search_results(optimized_query, filters, chunk_size)
+
+
+def _iter_search_results(optimized_query, filters, chunk_size):
+    filter_sql, filter_params = filters
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(SEARCH_EXPORT_SQL.format(filters=filter_sql), [optimized_query, *filter_params])
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for pk, name, record_number, gender, birthday, rank, matches, most_recent in rows:
+                patient = {
+                    'pk': pk,
+                    'name': name,
+                    'current_record_number': record_number,
+                    'gender': gender,
+                    'birthday': birthday,
+                }
+                yield build_patient_result(patient, rank, matches, most_recent)
@@ -2,17 +2,20 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
 from django.core.exceptions import PermissionDenied
 from django.utils import timezone
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
-import io
+import csv
+import itertools
+import tempfile
 
 from .forms import ClinicalSearchForm
 from .permissions import check_researcher_access
-from .utils import perform_fulltext_search_queryset
+from .utils import iter_search_results, perform_fulltext_search, perform_fulltext_search_queryset
 
 @login_required
 def clinical_search(request):
@@ -42,7 +45,8 @@ def clinical_search(request):
         if form.is_valid():
             query = form.cleaned_data['query']
 
-            # Get the queryset of patient results (limit to 500 for UI)
+            # Lazy patient results (limit to 500 for UI); each page is
+            # ranked and sliced in the database
             try:
                 patients = perform_fulltext_search_queryset(query, max_patients=500)
                 if not patients:
@@ -91,18 +95,21 @@ def search_ajax(request):
     if 'patients' in results:
         for patient_result in results['patients']:
             patient_result['patient'] = {
-                'id': str(patient_result['patient'].pk),
-                'name': patient_result['patient'].name
+                'id': str(patient_result['patient']['pk']),
+                'name': patient_result['patient']['name']
             }
-            for match in patient_result['matching_notes']:
-                match['note_date'] = match['note_date'].isoformat()
 
     return JsonResponse(results)
 
 @login_required
 def export_search_results(request):
     """
-    Export search results to Excel format.
+    Export all search results to Excel (default) or CSV (?format=csv).
+
+    Rows are streamed from a server-side cursor. CSV is written to the
+    response as rows arrive; Excel uses openpyxl's write-only mode and is
+    spooled to a temporary file, since the XLSX zip must be finalized
+    before it can be sent.
     """
     try:
         check_researcher_access(request.user)
@@ -115,93 +122,114 @@ def export_search_results(request):
         messages.error(request, 'Consulta de busca é obrigatória para exportação.')
         return redirect('apps.research:clinical_search')
 
+    export_format = request.GET.get('format', 'xlsx')
+    if export_format not in ('xlsx', 'csv'):
+        messages.error(request, 'Formato de exportação inválido.')
+        return redirect('apps.research:clinical_search')
+
     try:
-        # Get search results for export (limit to 1000 most relevant patients)
-        patients = perform_fulltext_search_queryset(query, max_patients=1000)
-        if not patients:
+        patients = iter_search_results(query)
+        first_patient = next(patients, None)
+        if first_patient is None:
             messages.info(request, 'Nenhum resultado encontrado para exportar.')
             return redirect('apps.research:clinical_search')
-        
-        # Warn if hitting the limit
-        if len(patients) == 1000:
-            messages.warning(request, "Exportação limitada aos 1000 pacientes mais relevantes.")
-
-        # Create Excel workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Resultados da Busca"
-
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-
-        # Headers
-        headers = [
-            'Prontuário',
-            'Iniciais',
-            'Sexo',
-            'Data de Nascimento',
-            'Data do Achado Mais Recente',
-            'Total de Resultados',
-            'Melhor Relevância'
-        ]
-
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-
-        # Write data
-        for row_num, patient_result in enumerate(patients, 2):
-            ws.cell(row=row_num, column=1, value=patient_result['registration_number'])
-            ws.cell(row=row_num, column=2, value=patient_result['initials'])
-            ws.cell(row=row_num, column=3, value=patient_result['gender'])
-            
-            # Format birthday as DD/MM/YYYY
-            birthday = patient_result['birthday']
-            if birthday:
-                formatted_birthday = birthday.strftime('%d/%m/%Y')
-            else:
-                formatted_birthday = ''
-            ws.cell(row=row_num, column=4, value=formatted_birthday)
-            
-            # Format most recent match date as DD/MM/YYYY
-            most_recent_match = patient_result['most_recent_match']
-            if most_recent_match:
-                formatted_match_date = most_recent_match.strftime('%d/%m/%Y')
-            else:
-                formatted_match_date = ''
-            ws.cell(row=row_num, column=5, value=formatted_match_date)
-            
-            ws.cell(row=row_num, column=6, value=patient_result['total_matches'])
-            ws.cell(row=row_num, column=7, value=round(patient_result['highest_rank'], 4))
-
-        # Set fixed column widths (much faster than auto-calculation)
-        column_widths = [15, 12, 10, 12, 18, 15, 12]  # Fixed widths for each column
-        for col, width in enumerate(column_widths, 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = width
-
-        # Create response
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+        patients = itertools.chain([first_patient], patients)
 
         # Generate filename with timestamp
         timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'busca_clinica_{query[:20]}_{timestamp}.xlsx'
-
-        response = HttpResponse(
-            output.getvalue(),
+        filename = f'busca_clinica_{query[:20]}_{timestamp}.{export_format}'
+
+        if export_format == 'csv':
+            response = StreamingHttpResponse(
+                _stream_csv_export(patients),
+                content_type='text/csv; charset=utf-8'
+            )
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return response
+
+        return FileResponse(
+            _write_xlsx_export(patients),
+            as_attachment=True,
+            filename=filename,
             content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
 
     except Exception as e:
         messages.error(request, f'Erro na exportação: {str(e)}')
         return redirect('apps.research:clinical_search')
+
+
+EXPORT_HEADERS = [
+    'Prontuário',
+    'Iniciais',
+    'Sexo',
+    'Data de Nascimento',
+    'Data do Achado Mais Recente',
+    'Total de Resultados',
+    'Melhor Relevância'
+]
+EXPORT_COLUMN_WIDTHS = [15, 12, 10, 12, 18, 15, 12]
+
+
+def _export_row(patient_result):
+    """Return the export cells of one patient result."""
+    # Dates are formatted as DD/MM/YYYY
+    birthday = patient_result['birthday']
+    most_recent_match = patient_result['most_recent_match']
+    return [
+        patient_result['registration_number'],
+        patient_result['initials'],
+        patient_result['gender'],
+        birthday.strftime('%d/%m/%Y') if birthday else '',
+        most_recent_match.strftime('%d/%m/%Y') if most_recent_match else '',
+        patient_result['total_matches'],
+        round(patient_result['highest_rank'], 4),
+    ]
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _stream_csv_export(patients):
+    """Yield the CSV export line by line."""
+    writer = csv.writer(_Echo())
+    # BOM so spreadsheet programs detect UTF-8
+    yield '\ufeff' + writer.writerow(EXPORT_HEADERS)
+    for patient_result in patients:
+        yield writer.writerow(_export_row(patient_result))
+
+
+def _write_xlsx_export(patients):
+    """Write the Excel export to a temporary file and return it rewound."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Resultados da Busca")
+
+    # Set fixed column widths (much faster than auto-calculation)
+    for col, width in enumerate(EXPORT_COLUMN_WIDTHS, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+    # Define styles
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+
+    header_cells = []
+    for header in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for patient_result in patients:
+        ws.append(_export_row(patient_result))
+
+    output = tempfile.TemporaryFile()
+    wb.save(output)
+    output.seek(0)
+    return output
@@ -26,6 +26,8 @@ from apps.core.permissions import (
     can_access_patient,
     can_edit_event,
     can_delete_event,
+    get_patient_access_scope,
+    patient_access_filter,
 )
 from apps.patients.models import Patient
 from apps.sample_content.models import SampleContent
@@ -53,14 +55,7 @@ class SimpleNoteListView(LoginRequiredMixin, ListView):
         # Filter by patient access permissions (single hospital configuration)
         # All users can access all patients in the single hospital setup
 
-        # Optimize patient access check with bulk operations
-        from apps.core.permissions.cache import get_user_accessible_patients
-
-        accessible_patient_ids = get_user_accessible_patients(self.request.user)
-        if accessible_patient_ids:
-            queryset = queryset.filter(patient__id__in=accessible_patient_ids)
-        else:
-            queryset = queryset.none()
+        queryset = queryset.filter(patient_access_filter(self.request.user, "patient"))
 
         # Search functionality
         search_query = self.request.GET.get("search", "")
@@ -111,21 +106,15 @@ class SimpleNoteListView(LoginRequiredMixin, ListView):
         context["selected_creator"] = self.request.GET.get("creator", "")
 
         # Cache key for filter options
-        cache_key = f"simplenotes_filters_{self.request.user.id}"
+        cache_key = f"simplenotes_filters_{get_patient_access_scope(self.request.user)}"
 
         # Try to get filter options from cache
         filter_options = cache.get(cache_key)
         if filter_options is None:
             # Get available patients for filter dropdown (only accessible ones)
-            from apps.core.permissions.cache import get_user_accessible_patients
-
-            accessible_patient_ids = get_user_accessible_patients(self.request.user)
-            if accessible_patient_ids:
-                accessible_patients = Patient.objects.filter(
-                    id__in=accessible_patient_ids
-                ).only("id", "name", "fiscal_number")
-            else:
-                accessible_patients = Patient.objects.none()
+            accessible_patients = Patient.objects.filter(
+                patient_access_filter(self.request.user)
+            ).only("id", "name", "fiscal_number")
 
             # Get available creators (users who have created simple notes in this hospital)
             from django.contrib.auth import get_user_model
@@ -133,7 +122,7 @@ class SimpleNoteListView(LoginRequiredMixin, ListView):
             User = get_user_model()
             available_creators = (
                 User.objects.filter(
-                    simplenote_created__patient__id__in=accessible_patient_ids
+                    patient_access_filter(self.request.user, "simplenote_created__patient")
                 )
                 .distinct()
                 .only("id", "first_name", "last_name", "email")
@@ -261,6 +261,7 @@ DJANGO_DRF_FILEPOND_STORAGES_BACKEND_PHOTOSERIES = 'apps.mediafiles.storage.Secu
 
 # Image processing settings
 MEDIA_THUMBNAIL_SIZE = (300, 300)
+MEDIA_BATCH_WORKERS = 2  # Processes in each web worker's batch thumbnailing pool
 
 # Security settings for media files
 MEDIA_ALLOWED_IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp']
@@ -349,7 +350,10 @@ DJANGO_DRF_FILEPOND_FILE_STORE_PATH = DJANGO_DRF_FILEPOND_FILE_STORE_PATH  # Str
 MEDIA_VIDEO_CONVERSION_ENABLED = True
 MEDIA_VIDEO_OUTPUT_FORMAT = 'mp4'
 MEDIA_VIDEO_CODEC = 'libx264'
-MEDIA_VIDEO_PRESET = 'medium'  # Single quality preset
+MEDIA_VIDEO_PRESET = 'medium'  # Preset for clips longer than the short-clip limit
+MEDIA_VIDEO_SHORT_CLIP_PRESET = 'veryfast'  # Preset for short clinical clips
+MEDIA_VIDEO_SHORT_CLIP_MAX_DURATION = 30  # seconds
+MEDIA_VIDEO_CRF = 23
 MEDIA_VIDEO_MAX_DURATION = 120  # 2 minutes
 MEDIA_VIDEO_MAX_SIZE = 100 * 1024 * 1024  # 100MB input limit
 